@@ -1,64 +1,52 @@
 #!/usr/bin/env python3
 """Check for missed school-related projects."""
 
-import json
-from pathlib import Path
+import sys
 
-# Load all chunks
-data_dir = Path('embuild-analyses/public/data/bouwprojecten-gemeenten')
-all_projects = []
+import numpy as np
 
-print("Loading all chunks...")
-for i in range(7):  # 7 chunks according to metadata
-    chunk_file = data_dir / f'projects_2026_chunk_{i}.json'
-    with open(chunk_file, 'r', encoding='utf-8') as f:
-        all_projects.extend(json.load(f))
+sys.path.insert(0, 'embuild-analyses/analyses/bouwprojecten-gemeenten/src')
+from keyword_index import load_keyword_index, projects_with_keyword  # noqa: E402
+from project_store import load_project_store  # noqa: E402
 
-print(f"Total projects loaded: {len(all_projects)}\n")
+# All projects of the parquet snapshot, and the keyword index over them
+# (project ids are row positions in the store; rebuilt only when the snapshot changes)
+store = load_project_store()
+index = load_keyword_index()
+total_projects = len(store)
 
-# Check for "scholen" keyword
-print("="*80)
-print("Checking for 'scholen' keyword")
-print("="*80)
+print(f"Total projects loaded: {total_projects}\n")
 
-missed_scholen = []
-for p in all_projects:
-    text = f"{p['ac_short']} {p.get('ac_long', '')}".lower()
-    if 'scholen' in text and 'scholenbouw' not in p['categories']:
-        missed_scholen.append(p)
+scholenbouw = np.flatnonzero([('scholenbouw' in cats) for cats in store['categories']])
 
-print(f"Projects with 'scholen' NOT in scholenbouw: {len(missed_scholen)}")
 
-if missed_scholen:
-    print("\nFirst 5 examples:")
-    for p in missed_scholen[:5]:
-        print(f"\n- {p['municipality']}: {p['ac_short'][:80]}")
-        print(f"  Categories: {p['categories']}")
+def check_keyword(keyword):
+    """Projects containing `keyword` that are not in scholenbouw."""
+    print("="*80)
+    print(f"Checking for '{keyword}' keyword")
+    print("="*80)
 
-# Check for "onderwijs" keyword
-print("\n" + "="*80)
-print("Checking for 'onderwijs' keyword")
-print("="*80)
+    missed = np.setdiff1d(projects_with_keyword(index, keyword), scholenbouw, assume_unique=True)
+
+    print(f"Projects with '{keyword}' NOT in scholenbouw: {len(missed)}")
 
-missed_onderwijs = []
-for p in all_projects:
-    text = f"{p['ac_short']} {p.get('ac_long', '')}".lower()
-    if 'onderwijs' in text and 'scholenbouw' not in p['categories']:
-        missed_onderwijs.append(p)
+    if len(missed):
+        print("\nFirst 5 examples:")
+        for project in store.iloc[missed[:5]].itertuples():
+            print(f"\n- {project.municipality}: {project.ac_short[:80]}")
+            print(f"  Categories: {project.categories}")
+    return missed
 
-print(f"Projects with 'onderwijs' NOT in scholenbouw: {len(missed_onderwijs)}")
 
-if missed_onderwijs:
-    print("\nFirst 5 examples:")
-    for p in missed_onderwijs[:5]:
-        print(f"\n- {p['municipality']}: {p['ac_short'][:80]}")
-        print(f"  Categories: {p['categories']}")
+missed_scholen = check_keyword('scholen')
+print()
+missed_onderwijs = check_keyword('onderwijs')
 
 # Summary
 print("\n" + "="*80)
 print("SUMMARY")
 print("="*80)
-print(f"Total projects: {len(all_projects)}")
+print(f"Total projects: {total_projects}")
 print(f"Missed 'scholen': {len(missed_scholen)}")
 print(f"Missed 'onderwijs': {len(missed_onderwijs)}")
-print(f"Scholenbouw projects in data: {sum(1 for p in all_projects if 'scholenbouw' in p['categories'])}")
+print(f"Scholenbouw projects in data: {len(scholenbouw)}")
@@ -13,12 +13,17 @@ Usage:
 import pandas as pd
 import glob
 import os
+import sys
 from pathlib import Path
 
 # Paths
 DATA_DIR = Path(__file__).parent.parent / 'data' / 'nis'
 RESULTS_DIR = Path(__file__).parent.parent / 'results'
 RESULTS_DIR.mkdir(exist_ok=True)
+SHARED_DATA_DIR = Path(__file__).resolve().parent.parent.parent.parent / 'shared-data'
+
+sys.path.insert(0, str(SHARED_DATA_DIR))
+from nis_hierarchy import ARRONDISSEMENT, nis_names  # noqa: E402
 
 # Expected numeric columns
 NUMERIC_COLS = [
@@ -78,11 +83,8 @@ def load_municipalities():
 
 def create_arrondissement_aggregates(df_municipalities):
     """Create arrondissement-level aggregates from municipality data."""
-    # Load arrondissement reference data
-    refnis = pd.read_csv(DATA_DIR / 'refnis.csv', dtype=str)
-    arr_map = (refnis[refnis['LVL_REFNIS'] == '3'][['CD_REFNIS', 'TX_REFNIS_NL']]
-               .drop_duplicates()
-               .rename(columns={'CD_REFNIS': 'CD_ARR', 'TX_REFNIS_NL': 'TX_ARR_NL'}))
+    # Arrondissement names (most recent name per code, see shared-data/nis_hierarchy.py)
+    arr_map = pd.DataFrame(list(nis_names(ARRONDISSEMENT).items()), columns=['CD_ARR', 'TX_ARR_NL'])
 
     # Columns to aggregate by summing
     agg_cols = [col for col in [
@@ -124,15 +126,18 @@ def create_arrondissement_aggregates(df_municipalities):
     hh_pct_cols = ['hh_1_pct_toename', 'hh_2_pct_toename', 'hh_3_pct_toename', 'hh_4+_pct_toename']
     hh_2025_cols = ['hh_1_2025', 'hh_2_2025', 'hh_3_2025', 'hh_4+_2025']
 
+    arr_codes = df_municipalities['CD_SUP_REFNIS']
     for pct_col, base_col in zip(hh_pct_cols, hh_2025_cols):
         if pct_col in df_municipalities.columns and base_col in df_municipalities.columns:
             # Calculate weighted average: (sum of increases) / (sum of base) * 100
-            grouped = df_municipalities.groupby('CD_SUP_REFNIS')
+            base = df_municipalities[base_col]
+            weighted = (df_municipalities[pct_col] * base).groupby(arr_codes).sum()
+            base_sum = base.groupby(arr_codes).sum()
             weighted_avg = (
-                grouped.apply(lambda x: (x[pct_col] * x[base_col]).sum() / x[base_col].sum() * 100
-                             if x[base_col].sum() > 0 else 0, include_groups=False)
+                (weighted / base_sum * 100).where(base_sum > 0, 0)
+                .rename(pct_col)
+                .rename_axis('CD_ARR')
                 .reset_index()
-                .rename(columns={0: pct_col, 'CD_SUP_REFNIS': 'CD_ARR'})
             )
             df_agg = df_agg.merge(weighted_avg, on='CD_ARR', how='left')
 
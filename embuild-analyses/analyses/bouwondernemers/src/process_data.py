@@ -1,6 +1,7 @@
 import json
 import os
 import re
+import sys
 import zipfile
 from pathlib import Path
 
@@ -11,11 +12,28 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR / "data"
 RESULTS_DIR = BASE_DIR / "results"
 CONTENT_FILE = BASE_DIR / "content.mdx"
+SHARED_DATA_DIR = BASE_DIR.parent.parent / "shared-data"
+
+sys.path.insert(0, str(SHARED_DATA_DIR))
+from parquet_cache import CACHE_DIR_NAME, load_or_parse  # noqa: E402
+from statbel_schema import CATEGORY, REGION_CODES, apply_schema, to_category  # noqa: E402
+
+CACHE_DIR = DATA_DIR / CACHE_DIR_NAME
+# Version of read_txt in the parquet cache key; bump it when the parsed frame changes
+PARSE_VERSION = 2
 
 # Data spans from 2017 to 2022 (and potentially newer years)
 MIN_YEAR = 2017
 MAX_YEAR = 2022  # We'll check for newer years
 
+# Dimension types of the combined yearly files (see shared-data/statbel_schema.py)
+SCHEMA = {
+    "CD_RGN_REFNIS": (CATEGORY, REGION_CODES),
+    "CD_NACE": (CATEGORY, ()),
+    "CD_GENDER": (CATEGORY, ()),
+    "CD_AGE_RANGE": (CATEGORY, ()),
+}
+
 
 def update_mdx_frontmatter_date(path: Path, date_str: str) -> bool:
     """Update the sourcePublicationDate in MDX frontmatter."""
@@ -87,26 +105,26 @@ def download_and_extract_year(year: int) -> pd.DataFrame | None:
                     if chunk:
                         f.write(chunk)
 
-        # Extract
+        # Find the pipe-delimited file (should be .txt or similar)
         with zipfile.ZipFile(zip_path, "r") as z:
-            members = z.namelist()
-            # Find the pipe-delimited file (should be .txt or similar)
             txt_file = None
-            for m in members:
+            for m in z.namelist():
                 if m.endswith(".txt") or "ENTREP" in m.upper():
                     txt_file = m
                     break
 
-            if not txt_file:
-                print(f"  No data file found in {year} archive")
-                return None
+        if not txt_file:
+            print(f"  No data file found in {year} archive")
+            return None
 
-            z.extract(txt_file, DATA_DIR)
+        def read_txt() -> pd.DataFrame:
+            with zipfile.ZipFile(zip_path, "r") as z:
+                z.extract(txt_file, DATA_DIR)
             extracted_path = DATA_DIR / txt_file
 
             # Read the pipe-delimited file
             try:
-                df = pd.read_csv(
+                return pd.read_csv(
                     extracted_path,
                     sep="|",
                     encoding="utf-8-sig",
@@ -114,7 +132,7 @@ def download_and_extract_year(year: int) -> pd.DataFrame | None:
                     low_memory=False,
                 )
             except UnicodeDecodeError:
-                df = pd.read_csv(
+                return pd.read_csv(
                     extracted_path,
                     sep="|",
                     encoding="latin-1",
@@ -122,11 +140,14 @@ def download_and_extract_year(year: int) -> pd.DataFrame | None:
                     low_memory=False,
                 )
 
-            # Add year column
-            df["YEAR"] = year
+        # Unchanged archives are read back from the Parquet cache
+        df = load_or_parse(zip_path, read_txt, CACHE_DIR, zip_path.stem, PARSE_VERSION)
+
+        # Add year column
+        df["YEAR"] = year
 
-            print(f"  Found {len(df)} rows for {year}")
-            return df
+        print(f"  Found {len(df)} rows for {year}")
+        return df
 
     except requests.exceptions.HTTPError as e:
         if e.response.status_code == 404:
@@ -205,14 +226,17 @@ def process_data() -> None:
     # CD_GENDER|TX_GENDER_DESCR_FR|TX_GENDER_DESCR_NL|TX_GENDER_DESCR_EN|CD_AGE_RANGE|AGE_RANGE_DESCR_FR|AGE_RANGE_DESCR_NL|
     # AGE_RANGE_DESCR_EN|MS_ENTREP_NUM
 
-    # Normalize region codes
+    # Normalize region codes (once per distinct code, not once per row)
     if "CD_RGN_REFNIS" in df.columns:
-        df["CD_RGN_REFNIS"] = df["CD_RGN_REFNIS"].map(normalize_refnis_region)
+        df["CD_RGN_REFNIS"] = to_category(df["CD_RGN_REFNIS"]).map(normalize_refnis_region)
 
     # Convert numeric columns
     if "MS_ENTREP_NUM" in df.columns:
         df["MS_ENTREP_NUM"] = pd.to_numeric(df["MS_ENTREP_NUM"], errors="coerce")
 
+    # Group on categorical dimensions
+    df = apply_schema(df, SCHEMA)
+
     if "CD_NACE" not in df.columns:
         print("Warning: CD_NACE column not found, using all sectors")
 
@@ -239,7 +263,7 @@ def process_data() -> None:
     if all(col in df_all.columns for col in group_cols_all + ["MS_ENTREP_NUM"]):
         grouped_all = (
             df_all[group_cols_all + ["MS_ENTREP_NUM"]]
-            .groupby(group_cols_all, dropna=False)["MS_ENTREP_NUM"]
+            .groupby(group_cols_all, dropna=False, observed=True)["MS_ENTREP_NUM"]
             .sum(min_count=1)
             .reset_index()
         )
@@ -261,7 +285,7 @@ def process_data() -> None:
     if all(col in df_all.columns for col in group_cols_sector + ["MS_ENTREP_NUM"]):
         grouped_sector = (
             df_all[group_cols_sector + ["MS_ENTREP_NUM"]]
-            .groupby(group_cols_sector, dropna=False)["MS_ENTREP_NUM"]
+            .groupby(group_cols_sector, dropna=False, observed=True)["MS_ENTREP_NUM"]
             .sum(min_count=1)
             .reset_index()
         )
@@ -281,7 +305,7 @@ def process_data() -> None:
     if all(col in df_all.columns for col in group_cols_gender + ["MS_ENTREP_NUM"]):
         grouped_gender = (
             df_all[group_cols_gender + ["MS_ENTREP_NUM"]]
-            .groupby(group_cols_gender, dropna=False)["MS_ENTREP_NUM"]
+            .groupby(group_cols_gender, dropna=False, observed=True)["MS_ENTREP_NUM"]
             .sum(min_count=1)
             .reset_index()
         )
@@ -301,7 +325,7 @@ def process_data() -> None:
     if all(col in df_all.columns for col in group_cols_region + ["MS_ENTREP_NUM"]):
         grouped_region = (
             df_all[group_cols_region + ["MS_ENTREP_NUM"]]
-            .groupby(group_cols_region, dropna=False)["MS_ENTREP_NUM"]
+            .groupby(group_cols_region, dropna=False, observed=True)["MS_ENTREP_NUM"]
             .sum(min_count=1)
             .reset_index()
         )
@@ -320,7 +344,7 @@ def process_data() -> None:
     if all(col in df_all.columns for col in group_cols_age + ["MS_ENTREP_NUM"]):
         grouped_age = (
             df_all[group_cols_age + ["MS_ENTREP_NUM"]]
-            .groupby(group_cols_age, dropna=False)["MS_ENTREP_NUM"]
+            .groupby(group_cols_age, dropna=False, observed=True)["MS_ENTREP_NUM"]
             .sum(min_count=1)
             .reset_index()
         )
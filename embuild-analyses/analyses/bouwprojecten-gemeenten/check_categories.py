@@ -1,15 +1,14 @@
 """Check if categories are correctly applied to projects_2026_full.parquet"""
-import pandas as pd
 import sys
 from pathlib import Path
 
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 from category_keywords import classify_project, get_category_label, CATEGORY_DEFINITIONS
+from project_store import load_project_store
 
 # Load the parquet file
-parquet_file = Path(__file__).parent / 'results' / 'projects_2026_full.parquet'
-df = pd.read_parquet(parquet_file)
+df = load_project_store()
 
 print("="*80)
 print("PARQUET FILE ANALYSIS")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark the project classifier on meerjarenplan projecten.csv.
+
+Compares the previous classifier (`keyword in text` for every keyword of
+every category) with classify_project (one matcher compiled from
+CATEGORY_DEFINITIONS), and checks that both give the same categories for
+every action.
+
+Usage:
+    python benchmark_classifier.py ["path/to/meerjarenplan projecten.csv"]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from category_keywords import CATEGORY_DEFINITIONS, classify_project
+from process_project_details import INPUT_CSV, extract_code_descriptions
+
+
+def classify_project_scan(ac_short, ac_long):
+    """The per-keyword classifier that classify_project replaced."""
+    text = f"{ac_short} {ac_long}".lower()
+    categories = []
+
+    for category_id, category_def in CATEGORY_DEFINITIONS.items():
+        if any(keyword in text for keyword in category_def["keywords"]):
+            categories.append(category_id)
+
+    return categories if categories else ["overige"]
+
+
+def main():
+    csv_path = Path(sys.argv[1]) if len(sys.argv) > 1 else INPUT_CSV
+    df = pd.read_csv(csv_path, sep=';', quotechar='"', encoding='utf-8')
+    actions = [(ac.get('short', ''), ac.get('long', '')) for ac in extract_code_descriptions(df['Actie totaaloverzicht'])]
+    keywords = sum(len(d["keywords"]) for d in CATEGORY_DEFINITIONS.values())
+    print(f"{len(actions)} actions, {len(CATEGORY_DEFINITIONS)} categories, {keywords} keywords")
+
+    start = time.perf_counter()
+    before = [classify_project_scan(short, long) for short, long in actions]
+    scan_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    after = [classify_project(short, long) for short, long in actions]
+    matcher_time = time.perf_counter() - start
+
+    mismatches = sum(a != b for a, b in zip(before, after))
+    print(f"keyword in text:  {scan_time:.3f} s")
+    print(f"compiled matcher: {matcher_time:.3f} s ({scan_time / matcher_time:.1f}x)")
+    print(f"mismatches: {mismatches}")
+
+
+if __name__ == '__main__':
+    main()
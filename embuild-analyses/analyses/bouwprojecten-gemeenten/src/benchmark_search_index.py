@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark the trigram search index on the projects of the parquet snapshot.
+
+Writes the list chunks and the search index to a temporary directory as
+chunk_and_save does, then runs sample queries through `query_index`. For
+every query it checks the result against matching `search_text` of every
+project, and reports the time and the bytes read: index files (manifest and
+shards) and list chunks of the candidates, against loading every chunk.
+
+Usage:
+    python benchmark_search_index.py [--parquet PATH] [--chunk-size N] [query ...]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from process_project_details import CHUNK_FILE, CHUNK_SIZE, split_chunk, write_compact_json
+from project_store import PARQUET_FULL, load_project_store, project_records
+from search_index import SEARCH_DIR_NAME, query_index, search_text, write_search_index
+
+QUERIES = ['school', 'riolering', 'sporthal', 'fietspad', 'kerkstraat', 'zwembad',
+           'asbest', 'gent', 'ledverlichting', 'wegenbouw', 'xyzzy', 'led', 'ze']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--parquet', type=Path, default=PARQUET_FULL)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('queries', nargs='*', default=QUERIES)
+    args = parser.parse_args()
+    chunk_size = args.chunk_size
+
+    projects = sorted(project_records(load_project_store(args.parquet)), key=lambda p: p['total_amount'], reverse=True)
+    texts = [search_text(p) for p in projects]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        rows = []
+        chunk_bytes = 0
+        for i in range(0, len(projects), chunk_size):
+            chunk_rows, _ = split_chunk(projects[i:i + chunk_size])
+            filepath = data_dir / CHUNK_FILE.format(chunk=i // chunk_size)
+            write_compact_json(chunk_rows, filepath)
+            chunk_bytes += filepath.stat().st_size
+            rows.extend(chunk_rows)
+
+        start = time.perf_counter()
+        manifest = write_search_index(rows, data_dir, chunk_size, CHUNK_FILE)
+        build_time = time.perf_counter() - start
+        index_bytes = sum(f.stat().st_size for f in (data_dir / SEARCH_DIR_NAME).iterdir())
+        print(f"{len(projects)} projects in chunks of {chunk_size}: list chunks {chunk_bytes / 1e6:.2f} MB; "
+              f"index {index_bytes / 1e6:.2f} MB in {len(manifest['shards'])} shards, built in {build_time:.2f} s\n")
+
+        print(f"{'query':<16}{'matches':>8}{'index':>10}{'chunks':>8}{'chunk bytes':>13}{'of all':>8}{'time':>10}  check")
+        mismatches = 0
+        for query in args.queries:
+            index_read, chunks_read = [], []
+
+            def read_json(name):
+                filepath = data_dir / name
+                (index_read if name.startswith(SEARCH_DIR_NAME) else chunks_read).append(filepath.stat().st_size)
+                with open(filepath, encoding='utf-8') as f:
+                    return json.load(f)
+
+            start = time.perf_counter()
+            found = query_index(query, read_json)
+            elapsed = time.perf_counter() - start
+
+            if found is None:
+                print(f"{query:<16}{'-':>8}{sum(index_read):>10,}  too short for the index; search the loaded chunks")
+                continue
+            expected = [i for i, text in enumerate(texts) if query.lower() in text]
+            ok = found == expected
+            mismatches += not ok
+            print(f"{query:<16}{len(found):>8}{sum(index_read):>10,}{len(chunks_read):>8}{sum(chunks_read):>13,}"
+                  f"{sum(chunks_read) / chunk_bytes:>8.0%}{elapsed * 1000:>8.1f}ms  {'ok' if ok else 'MISMATCH'}")
+
+        print(f"\nmismatches: {mismatches}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark the BD/AP/AC text block parser on meerjarenplan projecten.csv.
+
+Compares the previous parser (five regex searches per block, three blocks
+per row) with extract_code_descriptions (str.find, each distinct block of a
+column parsed once), and checks that both give the same result for every
+row.
+
+Usage:
+    python benchmark_text_blocks.py ["path/to/meerjarenplan projecten.csv"]
+"""
+
+import re
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from process_project_details import INPUT_CSV, extract_code_descriptions
+
+TEXT_COLUMNS = ['Beleidsdoelst. totaaloverzicht', 'Actieplan totaaloverzicht', 'Actie totaaloverzicht']
+
+
+def extract_code_description_regex(text_block):
+    """The regex parser that extract_code_description replaced."""
+    if pd.isna(text_block) or not text_block.strip():
+        return {}
+
+    result = {}
+
+    code_match = re.search(r'Code:\s*([A-Z]+\d+)', text_block)
+    if code_match:
+        result['code'] = code_match.group(1)
+
+    short_match = re.search(r'Korte omschrijving:\s*(.+?)(?:\n|$)', text_block, re.DOTALL)
+    if short_match:
+        short_text = short_match.group(1).strip()
+        short_text = re.split(r'\n(?=Lange omschrijving:|Commentaar:|Evaluatie:)', short_text)[0].strip()
+        result['short'] = short_text
+
+    long_match = re.search(r'Lange omschrijving:\s*(.+?)(?=\nCommentaar:|\nEvaluatie:|$)', text_block, re.DOTALL)
+    if long_match:
+        result['long'] = long_match.group(1).strip()
+
+    comment_match = re.search(r'Commentaar:\s*(.+?)(?=\nEvaluatie:|$)', text_block, re.DOTALL)
+    if comment_match:
+        comment_text = comment_match.group(1).strip()
+        if comment_text:
+            result['comment'] = comment_text
+
+    eval_match = re.search(r'Evaluatie:\s*(.+?)$', text_block, re.DOTALL)
+    if eval_match:
+        eval_text = eval_match.group(1).strip()
+        if eval_text:
+            result['evaluation'] = eval_text
+
+    return result
+
+
+def main():
+    csv_path = Path(sys.argv[1]) if len(sys.argv) > 1 else INPUT_CSV
+    df = pd.read_csv(csv_path, sep=';', quotechar='"', encoding='utf-8')
+    columns = [df[col] for col in TEXT_COLUMNS]
+    print(f"{len(df)} rows, {sum(col.nunique() for col in columns)} distinct text blocks")
+
+    start = time.perf_counter()
+    before = [[extract_code_description_regex(block) for block in col] for col in columns]
+    regex_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    after = [extract_code_descriptions(col) for col in columns]
+    column_time = time.perf_counter() - start
+
+    mismatches = sum(a != b for col_a, col_b in zip(before, after) for a, b in zip(col_a, col_b))
+    print(f"regex per row:     {regex_time:.3f} s")
+    print(f"str.find, column:  {column_time:.3f} s ({regex_time / column_time:.1f}x)")
+    print(f"mismatches: {mismatches}")
+
+
+if __name__ == '__main__':
+    main()
@@ -5,8 +5,20 @@ Each category has:
 - id: unique identifier
 - label: display name
 - keywords: list of keywords to match in project descriptions
+
+A project belongs to every category with a keyword that occurs anywhere in
+its lowercased description (substring match). `classify_project` finds all
+of them in one pass with a matcher compiled from CATEGORY_DEFINITIONS, see
+`compile_keyword_matcher`. `classify_projects_batch` classifies many texts
+at once, optionally on a process pool.
 """
 
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
 CATEGORY_DEFINITIONS = {
     "wegenbouw": {
         "id": "wegenbouw",
@@ -127,6 +139,110 @@ CATEGORY_DEFINITIONS = {
 }
 
 
+def _trie_pattern(keywords):
+    """Regex alternation of `keywords` factored into a trie.
+
+    At any position it matches the longest keyword that starts there.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def alternation(node):
+        branches = [re.escape(char) + alternation(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # A keyword ends here: the longer keywords are optional and tried first
+        return f"(?:{body})?" if "" in node else body
+
+    return alternation(trie)
+
+
+def compile_keyword_matcher(definitions):
+    """
+    Compile the keywords of `definitions` into a single matcher.
+
+    Categories are bits of an int. Keywords without whitespace always lie
+    within one whitespace-separated token of the text, so every distinct
+    token is scanned once by a trie-shaped regex of all those keywords
+    (overlapping matches, the longest keyword at each position) and its
+    category bits are remembered. The keyword found at a position maps to
+    the categories of all keywords that are a prefix of it, since those
+    start there as well. The few keywords containing whitespace are looked
+    up in the full text.
+
+    Args:
+        definitions: Mapping of category id -> definition with "keywords"
+
+    Returns:
+        Function taking a lowercased text and returning the matching category
+        IDs in `definitions` order, or ["overige"]
+    """
+    category_ids = list(definitions)
+    bits = {category_id: 1 << i for i, category_id in enumerate(category_ids)}
+
+    keyword_bits = {}
+    for category_id, category_def in definitions.items():
+        for keyword in category_def["keywords"]:
+            keyword_bits[keyword] = keyword_bits.get(keyword, 0) | bits[category_id]
+
+    spanning = [(kw, mask) for kw, mask in keyword_bits.items() if not kw or any(c.isspace() for c in kw)]
+    token_keywords = [kw for kw in keyword_bits if kw and not any(c.isspace() for c in kw)]
+
+    pattern = re.compile(f"(?=({_trie_pattern(token_keywords)}))")
+    prefix_bits = {}
+    for keyword in token_keywords:
+        prefix_bits[keyword] = 0
+        for other in token_keywords:
+            if keyword.startswith(other):
+                prefix_bits[keyword] |= keyword_bits[other]
+
+    token_bits = {}
+    category_lists = {}
+
+    def match(text):
+        mask = 0
+        for token in set(text.split()):
+            token_mask = token_bits.get(token)
+            if token_mask is None:
+                token_mask = 0
+                for keyword in pattern.findall(token):
+                    token_mask |= prefix_bits.get(keyword, 0)
+                token_bits[token] = token_mask
+            mask |= token_mask
+
+        for keyword, keyword_mask in spanning:
+            if mask & keyword_mask != keyword_mask and keyword in text:
+                mask |= keyword_mask
+
+        categories = category_lists.get(mask)
+        if categories is None:
+            categories = tuple(cid for cid in category_ids if mask & bits[cid]) or ("overige",)
+            category_lists[mask] = categories
+        return list(categories)
+
+    return match
+
+
+_match_categories = compile_keyword_matcher(CATEGORY_DEFINITIONS)
+
+
+# Set to the number of processes classify_projects_batch uses by default
+WORKERS_ENV_VAR = "CLASSIFY_WORKERS"
+
+# Distinct texts per process pool task
+BATCH_CHUNK_SIZE = 5000
+
+
+def project_text(ac_short, ac_long):
+    """The text a project is classified on."""
+    return f"{ac_short} {ac_long}"
+
+
 def classify_project(ac_short, ac_long):
     """
     Classify a project based on keywords in its short and long descriptions.
@@ -138,14 +254,48 @@ def classify_project(ac_short, ac_long):
     Returns:
         List of category IDs that match the project
     """
-    text = f"{ac_short} {ac_long}".lower()
-    categories = []
+    return _match_categories(project_text(ac_short, ac_long).lower())
+
+
+def _classify_lowered(texts):
+    return [_match_categories(text) for text in texts]
+
+
+def default_workers():
+    """Worker count from CLASSIFY_WORKERS, or the number of CPUs."""
+    return int(os.environ.get(WORKERS_ENV_VAR, os.cpu_count() or 1))
+
+
+def classify_projects_batch(texts, workers=None, chunk_size=BATCH_CHUNK_SIZE):
+    """
+    Classify many project texts at once.
+
+    The texts are lowercased as one Series and every distinct text is
+    classified once. With more than one worker and more than `chunk_size`
+    distinct texts, the texts are split over a process pool.
+
+    Args:
+        texts: Series or iterable of project texts (see `project_text`)
+        workers: Number of processes; 1 classifies in this process. Defaults
+                 to `default_workers()`
+        chunk_size: Distinct texts per process pool task
+
+    Returns:
+        List with the category IDs of every text, in order (as classify_project)
+    """
+    workers = default_workers() if workers is None else workers
+    lowered = pd.Series(list(texts), dtype=object).map(str).str.lower()
+    codes, uniques = pd.factorize(lowered)
+    uniques = uniques.tolist()
 
-    for category_id, category_def in CATEGORY_DEFINITIONS.items():
-        if any(keyword in text for keyword in category_def["keywords"]):
-            categories.append(category_id)
+    if workers > 1 and len(uniques) > chunk_size:
+        chunks = [uniques[i:i + chunk_size] for i in range(0, len(uniques), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            categories = [c for part in pool.map(_classify_lowered, chunks) for c in part]
+    else:
+        categories = _classify_lowered(uniques)
 
-    return categories if categories else ["overige"]
+    return [list(categories[code]) for code in codes]
 
 
 def get_category_label(category_id):
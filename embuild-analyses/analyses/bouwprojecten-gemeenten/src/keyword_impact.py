@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Show what adding or removing category keywords changes, from the keyword index.
+
+Usage:
+    python keyword_impact.py --add scholenbouw=scholen --remove werking=dienst [--examples 5] [--parquet PATH]
+
+Every --add/--remove takes CATEGORY=KEYWORD and can be repeated. The index
+over results/projects_2026_full.parquet is built on the first run and reused
+while the snapshot is unchanged (see keyword_index.py).
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from category_keywords import CATEGORY_DEFINITIONS, get_category_label
+from keyword_index import PARQUET_FULL, keyword_impact, load_keyword_index
+
+
+def parse_changes(values):
+    changes = {}
+    for value in values or []:
+        category_id, sep, keyword = value.partition('=')
+        if not sep or not keyword:
+            raise SystemExit(f"Expected CATEGORY=KEYWORD, got '{value}'")
+        if category_id not in CATEGORY_DEFINITIONS:
+            raise SystemExit(f"Unknown category '{category_id}', expected one of {sorted(CATEGORY_DEFINITIONS)}")
+        changes.setdefault(category_id, []).append(keyword.lower())
+    return changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--add', action='append', metavar='CATEGORY=KEYWORD', help='keyword to add to a category')
+    parser.add_argument('--remove', action='append', metavar='CATEGORY=KEYWORD', help='keyword to remove from a category')
+    parser.add_argument('--examples', type=int, default=5, help='example projects per change (default: 5)')
+    parser.add_argument('--parquet', type=Path, default=PARQUET_FULL, help='project snapshot (default: results/projects_2026_full.parquet)')
+    args = parser.parse_args()
+
+    add, remove = parse_changes(args.add), parse_changes(args.remove)
+
+    start = time.perf_counter()
+    index = load_keyword_index(args.parquet)
+    print(f"Index of {len(index['texts'])} projects, {len(index['tokens'])} tokens ({time.perf_counter() - start:.2f} s)")
+
+    start = time.perf_counter()
+    impact = keyword_impact(index, CATEGORY_DEFINITIONS, add=add, remove=remove)
+    print(f"Impact computed in {(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+    if not impact:
+        print("No project changes category.")
+        return
+
+    projects = index['projects']
+    for category_id, change in impact.items():
+        print(f"{get_category_label(category_id)} ({category_id}): +{len(change['gained'])} / -{len(change['lost'])}")
+        for sign, ids in (('+', change['gained']), ('-', change['lost'])):
+            for project_id in ids[:args.examples].tolist():
+                print(f"  {sign} {projects['municipality'][project_id]}: {str(projects['ac_short'][project_id])[:80]}")
+
+
+if __name__ == '__main__':
+    main()
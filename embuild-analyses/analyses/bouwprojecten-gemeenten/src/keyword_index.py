@@ -0,0 +1,205 @@
+"""
+Inverted index over the action texts of bouwprojecten, for keyword tuning.
+
+Tuning CATEGORY_DEFINITIONS is iterative: add a keyword, see which projects
+change category, repeat. Rather than reloading every chunk and classifying
+every project again per experiment, the projects are indexed once:
+
+- every whitespace-separated token of the lowercased `project_text` maps to
+  the ids (positions) of the projects containing it, stored as one sorted
+  posting list per token;
+- the index is cached as JSON under the SHA-256 of the parquet snapshot
+  (see project_store.py), so it is only rebuilt when the snapshot changes.
+
+A keyword without whitespace occurs in a text exactly when it occurs in one
+of its tokens, so its projects are the union of the posting lists of the
+tokens containing it. Those tokens are found with `str.find` over the
+vocabulary. Keywords with whitespace are checked against the texts of the
+candidate projects. What a keyword change does to the categories then
+follows from set operations on posting lists:
+
+    index = load_keyword_index()
+    impact = keyword_impact(index, CATEGORY_DEFINITIONS, add={"scholenbouw": ["scholen"]})
+    impact["scholenbouw"]["gained"]  # project ids
+"""
+
+import copy
+import sys
+from bisect import bisect_right
+from pathlib import Path
+
+import numpy as np
+
+from category_keywords import project_text
+from project_store import PARQUET_FULL, load_project_store, project_records
+
+SCRIPT_DIR = Path(__file__).parent
+SHARED_DATA_DIR = SCRIPT_DIR.parent.parent.parent / 'shared-data'
+sys.path.insert(0, str(SHARED_DATA_DIR))
+from parquet_cache import CACHE_DIR_NAME, load_or_build_json  # noqa: E402
+
+CACHE_DIR = SCRIPT_DIR.parent / 'data' / CACHE_DIR_NAME
+INDEX_NAME = 'bouwprojecten-keyword-index'
+
+# Project fields kept in the index, to report on without the chunks
+PROJECT_FIELDS = ['municipality', 'ac_code', 'ac_short', 'categories']
+
+
+def build_keyword_index(projects):
+    """
+    Build the JSON-serializable index of `projects` (project dicts, see `project_records`).
+
+    Returns:
+        dict with the lowercased `texts`, the PROJECT_FIELDS per project, the
+        sorted `tokens` and their posting lists as one flat `ids` list with
+        `offsets` (token i has ids[offsets[i]:offsets[i + 1]]).
+    """
+    texts = [project_text(p.get('ac_short', ''), p.get('ac_long', '')).lower() for p in projects]
+
+    postings = {}
+    for project_id, text in enumerate(texts):
+        for token in set(text.split()):
+            postings.setdefault(token, []).append(project_id)
+
+    tokens = sorted(postings)
+    offsets = [0]
+    ids = []
+    for token in tokens:
+        ids.extend(postings[token])
+        offsets.append(len(ids))
+
+    return {
+        'texts': texts,
+        'projects': {field: [p.get(field) for p in projects] for field in PROJECT_FIELDS},
+        'tokens': tokens,
+        'offsets': offsets,
+        'ids': ids,
+    }
+
+
+def load_keyword_index(path=PARQUET_FULL, cache_dir=CACHE_DIR):
+    """
+    The keyword index of the snapshot at `path`, from the cache when it is unchanged.
+
+    Project ids are row positions in `load_project_store(path)`. Returns the
+    index prepared for queries (see `open_keyword_index`).
+    """
+    def build():
+        return build_keyword_index(project_records(load_project_store(path)))
+
+    data = load_or_build_json(Path(path), build, cache_dir, INDEX_NAME)
+    return open_keyword_index(data)
+
+
+def open_keyword_index(data):
+    """Prepare an index built by `build_keyword_index` for queries."""
+    # Tokens never contain whitespace, so a keyword without whitespace
+    # can only be found within one token of the joined vocabulary
+    vocabulary = '\n'.join(data['tokens'])
+    starts = [0]
+    for token in data['tokens'][:-1]:
+        starts.append(starts[-1] + len(token) + 1)
+    return {
+        **data,
+        'vocabulary': vocabulary,
+        'starts': starts,
+        'ids': np.asarray(data['ids'], dtype=np.int64),
+        'keyword_ids': {},
+    }
+
+
+def _token_projects(index, keyword):
+    # Projects with a token that contains `keyword`
+    vocabulary, starts, offsets, ids = index['vocabulary'], index['starts'], index['offsets'], index['ids']
+    postings = []
+    last_token = -1
+    position = vocabulary.find(keyword)
+    while position != -1:
+        token = bisect_right(starts, position) - 1
+        if token != last_token:
+            postings.append(ids[offsets[token]:offsets[token + 1]])
+            last_token = token
+        position = vocabulary.find(keyword, position + 1)
+    if not postings:
+        return np.empty(0, dtype=np.int64)
+    return np.unique(np.concatenate(postings))
+
+
+def projects_with_keyword(index, keyword):
+    """Sorted ids of the projects whose text contains `keyword` (lowercase)."""
+    found = index['keyword_ids'].get(keyword)
+    if found is not None:
+        return found
+
+    parts = keyword.split()
+    if len(parts) == 1 and parts[0] == keyword:
+        found = _token_projects(index, keyword)
+    elif not parts:
+        found = np.arange(len(index['texts']), dtype=np.int64)
+    else:
+        # Only projects with tokens containing every part can contain the keyword
+        candidates = _token_projects(index, parts[0])
+        for part in parts[1:]:
+            candidates = np.intersect1d(candidates, _token_projects(index, part), assume_unique=True)
+        texts = index['texts']
+        found = np.array([i for i in candidates.tolist() if keyword in texts[i]], dtype=np.int64)
+
+    index['keyword_ids'][keyword] = found
+    return found
+
+
+def category_members(index, definitions):
+    """Sorted ids of the projects in every category of `definitions`, plus "overige"."""
+    members = {}
+    for category_id, category_def in definitions.items():
+        found = [projects_with_keyword(index, keyword) for keyword in category_def['keywords']]
+        members[category_id] = np.unique(np.concatenate(found)) if found else np.empty(0, dtype=np.int64)
+    in_any = np.unique(np.concatenate(list(members.values()))) if members else np.empty(0, dtype=np.int64)
+    members['overige'] = np.setdiff1d(np.arange(len(index['texts']), dtype=np.int64), in_any, assume_unique=True)
+    return members
+
+
+def classify_indexed(index, definitions):
+    """Category IDs of every project under `definitions`, as classify_project returns them."""
+    categories = [[] for _ in index['texts']]
+    for category_id, ids in category_members(index, definitions).items():
+        for project_id in ids.tolist():
+            categories[project_id].append(category_id)
+    return categories
+
+
+def edit_definitions(definitions, add=None, remove=None):
+    """Copy of `definitions` with keywords added and removed, given as {category_id: [keyword, ...]}."""
+    edited = copy.deepcopy(definitions)
+    for category_id, keywords in (remove or {}).items():
+        edited[category_id]['keywords'] = [k for k in edited[category_id]['keywords'] if k not in keywords]
+    for category_id, keywords in (add or {}).items():
+        edited.setdefault(category_id, {'id': category_id, 'label': category_id, 'keywords': []})
+        edited[category_id]['keywords'] += [k for k in keywords if k not in edited[category_id]['keywords']]
+    return edited
+
+
+def keyword_impact(index, definitions, add=None, remove=None):
+    """
+    What adding and removing keywords does to the categories.
+
+    Args:
+        index: Index from `load_keyword_index` or `open_keyword_index`
+        definitions: Current category definitions
+        add, remove: {category_id: [keyword, ...]}
+
+    Returns:
+        {category_id: {"gained": ids, "lost": ids}} for every category
+        (including "overige") whose projects change
+    """
+    before = category_members(index, definitions)
+    after = category_members(index, edit_definitions(definitions, add, remove))
+    impact = {}
+    for category_id in list(before) + [c for c in after if c not in before]:
+        old = before.get(category_id, np.empty(0, dtype=np.int64))
+        new = after.get(category_id, np.empty(0, dtype=np.int64))
+        gained = np.setdiff1d(new, old, assume_unique=True)
+        lost = np.setdiff1d(old, new, assume_unique=True)
+        if len(gained) or len(lost):
+            impact[category_id] = {'gained': gained, 'lost': lost}
+    return impact
@@ -5,17 +5,23 @@ This script:
 1. Parses the CSV file with multi-line text blocks
 2. Extracts project details (Beleidsdoelstelling, Actieplan, Actie)
 3. Classifies projects into contractor-relevant categories
-4. Outputs chunked JSON files for web consumption
+4. Outputs chunked JSON files for web consumption: compact list chunks plus
+   per-chunk detail shards with the long texts
 """
 
 import pandas as pd
 import json
-import re
+import sys
 from pathlib import Path
-from category_keywords import classify_project, get_category_label, CATEGORY_DEFINITIONS, summarize_projects_by_category
+from category_keywords import classify_projects_batch, project_text, get_category_label, CATEGORY_DEFINITIONS, summarize_projects_by_category
+from search_index import write_search_index
 
 # Directories
 SCRIPT_DIR = Path(__file__).parent
+SHARED_DATA_DIR = SCRIPT_DIR.parent.parent.parent / 'shared-data'
+sys.path.insert(0, str(SHARED_DATA_DIR))
+from belgian_numbers import parse_belgian_numbers  # noqa: E402
+
 DATA_DIR = SCRIPT_DIR.parent / 'data'
 PUBLIC_DATA_DIR = SCRIPT_DIR.parent.parent.parent / 'public' / 'data' / 'bouwprojecten-gemeenten'
 PUBLIC_DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -24,6 +30,26 @@ PUBLIC_DATA_DIR.mkdir(parents=True, exist_ok=True)
 INPUT_CSV = DATA_DIR / 'meerjarenplan projecten.csv'
 PARQUET_FULL = SCRIPT_DIR.parent / 'results' / 'projects_2026_full.parquet'
 
+# Years of the meerjarenplan; each has an '<year>,Uitgave' and an '<year>,Uitgave per inwoner' column
+YEARS = [str(year) for year in range(2026, 2032)]
+
+# Project fields in the list chunks (projects_2026_chunk_<n>.json). The long
+# action text and the BD/AP context go to the chunk's detail shard
+# (projects_2026_details_<n>.json), fetched only when a project is opened or
+# descriptions are searched.
+LIST_FIELDS = [
+    'municipality', 'nis_code', 'ac_code', 'ac_short',
+    'total_amount', 'amount_per_capita', 'yearly_amounts', 'yearly_per_capita', 'categories',
+]
+CONTEXT_FIELDS = {
+    'bd': ['bd_code', 'bd_short', 'bd_long'],
+    'ap': ['ap_code', 'ap_short', 'ap_long'],
+}
+# Projects per chunk. Small enough that a search only fetches the chunks of its matches
+CHUNK_SIZE = 500
+CHUNK_FILE = "projects_2026_chunk_{chunk}.json"
+DETAILS_FILE = "projects_2026_details_{chunk}.json"
+
 
 def load_input_dataframe():
     """Load data from the preferred source.
@@ -61,7 +87,6 @@ def load_input_dataframe():
     raise FileNotFoundError(f"No input file found. Checked parquet: {PARQUET_FULL} and csv: {INPUT_CSV}")
 
 # NIS code lookup for municipality names
-SHARED_DATA_DIR = SCRIPT_DIR.parent.parent.parent / 'shared-data'
 NIS_FILE = SHARED_DATA_DIR / 'nis' / 'refnis.csv'
 
 
@@ -87,6 +112,50 @@ def load_nis_lookups():
     return nis_lookup
 
 
+# Section labels of the BD/AP/AC text blocks
+CODE_LABEL = 'Code:'
+SHORT_LABEL = 'Korte omschrijving:'
+LONG_LABEL = 'Lange omschrijving:'
+COMMENT_LABEL = 'Commentaar:'
+EVALUATION_LABEL = 'Evaluatie:'
+
+CODE_LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+def _section(text_block, label):
+    """Text after the first `label`, without leading whitespace (None when there is none)."""
+    pos = text_block.find(label)
+    if pos < 0 or pos + len(label) == len(text_block):
+        return None
+    return text_block[pos + len(label):].lstrip()
+
+
+def _until(text, *terminators):
+    """`text` up to the first of `terminators`, stripped."""
+    end = len(text)
+    for terminator in terminators:
+        pos = text.find(terminator)
+        if 0 <= pos < end:
+            end = pos
+    return text[:end].strip()
+
+
+def _code(text_block):
+    """First code (capitals followed by digits) after a 'Code:' label."""
+    pos = text_block.find(CODE_LABEL)
+    while pos >= 0:
+        rest = text_block[pos + len(CODE_LABEL):].lstrip()
+        digits = rest.lstrip(CODE_LETTERS)
+        letters = len(rest) - len(digits)
+        n_digits = 0
+        while n_digits < len(digits) and digits[n_digits].isdecimal():
+            n_digits += 1
+        if letters and n_digits:
+            return rest[:letters + n_digits]
+        pos = text_block.find(CODE_LABEL, pos + 1)
+    return None
+
+
 def extract_code_description(text_block):
     """
     Extract code and descriptions from a multi-line text block.
@@ -98,6 +167,13 @@ def extract_code_description(text_block):
     Commentaar: Optional comment
     Evaluatie: Optional evaluation"
 
+    Each label is located once with str.find, so the block is scanned
+    without regular expressions. Labels are matched anywhere in the block
+    (not only at line starts): the short description is the rest of its
+    line, the long description runs up to a line starting with Commentaar:
+    or Evaluatie:, the comment up to a line starting with Evaluatie:, and
+    the evaluation to the end.
+
     Returns:
         dict with keys: code, short, long, comment, evaluation
     """
@@ -106,41 +182,47 @@ def extract_code_description(text_block):
 
     result = {}
 
-    # Extract code (BD, AP, or AC followed by digits)
-    code_match = re.search(r'Code:\s*([A-Z]+\d+)', text_block)
-    if code_match:
-        result['code'] = code_match.group(1)
-
-    # Extract korte omschrijving
-    short_match = re.search(r'Korte omschrijving:\s*(.+?)(?:\n|$)', text_block, re.DOTALL)
-    if short_match:
-        short_text = short_match.group(1).strip()
-        # Extract until next section or newline
-        short_text = re.split(r'\n(?=Lange omschrijving:|Commentaar:|Evaluatie:)', short_text)[0].strip()
-        result['short'] = short_text
-
-    # Extract lange omschrijving
-    long_match = re.search(r'Lange omschrijving:\s*(.+?)(?=\nCommentaar:|\nEvaluatie:|$)', text_block, re.DOTALL)
-    if long_match:
-        result['long'] = long_match.group(1).strip()
-
-    # Extract commentaar (optional)
-    comment_match = re.search(r'Commentaar:\s*(.+?)(?=\nEvaluatie:|$)', text_block, re.DOTALL)
-    if comment_match:
-        comment_text = comment_match.group(1).strip()
+    code = _code(text_block)
+    if code:
+        result['code'] = code
+
+    short_text = _section(text_block, SHORT_LABEL)
+    if short_text is not None:
+        result['short'] = _until(short_text, '\n')
+
+    long_text = _section(text_block, LONG_LABEL)
+    if long_text is not None:
+        result['long'] = _until(long_text, '\n' + COMMENT_LABEL, '\n' + EVALUATION_LABEL)
+
+    # Commentaar and Evaluatie are optional and only kept when not empty
+    comment_text = _section(text_block, COMMENT_LABEL)
+    if comment_text is not None:
+        comment_text = _until(comment_text, '\n' + EVALUATION_LABEL)
         if comment_text:
             result['comment'] = comment_text
 
-    # Extract evaluatie (optional)
-    eval_match = re.search(r'Evaluatie:\s*(.+?)$', text_block, re.DOTALL)
-    if eval_match:
-        eval_text = eval_match.group(1).strip()
+    eval_text = _section(text_block, EVALUATION_LABEL)
+    if eval_text is not None:
+        eval_text = eval_text.strip()
         if eval_text:
             result['evaluation'] = eval_text
 
     return result
 
 
+def extract_code_descriptions(text_blocks):
+    """
+    extract_code_description for a whole column of text blocks.
+
+    BD and AP blocks repeat for every action under them, so each distinct
+    block is parsed once. Returns a list aligned with `text_blocks`; rows
+    with the same block share one (read-only) dict.
+    """
+    codes, uniques = pd.factorize(pd.Series(text_blocks, dtype=object), use_na_sentinel=True)
+    parsed = [extract_code_description(block) for block in uniques] + [{}]
+    return [parsed[code] for code in codes]
+
+
 def parse_csv():
     """Parse the CSV file with multi-line text blocks."""
     print("\n" + "="*60)
@@ -167,7 +249,22 @@ def process_projects(df, nis_lookup):
     skipped_no_nis = 0
     skipped_no_amounts = 0
 
-    for idx, row in df.iterrows():
+    # Text blocks are parsed per column, once per distinct block
+    bd_blocks = extract_code_descriptions(df['Beleidsdoelst. totaaloverzicht'])
+    ap_blocks = extract_code_descriptions(df['Actieplan totaaloverzicht'])
+    ac_blocks = extract_code_descriptions(df['Actie totaaloverzicht'])
+
+    # Yearly amounts are parsed per column; missing or unparseable values count as 0
+    amounts = pd.DataFrame({year: parse_belgian_numbers(df[f'{year},Uitgave']) for year in YEARS}).fillna(0)
+    per_capita = pd.DataFrame({year: parse_belgian_numbers(df[f'{year},Uitgave per inwoner']) for year in YEARS}).fillna(0)
+    has_any_amount = (amounts > 0).any(axis=1).to_numpy()
+    # Running sums add the years in order, so totals round as the per-row sums did
+    total_amounts = amounts.cumsum(axis=1)[YEARS[-1]].tolist()
+    avg_per_capita = (per_capita.cumsum(axis=1)[YEARS[-1]] / len(YEARS)).tolist()
+    yearly_amounts = amounts.to_numpy().tolist()
+    yearly_per_capita = per_capita.to_numpy().tolist()
+
+    for pos, (idx, row) in enumerate(df.iterrows()):
         if idx % 500 == 0:
             print(f"Processing record {idx}/{len(df)}...")
 
@@ -183,83 +280,21 @@ def process_projects(df, nis_lookup):
             skipped_no_nis += 1
             continue
 
-        # Extract Beleidsdoelstelling
-        bd_data = extract_code_description(row['Beleidsdoelst. totaaloverzicht'])
-
-        # Extract Actieplan
-        ap_data = extract_code_description(row['Actieplan totaaloverzicht'])
-
-        # Extract Actie (the actual project)
-        ac_data = extract_code_description(row['Actie totaaloverzicht'])
+        # Beleidsdoelstelling, Actieplan and Actie (the actual project)
+        bd_data = bd_blocks[pos]
+        ap_data = ap_blocks[pos]
+        ac_data = ac_blocks[pos]
 
         if not ac_data.get('code') or not ac_data.get('short'):
             continue  # Skip if no valid action
 
-        # Parse yearly amounts
-        year_columns = [
-            ('2026,Uitgave', '2026,Uitgave per inwoner'),
-            ('2027,Uitgave', '2027,Uitgave per inwoner'),
-            ('2028,Uitgave', '2028,Uitgave per inwoner'),
-            ('2029,Uitgave', '2029,Uitgave per inwoner'),
-            ('2030,Uitgave', '2030,Uitgave per inwoner'),
-            ('2031,Uitgave', '2031,Uitgave per inwoner')
-        ]
-
-        yearly_amounts = {}
-        yearly_per_capita = {}
-        total_amount = 0
-        has_any_amount = False
-
-        for year, (total_col, per_capita_col) in zip(range(2026, 2032), year_columns):
-            year_str = str(year)
-
-            # Parse total amount
-            amount_val = row.get(total_col)
-            if pd.notna(amount_val):
-                # Handle both int/float and string formats
-                if isinstance(amount_val, (int, float)):
-                    amount = amount_val
-                else:
-                    # Remove dots (thousand separators) and replace comma with dot
-                    amount_str = str(amount_val).replace('.', '').replace(',', '.')
-                    try:
-                        amount = float(amount_str)
-                    except:
-                        amount = 0
-                yearly_amounts[year_str] = amount
-                total_amount += amount
-                if amount > 0:
-                    has_any_amount = True
-            else:
-                yearly_amounts[year_str] = 0
-
-            # Parse per capita amount
-            per_capita_val = row.get(per_capita_col)
-            if pd.notna(per_capita_val):
-                if isinstance(per_capita_val, (int, float)):
-                    per_capita = per_capita_val
-                else:
-                    per_capita_str = str(per_capita_val).replace('.', '').replace(',', '.')
-                    try:
-                        per_capita = float(per_capita_str)
-                    except:
-                        per_capita = 0
-                yearly_per_capita[year_str] = per_capita
-            else:
-                yearly_per_capita[year_str] = 0
-
         # Skip projects with no budget
-        if not has_any_amount:
+        if not has_any_amount[pos]:
             skipped_no_amounts += 1
             continue
 
-        # Calculate average per capita
-        avg_per_capita = sum(yearly_per_capita.values()) / 6 if yearly_per_capita else 0
-
-        # Classify project into categories
         ac_short = ac_data.get('short', '')
         ac_long = ac_data.get('long', '')
-        categories = classify_project(ac_short, ac_long)
 
         # Build project record
         project = {
@@ -274,23 +309,60 @@ def process_projects(df, nis_lookup):
             "ac_code": ac_data.get('code', ''),
             "ac_short": ac_short,
             "ac_long": ac_long,
-            "total_amount": round(total_amount, 2),
-            "amount_per_capita": round(avg_per_capita, 2),
-            "yearly_amounts": {k: round(v, 2) for k, v in yearly_amounts.items()},
-            "yearly_per_capita": {k: round(v, 2) for k, v in yearly_per_capita.items()},
-            "categories": categories
+            "total_amount": round(total_amounts[pos], 2),
+            "amount_per_capita": round(avg_per_capita[pos], 2),
+            "yearly_amounts": {year: round(v, 2) for year, v in zip(YEARS, yearly_amounts[pos])},
+            "yearly_per_capita": {year: round(v, 2) for year, v in zip(YEARS, yearly_per_capita[pos])},
         }
 
         projects.append(project)
 
+    # Classify all projects into categories at once
+    texts = [project_text(p["ac_short"], p["ac_long"]) for p in projects]
+    for project, categories in zip(projects, classify_projects_batch(texts)):
+        project["categories"] = categories
+
     print(f"\nProcessed {len(projects)} valid projects")
     print(f"Skipped: {skipped_no_municipality} (no municipality), {skipped_no_nis} (no NIS code), {skipped_no_amounts} (no amounts)")
 
     return projects
 
 
-def chunk_and_save(projects, chunk_size=2000):
-    """Split projects into chunks and save as JSON files."""
+def split_chunk(projects):
+    """
+    Split the projects of one chunk into list rows and a detail shard.
+
+    Many projects share a beleidsdoelstelling and actieplan, so the shard
+    holds every distinct [code, short, long] once, in `bd` and `ap`, and each
+    row refers to its entries by position. `ac_long` is aligned with the rows.
+
+    Returns:
+        (rows, shard)
+    """
+    rows = []
+    shard = {'ac_long': [], 'bd': [], 'ap': []}
+    positions = {key: {} for key in CONTEXT_FIELDS}
+    for project in projects:
+        row = {field: project[field] for field in LIST_FIELDS if field in project}
+        for key, fields in CONTEXT_FIELDS.items():
+            entry = tuple(project.get(field) or '' for field in fields)
+            if entry not in positions[key]:
+                positions[key][entry] = len(shard[key])
+                shard[key].append(list(entry))
+            row[key] = positions[key][entry]
+        rows.append(row)
+        shard['ac_long'].append(project.get('ac_long') or '')
+    return rows, shard
+
+
+def write_compact_json(data, filepath):
+    """Write minified JSON; these files are fetched by the browser, not read by people."""
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+
+def chunk_and_save(projects, chunk_size=CHUNK_SIZE):
+    """Split projects into chunks and save them as list and detail JSON files."""
     print("\n" + "="*60)
     print("CHUNKING AND SAVING DATA")
     print("="*60)
@@ -355,15 +427,29 @@ def chunk_and_save(projects, chunk_size=2000):
             out[k] = v
         return out
 
+    written = set()
+    listed = []
     for i, chunk in enumerate(chunks):
-        filename = f"projects_2026_chunk_{i}.json"
-        filepath = PUBLIC_DATA_DIR / filename
         # sanitize chunk contents for JSON
-        sanitized_chunk = [sanitize_project(p) for p in chunk]
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(sanitized_chunk, f, ensure_ascii=False, indent=2)
-        size_mb = filepath.stat().st_size / 1024 / 1024
-        print(f"  → {filename} ({len(chunk)} projects, {size_mb:.2f} MB)")
+        rows, shard = split_chunk([sanitize_project(p) for p in chunk])
+        listed.extend(rows)
+        for filename, data in ((CHUNK_FILE.format(chunk=i), rows), (DETAILS_FILE.format(chunk=i), shard)):
+            filepath = PUBLIC_DATA_DIR / filename
+            write_compact_json(data, filepath)
+            written.add(filepath)
+            size_mb = filepath.stat().st_size / 1024 / 1024
+            print(f"  → {filename} ({len(chunk)} projects, {size_mb:.2f} MB)")
+
+    # Drop chunks left over from an earlier run with more projects
+    for pattern in (CHUNK_FILE.format(chunk='*'), DETAILS_FILE.format(chunk='*')):
+        for stale in PUBLIC_DATA_DIR.glob(pattern):
+            if stale not in written:
+                stale.unlink()
+                print(f"  ✗ removed stale {stale.name}")
+
+    # Trigram search index over the list rows, so a query fetches only the chunks it matches
+    search_manifest = write_search_index(listed, PUBLIC_DATA_DIR, chunk_size, CHUNK_FILE)
+    print(f"  → search/ ({len(search_manifest['shards'])} index shards)")
 
     # Create metadata file
     total_amount = sum(p['total_amount'] for p in projects)
@@ -0,0 +1,105 @@
+"""
+Shared, read-only view of the processed bouwprojecten.
+
+The analysis scripts used to glob and parse the pretty-printed JSON chunks
+in public/data/bouwprojecten-gemeenten themselves. The canonical snapshot is
+`results/projects_2026_full.parquet`; this module loads it once per process
+(memory-mapped) and offers a filtered view of it:
+
+    store = load_project_store()
+    scholen = select_projects(store, category='scholenbouw', min_amount=1_000_000)
+    missed = select_projects(store, text='onderwijs', exclude_category='scholenbouw')
+
+The store is a DataFrame with one row per project:
+
+- the text columns of the snapshot (municipality, nis_code, bd_/ap_/ac_ code,
+  short and long) as strings, '' when missing;
+- `total_amount` and `amount_per_capita` as float64, `yearly_amounts` as
+  dicts of year -> amount;
+- `categories` as a list of category IDs;
+- `text`: the lowercased `project_text`, as classify_project matches it.
+
+The frame is shared between callers, so treat it as read-only.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from category_keywords import project_text
+
+SCRIPT_DIR = Path(__file__).parent
+PARQUET_FULL = SCRIPT_DIR.parent / 'results' / 'projects_2026_full.parquet'
+
+TEXT_COLUMNS = [
+    'municipality', 'nis_code',
+    'bd_code', 'bd_short', 'bd_long',
+    'ap_code', 'ap_short', 'ap_long',
+    'ac_code', 'ac_short', 'ac_long',
+]
+AMOUNT_COLUMNS = ['total_amount', 'amount_per_capita']
+
+
+@lru_cache(maxsize=4)
+def _load_store(path, size, mtime_ns):
+    # Keyed on size and mtime too, so a rewritten snapshot is loaded again
+    df = pd.read_parquet(path, memory_map=True)
+    for column in df.columns.intersection(TEXT_COLUMNS):
+        df[column] = df[column].fillna('').astype('str')
+    for column in df.columns.intersection(AMOUNT_COLUMNS):
+        df[column] = df[column].astype('float64')
+    df['categories'] = [list(c) if c is not None else [] for c in df['categories']]
+    df['text'] = [project_text(short, long).lower() for short, long in zip(df['ac_short'], df['ac_long'])]
+    print(f"Loaded {len(df)} projects from {path.name}")
+    return df
+
+
+def load_project_store(path=PARQUET_FULL):
+    """Projects of the parquet snapshot at `path`, loaded once per process."""
+    path = Path(path).resolve()
+    stat = path.stat()
+    return _load_store(path, stat.st_size, stat.st_mtime_ns)
+
+
+def _has_category(store, category):
+    return np.fromiter((category in c for c in store['categories']), dtype=bool, count=len(store))
+
+
+def select_projects(store, category=None, exclude_category=None, municipality=None,
+                    min_amount=None, max_amount=None, text=None):
+    """
+    Projects of `store` matching every given filter, in store order.
+
+    Args:
+        store: Frame from `load_project_store`
+        category: Category ID the project must have
+        exclude_category: Category ID the project must not have
+        municipality: Municipality name, or a list of names
+        min_amount, max_amount: Inclusive bounds on `total_amount`
+        text: Substring of the project text (case-insensitive)
+
+    Returns:
+        DataFrame with the selected rows
+    """
+    mask = np.ones(len(store), dtype=bool)
+    if category is not None:
+        mask &= _has_category(store, category)
+    if exclude_category is not None:
+        mask &= ~_has_category(store, exclude_category)
+    if municipality is not None:
+        names = [municipality] if isinstance(municipality, str) else list(municipality)
+        mask &= store['municipality'].isin(names).to_numpy()
+    if min_amount is not None:
+        mask &= (store['total_amount'] >= min_amount).to_numpy()
+    if max_amount is not None:
+        mask &= (store['total_amount'] <= max_amount).to_numpy()
+    if text is not None:
+        mask &= store['text'].str.contains(text.lower(), regex=False).to_numpy()
+    return store[mask]
+
+
+def project_records(projects):
+    """Projects as dicts with the snapshot fields, for code written against the JSON chunks."""
+    return projects.drop(columns='text').to_dict(orient='records')
@@ -0,0 +1,182 @@
+"""
+Trigram search index over the bouwprojecten list chunks.
+
+Searching in the browser used to mean loading every chunk and matching
+substrings in JavaScript. The pipeline now also writes, next to the chunks:
+
+- search/trigrams_<key>.json: for every trigram of the lowercased
+  `search_text` (ac_short, municipality and categories), the sorted ids of
+  the projects containing it, delta-encoded. Trigrams are sharded on their
+  first two characters (`shard_key`), so a query only fetches a few small
+  shards;
+- search/manifest.json: the shard keys and file name, the chunk size and
+  the chunk file name.
+
+A project id is its position over all chunks, so project `i` is row
+`i % chunk_size` of chunk `i // chunk_size`. A query of at least NGRAM
+characters can only match projects that hold all of its trigrams
+(`candidate_ids`). The trigrams may occur apart, so the candidates are
+checked on the rows of their chunks (`query_index`). The frontend does the
+same (src/lib/search-index.ts): it loads only the chunks of the candidates
+and filters them as before.
+"""
+
+import json
+import string
+from itertools import groupby
+from pathlib import Path
+
+from category_keywords import get_category_label
+
+NGRAM = 3
+SEARCH_DIR_NAME = 'search'
+MANIFEST_NAME = 'manifest.json'
+SHARD_NAME = 'trigrams_{key}.json'
+
+# Characters kept in shard keys; any other character becomes '_'
+_KEY_CHARS = frozenset(string.ascii_lowercase + string.digits)
+
+
+def search_text(project):
+    """Lowercased text a query is matched against: ac_short, municipality and categories (ID and label)."""
+    parts = [project.get('ac_short') or '', project.get('municipality') or '']
+    parts += [f"{c} {get_category_label(c)}" for c in project.get('categories') or []]
+    # Fields are joined by newlines, which a query never contains
+    return '\n'.join(parts).lower()
+
+
+def ngrams(text, n=NGRAM):
+    """Distinct n-grams of `text` that do not span a field boundary."""
+    grams = {text[i:i + n] for i in range(len(text) - n + 1)}
+    return {g for g in grams if '\n' not in g}
+
+
+def shard_key(gram):
+    """Shard of an n-gram: its first two characters, with characters outside [a-z0-9] as '_'."""
+    return ''.join(c if c in _KEY_CHARS else '_' for c in gram[:2])
+
+
+def build_search_index(projects):
+    """
+    Posting lists of every trigram in the `search_text` of `projects`.
+
+    Args:
+        projects: Project dicts in chunk order; ids are their positions
+
+    Returns:
+        {shard_key: {trigram: delta-encoded sorted ids}}
+    """
+    postings = {}
+    for project_id, project in enumerate(projects):
+        for gram in ngrams(search_text(project)):
+            postings.setdefault(gram, []).append(project_id)
+
+    shards = {}
+    for gram in sorted(postings):
+        ids = postings[gram]
+        shards.setdefault(shard_key(gram), {})[gram] = [ids[0]] + [b - a for a, b in zip(ids, ids[1:])]
+    return shards
+
+
+def write_search_index(projects, data_dir, chunk_size, chunk_file):
+    """
+    Write the index of `projects` (in chunk order) to `data_dir`/search.
+
+    Args:
+        chunk_file: Name of the list chunks with a `{chunk}` placeholder
+
+    Returns:
+        The manifest
+    """
+    search_dir = Path(data_dir) / SEARCH_DIR_NAME
+    search_dir.mkdir(parents=True, exist_ok=True)
+
+    shards = build_search_index(projects)
+    manifest = {
+        'ngram': NGRAM,
+        'chunk_size': chunk_size,
+        'chunk_file': chunk_file,
+        'total_projects': len(projects),
+        'shard_file': SHARD_NAME,
+        'shards': sorted(shards),
+    }
+    written = set()
+    for key, shard in shards.items():
+        filepath = search_dir / SHARD_NAME.format(key=key)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(shard, f, ensure_ascii=False, separators=(',', ':'))
+        written.add(filepath)
+
+    # Drop shards of trigrams that no longer occur
+    for stale in search_dir.glob(SHARD_NAME.format(key='*')):
+        if stale not in written:
+            stale.unlink()
+
+    with open(search_dir / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, separators=(',', ':'))
+    return manifest
+
+
+def _decode(deltas):
+    ids = []
+    total = 0
+    for delta in deltas:
+        total += delta
+        ids.append(total)
+    return ids
+
+
+def candidate_ids(query, manifest, read_json):
+    """
+    Ids of the projects holding every n-gram of `query`, from the index shards only.
+
+    Args:
+        query: Search string (case-insensitive)
+        manifest: The index manifest (search/manifest.json)
+        read_json: Callable reading one file, given its path relative to the data dir
+
+    Returns:
+        Sorted project ids, or None when the query is shorter than the
+        n-grams and the index cannot answer it
+    """
+    needle = query.lower()
+    if len(needle) < manifest['ngram']:
+        return None
+
+    available = set(manifest['shards'])
+    shards = {}
+    candidates = None
+    for gram in sorted(ngrams(needle, manifest['ngram'])):
+        key = shard_key(gram)
+        if key not in available:
+            return []
+        if key not in shards:
+            shards[key] = read_json(f"{SEARCH_DIR_NAME}/{manifest['shard_file'].format(key=key)}")
+        ids = _decode(shards[key].get(gram, []))
+        candidates = ids if candidates is None else sorted(set(candidates).intersection(ids))
+        if not candidates:
+            return []
+    return candidates or []
+
+
+def query_index(query, read_json):
+    """
+    Ids of the projects whose `search_text` contains `query`: the reference query.
+
+    Reads the manifest, the shards of the query's n-grams and the chunks of
+    the candidates, through `read_json` (see `candidate_ids`). Returns None
+    when the query is too short for the index.
+    """
+    manifest = read_json(f"{SEARCH_DIR_NAME}/{MANIFEST_NAME}")
+    candidates = candidate_ids(query, manifest, read_json)
+    if candidates is None:
+        return None
+
+    # The n-grams may occur apart from each other: check the candidates on their rows
+    needle = query.lower()
+    chunk_size = manifest['chunk_size']
+    matches = []
+    for chunk, group in groupby(candidates, key=lambda i: i // chunk_size):
+        rows = read_json(manifest['chunk_file'].format(chunk=chunk))
+        matches.extend(i for i in group if needle in search_text(rows[i % chunk_size]))
+    return matches
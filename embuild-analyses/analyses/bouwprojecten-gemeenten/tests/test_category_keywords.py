@@ -0,0 +1,66 @@
+import random
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'src'))
+from category_keywords import CATEGORY_DEFINITIONS, classify_project, classify_projects_batch, compile_keyword_matcher, project_text
+
+
+def classify_by_scan(definitions, text):
+    """Reference: `keyword in text` for every keyword of every category."""
+    categories = [cid for cid, d in definitions.items() if any(k in text for k in d['keywords'])]
+    return categories or ['overige']
+
+
+def test_same_result_as_keyword_scan():
+    rng = random.Random(20)
+    keywords = [k for d in CATEGORY_DEFINITIONS.values() for k in d['keywords']]
+    filler = ['de', 'heraanleg', 'van', 'fase', '2026', '-', '(', ')', ',', 'en', 'Dorpsstraat']
+    for _ in range(2000):
+        # Glue keywords, fragments and filler together so matches overlap and cross spaces
+        parts = [rng.choice(keywords)[rng.randint(0, 2):] if rng.random() < 0.4 else rng.choice(filler)
+                 for _ in range(rng.randint(0, 12))]
+        text = ''.join(part + rng.choice(['', ' ', '  ', '\n', '-']) for part in parts)
+        short, long = text[:len(text) // 3].upper(), text[len(text) // 3:]
+        expected = classify_by_scan(CATEGORY_DEFINITIONS, f"{short} {long}".lower())
+        assert classify_project(short, long) == expected, (short, long)
+
+
+def test_overlapping_and_spanning_keywords():
+    definitions = {
+        'a': {'keywords': ['weg', 'rijweg']},
+        'b': {'keywords': ['wegen', 'gen']},
+        'c': {'keywords': ['open ruimte', 'e-r']},
+        'd': {'keywords': ['wegenis']},
+    }
+    match = compile_keyword_matcher(definitions)
+
+    assert match('rijwegenis') == ['a', 'b', 'd']
+    assert match('wegenwerken') == ['a', 'b']
+    assert match('open  ruimte') == ['overige']
+    assert match('een open ruimte') == ['c']
+    assert match('de-rijweg') == ['a', 'c']
+    assert match('') == ['overige']
+
+
+def test_result_is_a_fresh_list():
+    first = classify_project('Heraanleg straat', '')
+    first.append('changed')
+    assert classify_project('Heraanleg straat', '') == ['wegenbouw']
+
+
+def test_batch_matches_classify_project():
+    pairs = [('Heraanleg STRAAT', 'en riolering'), ('Nieuwe sporthal', ''), ('Studie', 'fase 1'),
+             ('Heraanleg STRAAT', 'en riolering'), ('Openbare  verlichting', None)]
+    texts = pd.Series([project_text(short, long) for short, long in pairs], index=[5, 3, 1, 8, 2])
+    expected = [classify_project(short, long) for short, long in pairs]
+
+    assert classify_projects_batch(texts, workers=1) == expected
+    # Several pool tasks of two distinct texts each
+    assert classify_projects_batch(texts, workers=2, chunk_size=2) == expected
+
+    result = classify_projects_batch(texts, workers=1)
+    result[0].append('changed')
+    assert result[3] == expected[3]
@@ -0,0 +1,69 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'src'))
+import process_project_details as ppd
+
+
+def make_project(ac_code, total_amount, bd=('BD-1', 'Veilig', 'Lang BD'), ap=('AP-1', 'Wegen', 'Lang AP')):
+    return {
+        'municipality': 'Gent', 'nis_code': '44021',
+        'bd_code': bd[0], 'bd_short': bd[1], 'bd_long': bd[2],
+        'ap_code': ap[0], 'ap_short': ap[1], 'ap_long': ap[2],
+        'ac_code': ac_code, 'ac_short': f'Actie {ac_code}', 'ac_long': f'Beschrijving {ac_code}',
+        'total_amount': total_amount, 'amount_per_capita': 1.0,
+        'yearly_amounts': {'2026': total_amount}, 'categories': ['overige'],
+    }
+
+
+def rebuild(rows, shard):
+    projects = []
+    for row, ac_long in zip(rows, shard['ac_long']):
+        project = {k: v for k, v in row.items() if k not in ppd.CONTEXT_FIELDS}
+        for key, fields in ppd.CONTEXT_FIELDS.items():
+            project.update(zip(fields, shard[key][row[key]]))
+        project['ac_long'] = ac_long
+        projects.append(project)
+    return projects
+
+
+def test_split_chunk_deduplicates_context():
+    projects = [
+        make_project('AC1', 10.0),
+        make_project('AC2', 20.0),
+        make_project('AC3', 30.0, ap=('AP-2', 'Riolering', '')),
+        # Same code, different text: kept apart
+        make_project('AC4', 40.0, bd=('BD-1', 'Veilig', 'Andere tekst')),
+    ]
+
+    rows, shard = ppd.split_chunk(projects)
+
+    assert [row['bd'] for row in rows] == [0, 0, 0, 1]
+    assert [row['ap'] for row in rows] == [0, 0, 1, 0]
+    assert len(shard['bd']) == 2 and len(shard['ap']) == 2
+    assert 'ac_long' not in rows[0] and 'bd_long' not in rows[0]
+    assert rebuild(rows, shard) == projects
+
+
+def test_chunk_and_save_writes_compact_list_and_detail_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(ppd, 'PUBLIC_DATA_DIR', tmp_path)
+    (tmp_path / 'projects_2026_chunk_7.json').write_text('[]')
+    projects = [make_project(f'AC{i}', float(i)) for i in range(5)]
+
+    ppd.chunk_and_save(projects, chunk_size=2)
+
+    assert sorted(p.name for p in tmp_path.glob('projects_2026_*.json')) == [
+        'projects_2026_chunk_0.json', 'projects_2026_chunk_1.json', 'projects_2026_chunk_2.json',
+        'projects_2026_details_0.json', 'projects_2026_details_1.json', 'projects_2026_details_2.json',
+    ]
+    text = (tmp_path / 'projects_2026_chunk_0.json').read_text(encoding='utf-8')
+    assert '\n' not in text and ': ' not in text
+
+    saved = []
+    for i in range(3):
+        rows = json.loads((tmp_path / f'projects_2026_chunk_{i}.json').read_text(encoding='utf-8'))
+        shard = json.loads((tmp_path / f'projects_2026_details_{i}.json').read_text(encoding='utf-8'))
+        saved += rebuild(rows, shard)
+    assert saved == sorted(projects, key=lambda p: p['total_amount'], reverse=True)
+    assert json.loads((tmp_path / 'projects_metadata.json').read_text())['chunks'] == 3
@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'src'))
+import keyword_index as ki
+from category_keywords import CATEGORY_DEFINITIONS, classify_project, project_text
+
+PROJECTS = [
+    {'municipality': 'Gent', 'ac_code': 'AC1', 'ac_short': 'Heraanleg Dorpsstraat', 'ac_long': 'en riolering', 'categories': ['overige']},
+    {'municipality': 'Aalst', 'ac_code': 'AC2', 'ac_short': 'Nieuwe scholen', 'ac_long': 'basisonderwijs', 'categories': ['scholenbouw']},
+    {'municipality': 'Brugge', 'ac_code': 'AC3', 'ac_short': 'Openbare  verlichting', 'ac_long': None, 'categories': ['overige']},
+    {'municipality': 'Gent', 'ac_code': 'AC4', 'ac_short': 'Openbare verlichting', 'ac_long': 'led-armaturen', 'categories': ['verlichting']},
+    {'municipality': 'Leuven', 'ac_code': 'AC5', 'ac_short': 'Studie', 'ac_long': '', 'categories': ['overige']},
+]
+
+
+def make_index():
+    return ki.open_keyword_index(ki.build_keyword_index(PROJECTS))
+
+
+def test_keyword_lookup_matches_substring_search():
+    index = make_index()
+    texts = [project_text(p['ac_short'], p['ac_long']).lower() for p in PROJECTS]
+    for keyword in ['straat', 'e', 'led', 'openbare verlichting', 'school', 'studie', 'n r', '', 'xyz']:
+        expected = [i for i, text in enumerate(texts) if keyword in text]
+        assert ki.projects_with_keyword(index, keyword).tolist() == expected, keyword
+
+
+def test_indexed_classification_matches_classify_project():
+    index = make_index()
+    expected = [classify_project(p['ac_short'], p['ac_long']) for p in PROJECTS]
+    assert ki.classify_indexed(index, CATEGORY_DEFINITIONS) == expected
+
+
+def test_keyword_impact():
+    index = make_index()
+
+    impact = ki.keyword_impact(index, CATEGORY_DEFINITIONS, add={'scholenbouw': ['studie']}, remove={'wegenbouw': ['straat']})
+
+    assert impact['scholenbouw']['gained'].tolist() == [4]
+    assert impact['overige']['lost'].tolist() == [4]
+    assert impact['wegenbouw']['lost'].tolist() == [0]
+    assert impact['wegenbouw']['gained'].tolist() == []
+    # The current definitions are not changed
+    assert 'studie' not in CATEGORY_DEFINITIONS['scholenbouw']['keywords']
+    assert ki.keyword_impact(index, CATEGORY_DEFINITIONS, add={'riolering': ['riolering']}) == {}
+
+
+def test_index_is_cached_until_the_snapshot_changes(tmp_path, monkeypatch):
+    path, cache_dir = tmp_path / 'projects.parquet', tmp_path / 'cache'
+    pd.DataFrame(PROJECTS[:3]).to_parquet(path)
+
+    builds = []
+    build = ki.build_keyword_index
+    monkeypatch.setattr(ki, 'build_keyword_index', lambda projects: builds.append(1) or build(projects))
+
+    first = ki.load_keyword_index(path, cache_dir)
+    second = ki.load_keyword_index(path, cache_dir)
+    assert len(builds) == 1
+    assert first['tokens'] == second['tokens']
+    assert second['projects']['ac_code'] == ['AC1', 'AC2', 'AC3']
+
+    pd.DataFrame(PROJECTS).to_parquet(path)
+    assert len(ki.load_keyword_index(path, cache_dir)['texts']) == 5
+    assert len(builds) == 2
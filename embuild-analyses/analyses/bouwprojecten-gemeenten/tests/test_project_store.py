@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'src'))
+from project_store import load_project_store, project_records, select_projects
+
+PROJECTS = [
+    {'municipality': 'Gent', 'ac_code': 'AC1', 'ac_short': 'Heraanleg Dorpsstraat', 'ac_long': 'en riolering',
+     'total_amount': 2_500_000.0, 'yearly_amounts': {'2026': 2_500_000.0}, 'categories': ['wegenbouw', 'riolering']},
+    {'municipality': 'Aalst', 'ac_code': 'AC2', 'ac_short': 'Nieuwe SCHOLEN', 'ac_long': None,
+     'total_amount': 900_000.0, 'yearly_amounts': {'2026': 900_000.0}, 'categories': ['scholenbouw']},
+    {'municipality': 'Gent', 'ac_code': 'AC3', 'ac_short': 'Studie', 'ac_long': 'onderwijs',
+     'total_amount': 40_000.0, 'yearly_amounts': {'2026': 40_000.0}, 'categories': ['overige']},
+]
+
+
+def make_store(tmp_path):
+    path = tmp_path / 'projects.parquet'
+    pd.DataFrame(PROJECTS).to_parquet(path)
+    return load_project_store(path)
+
+
+def test_store_is_typed_and_loaded_once(tmp_path):
+    store = make_store(tmp_path)
+
+    assert load_project_store(tmp_path / 'projects.parquet') is store
+    assert store['total_amount'].dtype == 'float64'
+    assert store['categories'].tolist() == [p['categories'] for p in PROJECTS]
+    assert store['ac_long'].tolist() == ['en riolering', '', 'onderwijs']
+    assert store['text'].tolist() == ['heraanleg dorpsstraat en riolering', 'nieuwe scholen ', 'studie onderwijs']
+
+
+def test_select_projects(tmp_path):
+    store = make_store(tmp_path)
+
+    def codes(**filters):
+        return select_projects(store, **filters)['ac_code'].tolist()
+
+    assert codes() == ['AC1', 'AC2', 'AC3']
+    assert codes(category='riolering') == ['AC1']
+    assert codes(exclude_category='scholenbouw') == ['AC1', 'AC3']
+    assert codes(municipality='Gent') == ['AC1', 'AC3']
+    assert codes(municipality=['Aalst', 'Brugge']) == ['AC2']
+    assert codes(min_amount=900_000) == ['AC1', 'AC2']
+    assert codes(max_amount=900_000) == ['AC2', 'AC3']
+    assert codes(text='Scholen') == ['AC2']
+    assert codes(text='onderwijs', exclude_category='scholenbouw', municipality='Gent') == ['AC3']
+
+
+def test_project_records(tmp_path):
+    records = project_records(make_store(tmp_path).head(1))
+    assert records == [{**PROJECTS[0], 'ac_long': 'en riolering'}]
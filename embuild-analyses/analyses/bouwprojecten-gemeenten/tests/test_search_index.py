@@ -0,0 +1,95 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'src'))
+import search_index as si
+
+CHUNK_FILE = 'chunk_{chunk}.json'
+CHUNK_SIZE = 2
+
+PROJECTS = [
+    {'ac_short': 'Heraanleg Kerkstraat', 'municipality': 'Gent', 'categories': ['wegenbouw']},
+    {'ac_short': 'Renovatie zwembad', 'municipality': 'Kortrijk', 'categories': ['sport']},
+    {'ac_short': 'Nieuwe sporthal', 'municipality': 'Gentbrugge', 'categories': ['sport']},
+    {'ac_short': 'Kerk restauratie', 'municipality': 'Aalst', 'categories': ['erfgoed']},
+    {'ac_short': 'Straatverlichting naar LED', 'municipality': 'Brugge', 'categories': []},
+    {'ac_short': 'Café Één en crèche', 'municipality': 'Ieper', 'categories': ['overige']},
+    {'ac_short': '', 'municipality': None, 'categories': None},
+]
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for i in range(0, len(PROJECTS), CHUNK_SIZE):
+        with open(tmp_path / CHUNK_FILE.format(chunk=i // CHUNK_SIZE), 'w', encoding='utf-8') as f:
+            json.dump(PROJECTS[i:i + CHUNK_SIZE], f)
+    si.write_search_index(PROJECTS, tmp_path, CHUNK_SIZE, CHUNK_FILE)
+    return tmp_path
+
+
+def reader(data_dir, read=None):
+    def read_json(name):
+        if read is not None:
+            read.append(name)
+        with open(data_dir / name, encoding='utf-8') as f:
+            return json.load(f)
+    return read_json
+
+
+def brute_force(query):
+    return [i for i, p in enumerate(PROJECTS) if query.lower() in si.search_text(p)]
+
+
+@pytest.mark.parametrize('query', [
+    'kerk', 'KERKSTRAAT', 'gent', 'sport', 'straat', 'led', 'café', 'één', 'crè', 'g k', 'xyz',
+])
+def test_query_index_matches_brute_force(data_dir, query):
+    assert si.query_index(query, reader(data_dir)) == brute_force(query)
+
+
+def test_query_index_checks_candidates_on_rows(data_dir):
+    # 'sporthal' and 'zwembad' trigrams both occur, but never in one text
+    assert si.candidate_ids('Gent', json.loads((data_dir / 'search' / 'manifest.json').read_text()),
+                            reader(data_dir)) == [0, 2]
+    assert si.query_index('zwemhal', reader(data_dir)) == []
+
+
+def test_short_query_is_left_to_the_caller(data_dir):
+    read = []
+    assert si.query_index('ke', reader(data_dir, read)) is None
+    assert read == ['search/manifest.json']
+
+
+def test_query_reads_only_needed_files(data_dir):
+    read = []
+    assert si.query_index('zwembad', reader(data_dir, read)) == [1]
+    chunks = [name for name in read if not name.startswith('search/')]
+    assert chunks == [CHUNK_FILE.format(chunk=0)]
+    shards = {name for name in read if name.startswith('search/trigrams_')}
+    assert shards == {f'search/trigrams_{key}.json' for key in ('zw', 'we', 'em', 'mb', 'ba')}
+
+
+def test_search_text_does_not_match_across_fields():
+    text = si.search_text(PROJECTS[0])
+    assert 'kerkstraat' in text
+    assert 'kerkstraat gent' not in text
+    assert not any('\n' in g for g in si.ngrams(text))
+
+
+def test_shard_key():
+    assert si.shard_key('abc') == 'ab'
+    assert si.shard_key('é e') == '__'
+    assert si.shard_key('2026') == '20'
+
+
+def test_rewrite_removes_stale_shards(data_dir):
+    stale = data_dir / 'search' / 'trigrams_zw.json'
+    assert stale.exists()
+    manifest = si.write_search_index(PROJECTS[:1], data_dir, CHUNK_SIZE, CHUNK_FILE)
+    assert not stale.exists()
+    assert manifest['total_projects'] == 1
+    assert sorted(p.name for p in (data_dir / 'search').glob('trigrams_*.json')) == \
+        sorted(f'trigrams_{key}.json' for key in manifest['shards'])
@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'src'))
+from process_project_details import extract_code_description, extract_code_descriptions
+
+
+BLOCK = (
+    "Code: AC000123\n"
+    "Korte omschrijving: Heraanleg Dorpsstraat \n"
+    "Lange omschrijving: Vernieuwen van de rijweg\n"
+    "en de riolering\n"
+    "Commentaar: Fase 1\n"
+    "Evaluatie: "
+)
+
+
+def test_sections():
+    assert extract_code_description(BLOCK) == {
+        'code': 'AC000123',
+        'short': 'Heraanleg Dorpsstraat',
+        'long': 'Vernieuwen van de rijweg\nen de riolering',
+        'comment': 'Fase 1',
+    }
+
+
+def test_same_result_as_the_regex_parser():
+    cases = [
+        "Code: ac12\nCode: AP 7\nCode:\nBD42",  # first code that is capitals + digits
+        "Korte omschrijving:\n\n  Volgende regel\nLange omschrijving:",
+        "Korte omschrijving: X\r\nLange omschrijving: tekst met Commentaar: erin\nEvaluatie: goed\n",
+        "Lange omschrijving: a\nCommentaar:   \nEvaluatie:\n",
+        "Code: AC1",
+        "  \n ",
+    ]
+    expected = [
+        {'code': 'BD42'},
+        {'short': 'Volgende regel'},  # nothing after the last label
+        {'short': 'X', 'long': 'tekst met Commentaar: erin', 'comment': 'erin', 'evaluation': 'goed'},
+        {'long': 'a', 'comment': 'Evaluatie:'},  # an empty section takes the next line
+        {'code': 'AC1'},
+        {},
+    ]
+    assert [extract_code_description(block) for block in cases] == expected
+
+
+def test_column_is_parsed_per_distinct_block():
+    column = pd.Series([BLOCK, None, BLOCK, "Code: BD1"])
+    parsed = extract_code_descriptions(column)
+
+    assert [p.get('code') for p in parsed] == ['AC000123', None, 'AC000123', 'BD1']
+    assert parsed[0] is parsed[2]
+    assert parsed[1] == {}
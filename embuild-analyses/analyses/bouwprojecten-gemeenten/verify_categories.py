@@ -1,31 +1,28 @@
 #!/usr/bin/env python3
 """Verify that category keywords are correctly applied to projects."""
 
-import json
 import sys
 from pathlib import Path
 
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 from category_keywords import classify_project, get_category_label
+from project_store import load_project_store, project_records
 
-# Load first chunk
-data_dir = Path(__file__).parent.parent.parent / 'public' / 'data' / 'bouwprojecten-gemeenten'
-chunk_file = data_dir / 'projects_2026_chunk_0.json'
-
-with open(chunk_file, 'r', encoding='utf-8') as f:
-    projects = json.load(f)
+# The largest projects, which open the first chunk on the site
+store = load_project_store()
+largest = project_records(store.sort_values('total_amount', ascending=False, kind='stable').head(10))
 
 print("="*80)
-print("CATEGORY VERIFICATION - Sample from chunk 0")
+print("CATEGORY VERIFICATION - Largest projects")
 print("="*80)
-print(f"Total projects in chunk: {len(projects)}")
+print(f"Total projects: {len(store)}")
 
-# Check first 10 projects
+# Check the 10 largest projects
 matches = 0
 mismatches = 0
 
-for i, project in enumerate(projects[:10], 1):
+for i, project in enumerate(largest, 1):
     print(f"\n--- Project {i} ---")
     print(f"Municipality: {project['municipality']}")
     print(f"AC Code: {project['ac_code']}")
@@ -6,11 +6,17 @@ suitable for visualization in the Next.js blog.
 """
 
 import json
+import sys
 import pandas as pd
 from pathlib import Path
 
 # Paths
 RESULTS_DIR = Path(__file__).parent.parent / "results"
+SHARED_DATA_DIR = Path(__file__).parent.parent.parent.parent / "shared-data"
+
+sys.path.insert(0, str(SHARED_DATA_DIR))
+from belgian_numbers import parse_belgian_numbers  # noqa: E402
+
 AANTAL_CSV = RESULTS_DIR / "premies-res-tijdreeks-algemeen__default__Algemene Totalen__pivottable__Matrix__Aantal.csv"
 BEDRAG_CSV = RESULTS_DIR / "premies-res-tijdreeks-algemeen__default__Algemene Totalen__pivottable__Matrix__Totaal bedrag.csv"
 AANTAL_BESCHERMD_CSV = RESULTS_DIR / "premies-res-tijdreeks-algemeen__default__Totalen Beschermde Afnemers__pivottable__Matrix__Aantal.csv"
@@ -21,45 +27,37 @@ OUTPUT_MEASURES_JSON = RESULTS_DIR / "measures.json"
 OUTPUT_METADATA_JSON = RESULTS_DIR / "processed_metadata.json"
 
 
-def parse_number(num_str):
-    """Parse Belgian number format '1.234' to float."""
-    if pd.isna(num_str) or num_str == "" or num_str == 0:
-        return 0.0
-    # Remove dots (thousand separators), keep comma as decimal
-    cleaned = str(num_str).replace(".", "").replace(",", ".").strip()
-    try:
-        return float(cleaned)
-    except ValueError:
-        return 0.0
+def read_matrix_csv(path):
+    """Read an exported pivot table with its values as text, so '1.234' is not read as the float 1.234."""
+    df = pd.read_csv(path, dtype=str)
+    df.columns = df.columns.str.strip()
+    df["Jaar"] = pd.to_numeric(df["Jaar"])
+    return df
+
+
+def parse_number(column):
+    """Parse a column in Belgian number format '1.234' to floats (0.0 when missing)."""
+    return parse_belgian_numbers(column).fillna(0.0)
 
 
-def parse_bedrag(bedrag_str):
-    """Parse Belgian currency format '€ 1.234.567' to float."""
-    if pd.isna(bedrag_str) or bedrag_str == "" or bedrag_str == "€ 0":
-        return 0.0
-    # Remove '€ ' and dots, convert to float
-    cleaned = str(bedrag_str).replace("€ ", "").replace(".", "").replace(",", ".").strip()
-    try:
-        return float(cleaned)
-    except ValueError:
-        return 0.0
+def parse_bedrag(column):
+    """Parse a column in Belgian currency format '€ 1.234.567' to floats (0.0 when missing)."""
+    return parse_belgian_numbers(column, currency="€").fillna(0.0)
 
 
 def load_and_process_general_data():
     """Load and process general subsidies data (all citizens)."""
     # Load aantal
-    df_aantal = pd.read_csv(AANTAL_CSV)
-    df_aantal.columns = df_aantal.columns.str.strip()
+    df_aantal = read_matrix_csv(AANTAL_CSV)
 
     # Parse aantal column
-    df_aantal["Aantal"] = df_aantal["Aantal"].apply(parse_number)
+    df_aantal["Aantal"] = parse_number(df_aantal["Aantal"])
 
     # Load bedrag
-    df_bedrag = pd.read_csv(BEDRAG_CSV)
-    df_bedrag.columns = df_bedrag.columns.str.strip()
+    df_bedrag = read_matrix_csv(BEDRAG_CSV)
 
     # Parse bedrag column
-    df_bedrag["Totaal bedrag"] = df_bedrag["Totaal bedrag"].apply(parse_bedrag)
+    df_bedrag["Totaal bedrag"] = parse_bedrag(df_bedrag["Totaal bedrag"])
 
     # Merge on Maatregel, Submaatregel, Jaar
     df = pd.merge(
@@ -100,18 +98,16 @@ def load_and_process_general_data():
 def load_and_process_protected_data():
     """Load and process protected consumers subsidies data."""
     # Load aantal
-    df_aantal = pd.read_csv(AANTAL_BESCHERMD_CSV)
-    df_aantal.columns = df_aantal.columns.str.strip()
+    df_aantal = read_matrix_csv(AANTAL_BESCHERMD_CSV)
 
     # Parse aantal column
-    df_aantal["Aantal"] = df_aantal["Aantal"].apply(parse_number)
+    df_aantal["Aantal"] = parse_number(df_aantal["Aantal"])
 
     # Load bedrag
-    df_bedrag = pd.read_csv(BEDRAG_BESCHERMD_CSV)
-    df_bedrag.columns = df_bedrag.columns.str.strip()
+    df_bedrag = read_matrix_csv(BEDRAG_BESCHERMD_CSV)
 
     # Parse bedrag column
-    df_bedrag["Totaal bedrag"] = df_bedrag["Totaal bedrag"].apply(parse_bedrag)
+    df_bedrag["Totaal bedrag"] = parse_bedrag(df_bedrag["Totaal bedrag"])
 
     # Merge
     df = pd.merge(
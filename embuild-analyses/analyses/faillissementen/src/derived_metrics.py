@@ -0,0 +1,166 @@
+"""
+Derived monthly series for the bankruptcy dashboard.
+
+The dashboard used to derive rolling sums and year-over-year changes from the
+monthly output files on every filter change. These series are computed here
+once, per sector and per province, on a dense month grid:
+
+- n12 / w12: trailing 12-month sums of bankruptcies / workers
+- dn / dw: change versus the same month one year earlier
+- dn12 / dw12: change of the trailing 12-month sum versus one year earlier
+- sh / sh12: share of the scope total (all sectors of the same province) in
+  bankruptcies, for the month and for the trailing 12 months
+
+A series is a set of monthly rows that share a scope: sector `s` and province
+`p`, where null means "all". Months without records count as zero. Values
+that need history from before the first month in the data are null.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Window of the trailing sums and lag of the year-over-year deltas, in months
+WINDOW = 12
+
+MEASURES = ["n", "w"]
+
+# Output column -> (key, kind), in the format of shared-data/json_columnar.py
+DERIVED_COLUMNS = {
+    "y": ("y", "int"),
+    "m": ("m", "int"),
+    "s": ("s", "str"),
+    "p": ("p", "str"),
+    "n": ("n", "int"),
+    "n12": ("n12", "int"),
+    "dn": ("dn", "int"),
+    "dn12": ("dn12", "int"),
+    "w": ("w", "int"),
+    "w12": ("w12", "int"),
+    "dw": ("dw", "int"),
+    "dw12": ("dw12", "int"),
+    "sh": ("sh", "float"),
+    "sh12": ("sh12", "float"),
+}
+
+SHARE_DECIMALS = 4
+
+
+def month_index(frame: pd.DataFrame) -> np.ndarray:
+    """Months since year 0 (y * 12 + m - 1) of every row."""
+    return frame["y"].to_numpy(dtype=np.int64) * 12 + frame["m"].to_numpy(dtype=np.int64) - 1
+
+
+def dense_grid(frame: pd.DataFrame, keys: list[str], start: int, stop: int) -> tuple[pd.DataFrame, dict]:
+    """Scatter monthly rows onto a (series x month) grid of zeros.
+
+    Returns the distinct key combinations (one per grid row) and a
+    {measure: 2D float array} mapping; column t holds month `start + t`.
+    Rows outside [start, stop] are ignored.
+    """
+    t = month_index(frame) - start
+    inside = (t >= 0) & (t <= stop - start)
+    frame, t = frame[inside], t[inside]
+
+    if keys:
+        grouper = frame.groupby(keys, sort=True, dropna=False)
+        codes = grouper.ngroup().to_numpy()
+        groups = grouper.size().index.to_frame(index=False)
+    else:
+        codes, groups = np.zeros(len(frame), dtype=np.int64), pd.DataFrame(index=[0])
+
+    grid = {}
+    for measure in MEASURES:
+        values = np.zeros((len(groups), stop - start + 1))
+        np.add.at(values, (codes, t), frame[measure].to_numpy(dtype=np.float64))
+        grid[measure] = values
+    return groups, grid
+
+
+def trailing_sum(values: np.ndarray, window: int = WINDOW) -> np.ndarray:
+    """Sum over the last `window` months (row-wise); NaN until a full window exists."""
+    csum = np.cumsum(values, axis=1)
+    out = np.full(values.shape, np.nan)
+    if values.shape[1] >= window:
+        out[:, window - 1:] = csum[:, window - 1:]
+        out[:, window:] -= csum[:, :-window]
+    return out
+
+
+def lagged_delta(values: np.ndarray, lag: int = WINDOW) -> np.ndarray:
+    """values[t] - values[t - lag] (row-wise); NaN where t - lag is before the grid."""
+    out = np.full(values.shape, np.nan)
+    if values.shape[1] > lag:
+        out[:, lag:] = values[:, lag:] - values[:, :-lag]
+    return out
+
+
+def share(part: np.ndarray, whole: np.ndarray) -> np.ndarray:
+    """part / whole, NaN where the whole is zero or unknown."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = part / whole
+    out[~np.isfinite(out)] = np.nan
+    return out.round(SHARE_DECIMALS)
+
+
+def derive_series(frame: pd.DataFrame, keys: list[str], start: int, stop: int) -> pd.DataFrame:
+    """Trailing sums and year-over-year deltas of every series in `frame`.
+
+    `frame` holds monthly rows with y, m, the series `keys` and the measures.
+    Returns one row per series and month in [start, stop].
+    """
+    groups, grid = dense_grid(frame, keys, start, stop)
+    months = np.arange(start, stop + 1)
+
+    columns = {
+        "y": np.tile(months // 12, len(groups)),
+        "m": np.tile(months % 12 + 1, len(groups)),
+    }
+    for key in keys:
+        columns[key] = np.repeat(groups[key].to_numpy(dtype=object), len(months))
+    for measure in MEASURES:
+        values = grid[measure]
+        rolled = trailing_sum(values)
+        columns[measure] = values.ravel()
+        columns[f"{measure}12"] = rolled.ravel()
+        columns[f"d{measure}"] = lagged_delta(values).ravel()
+        columns[f"d{measure}12"] = lagged_delta(rolled).ravel()
+    return pd.DataFrame(columns)
+
+
+def add_shares(part: pd.DataFrame, whole: pd.DataFrame, keys: list[str]) -> pd.DataFrame:
+    """Add sh / sh12: `part` bankruptcies as a share of the `whole` series matched on y, m and `keys`."""
+    on = ["y", "m", *keys]
+    totals = whole[on + ["n", "n12"]].rename(columns={"n": "total", "n12": "total12"})
+    merged = part.merge(totals, on=on, how="left")
+    part = part.copy()
+    part["sh"] = share(merged["n"].to_numpy(), merged["total"].to_numpy())
+    part["sh12"] = share(merged["n12"].to_numpy(), merged["total12"].to_numpy())
+    return part
+
+
+def derived_metrics(
+    monthly_totals: pd.DataFrame,
+    monthly_by_sector: pd.DataFrame,
+    monthly_provinces: pd.DataFrame,
+    monthly_provinces_sector: pd.DataFrame,
+) -> pd.DataFrame:
+    """Derived series for Belgium, each sector, each province and province x sector.
+
+    Inputs are monthly output frames with columns y, m, [s], [p], n, w.
+    Sector shares are taken against the all-sector series of the same
+    province (or of Belgium). The month grid spans the months of
+    `monthly_totals`.
+    """
+    if monthly_totals.empty:
+        return pd.DataFrame(columns=list(DERIVED_COLUMNS))
+    months = month_index(monthly_totals)
+    start, stop = int(months.min()), int(months.max())
+
+    belgium = derive_series(monthly_totals, [], start, stop)
+    provinces = derive_series(monthly_provinces, ["p"], start, stop)
+    sectors = add_shares(derive_series(monthly_by_sector, ["s"], start, stop), belgium, [])
+    province_sectors = add_shares(derive_series(monthly_provinces_sector, ["s", "p"], start, stop), provinces, ["p"])
+
+    frames = [belgium, sectors, provinces, province_sectors]
+    out = pd.concat([f.reindex(columns=list(DERIVED_COLUMNS)) for f in frames], ignore_index=True)
+    return out.sort_values(["s", "p", "y", "m"], kind="stable", na_position="first").reset_index(drop=True)
@@ -0,0 +1,116 @@
+"""
+Grouping-sets aggregation engine for the bankruptcy pipeline.
+
+The raw Statbel frame is scanned exactly once into a finest-grain cube
+(year x month x sector x province x duration x worker class). Every requested
+grouping set is then rolled up from the smallest already-computed finer
+grouping, so coarse outputs such as yearly totals are summed from a few
+hundred monthly rows instead of the full record set.
+
+A grouping set is a dict with:
+- dims: list of short dimension keys (see DIMENSIONS)
+- sector: optional NACE section code to restrict the set to (e.g. "F")
+"""
+
+import pandas as pd
+
+# Short key -> raw Statbel column
+DIMENSIONS = {
+    "y": "CD_YEAR",
+    "m": "CD_MONTH",
+    "s": "sector",
+    "p": "CD_PROV_REFNIS",
+    "d": "TX_COMPANY_DURATION_NL",
+    "c": "TX_EMPLOYMENT_CLASS_DESCR_NL",
+}
+
+# Short key -> raw Statbel measure column
+MEASURES = {
+    "n": "MS_COUNTOF_BANKRUPTCIES",
+    "w": "MS_COUNTOF_WORKERS",
+}
+
+# Number of raw records behind each cube cell (used for metadata counts)
+ROW_COUNT = "rows"
+
+CUBE_DIMS = list(DIMENSIONS)
+CUBE_MEASURES = list(MEASURES) + [ROW_COUNT]
+
+
+def build_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate the raw records to the finest grain used by any output.
+
+    Expects the `sector` column to be filled in already. Missing dimension
+    values are kept as their own group (dropna=False) so that every coarser
+    grouping can be rolled up from the cube without losing records.
+    Categorical dimensions are grouped on their observed values only.
+    """
+    frame = pd.DataFrame({key: df[col] for key, col in DIMENSIONS.items()})
+    frame["p"] = pd.to_numeric(frame["p"], errors="coerce").astype("Int64")
+    for key, col in MEASURES.items():
+        frame[key] = df[col]
+    frame[ROW_COUNT] = 1
+
+    return (
+        frame.groupby(CUBE_DIMS, dropna=False, observed=True, sort=True)[CUBE_MEASURES]
+        .sum()
+        .reset_index()
+    )
+
+
+def rollup(frame: pd.DataFrame, dims: list[str], sector: str | None = None) -> pd.DataFrame:
+    """Sum the measures of an aggregated frame up to `dims`."""
+    if sector is not None:
+        frame = frame[frame["s"] == sector]
+    if not dims:
+        return frame[CUBE_MEASURES].sum().to_frame().T
+    return (
+        frame.groupby(dims, dropna=False, observed=True, sort=True)[CUBE_MEASURES]
+        .sum()
+        .reset_index()
+    )
+
+
+def _can_derive(source: tuple, target: tuple) -> bool:
+    """Check whether grouping `target` can be rolled up from grouping `source`."""
+    source_dims, source_sector = source
+    target_dims, target_sector = target
+    if not target_dims <= source_dims:
+        return False
+    if source_sector == target_sector:
+        return True
+    # An all-sector grouping still carries the sector dimension, so it can be
+    # filtered down to a single sector.
+    return source_sector is None and "s" in source_dims
+
+
+def compute_grouping_sets(cube: pd.DataFrame, grouping_sets: dict[str, dict]) -> dict[str, pd.DataFrame]:
+    """Compute every grouping set from the cube in a single bottom-up pass.
+
+    Sets are evaluated from finest to coarsest. Each one is rolled up from the
+    smallest available source it can be derived from: the cube itself or an
+    already-computed finer set. Identical sets are computed only once.
+
+    Returns a dict mapping each grouping set name to its aggregated frame
+    (columns: the set's dims followed by the measures).
+    """
+    computed = {(frozenset(CUBE_DIMS), None): cube}
+
+    def key_of(spec):
+        return frozenset(spec["dims"]), spec.get("sector")
+
+    order = sorted(grouping_sets, key=lambda name: len(grouping_sets[name]["dims"]), reverse=True)
+
+    results = {}
+    for name in order:
+        spec = grouping_sets[name]
+        key = key_of(spec)
+        if key not in computed:
+            candidates = [src for src in computed if _can_derive(src, key)]
+            source = min(candidates, key=lambda src: len(computed[src]))
+            # Only filter on sector when the source is not already restricted
+            sector = key[1] if source[1] is None else None
+            computed[key] = rollup(computed[source], sorted(key[0], key=CUBE_DIMS.index), sector)
+        results[name] = computed[key][list(spec["dims"]) + CUBE_MEASURES]
+
+    return results
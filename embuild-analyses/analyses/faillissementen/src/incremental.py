@@ -0,0 +1,228 @@
+"""
+Incremental recompute support for the bankruptcy pipeline.
+
+Each Statbel release only appends or revises a few months of
+TF_BANKRUPTCIES. The finest-grain cube of the previous run is kept on disk
+together with a fingerprint of every (year, month) partition of the raw
+records. On the next run only the partitions whose fingerprint changed are
+re-aggregated and spliced into the stored cube; the result files are then
+patched for the affected years instead of being rebuilt from scratch.
+
+State files (in STATE_DIR, see process_faillissementen.py):
+- cube/<year>.parquet: finest-grain cube (see grouping_sets.build_cube), one
+  file per year so a run only reads and writes the years it touches
+- partitions.parquet: y, m, rows, hash per raw partition
+- state.json: state version, the output configuration it was built for and
+  a digest of the result files it produced
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from grouping_sets import CUBE_DIMS, DIMENSIONS, MEASURES
+
+# Bump when the cube or fingerprint layout changes; older state is then ignored
+STATE_VERSION = 1
+
+PARTITION_DIMS = ["y", "m"]
+
+# Raw columns whose numeric dtype may vary between releases (int vs float when
+# a column has gaps); hashed as float64 so the fingerprint only tracks values
+_NUMERIC_COLUMNS = [DIMENSIONS["y"], DIMENSIONS["m"], DIMENSIONS["p"], *MEASURES.values()]
+
+_NAN_BITS = np.uint64(0x7FF8000000000000)
+
+
+def _mix(h: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer; uint64 arithmetic wraps around."""
+    h = h ^ (h >> np.uint64(30))
+    h = h * np.uint64(0xBF58476D1CE4E5B9)
+    h = h ^ (h >> np.uint64(27))
+    h = h * np.uint64(0x94D049BB133111EB)
+    return h ^ (h >> np.uint64(31))
+
+
+def _column_hashes(series: pd.Series, numeric: bool) -> np.ndarray:
+    if numeric:
+        values = pd.to_numeric(series, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        values = values + 0.0  # -0.0 -> 0.0
+        bits = values.view(np.uint64).copy()
+        bits[np.isnan(values)] = _NAN_BITS
+        return bits
+    # Hash each distinct string once, then broadcast through the factorized codes
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    unique_hashes = pd.util.hash_array(np.asarray(uniques, dtype=object))
+    return np.append(unique_hashes, _NAN_BITS)[codes]
+
+
+def partition_keys(frame: pd.DataFrame, y: str = "y", m: str = "m") -> np.ndarray:
+    """Integer (year * 100 + month) partition key of every row."""
+    years = pd.to_numeric(frame[y], errors="coerce").to_numpy(dtype="float64", na_value=0)
+    months = pd.to_numeric(frame[m], errors="coerce").to_numpy(dtype="float64", na_value=0)
+    return (years * 100 + months).astype(np.int64)
+
+
+def partition_fingerprints(df: pd.DataFrame) -> pd.DataFrame:
+    """Fingerprint the raw records per (year, month) partition.
+
+    Every row is hashed over the cube dimensions and measures; the fingerprint
+    of a partition is its row count plus the wrapping sum of its row hashes,
+    so it does not depend on the order of the records within a release.
+    Expects the `sector` column to be filled in already.
+    """
+    row_hash = np.zeros(len(df), dtype=np.uint64)
+    for col in [*DIMENSIONS.values(), *MEASURES.values()]:
+        row_hash = _mix(row_hash ^ _column_hashes(df[col], numeric=col in _NUMERIC_COLUMNS))
+
+    hashes = pd.DataFrame({"key": partition_keys(df, DIMENSIONS["y"], DIMENSIONS["m"]), "hash": row_hash})
+    fingerprints = hashes.groupby("key", sort=True).agg(rows=("hash", "size"), hash=("hash", "sum"))
+    keys = fingerprints.index.to_numpy()
+    return pd.DataFrame({
+        "y": keys // 100,
+        "m": keys % 100,
+        "rows": fingerprints["rows"].to_numpy(),
+        "hash": fingerprints["hash"].to_numpy(),
+    })
+
+
+def changed_partitions(previous: pd.DataFrame, current: pd.DataFrame) -> pd.DataFrame:
+    """Return the (y, m) partitions that were added, removed or modified."""
+    merged = previous.merge(
+        current, on=PARTITION_DIMS, how="outer", suffixes=("_old", "_new"), indicator=True
+    )
+    differs = (
+        (merged["_merge"] != "both")
+        | (merged["rows_old"] != merged["rows_new"])
+        | (merged["hash_old"] != merged["hash_new"])
+    )
+    return merged.loc[differs, PARTITION_DIMS].reset_index(drop=True)
+
+
+def in_partitions(frame: pd.DataFrame, partitions: pd.DataFrame, y: str = "y", m: str = "m") -> np.ndarray:
+    """Boolean mask of the rows of `frame` that fall in one of `partitions`."""
+    wanted = partition_keys(partitions)
+    return np.isin(partition_keys(frame, y, m), wanted)
+
+
+def splice_cube(cube: pd.DataFrame, delta: pd.DataFrame, partitions: pd.DataFrame) -> pd.DataFrame:
+    """Replace the `partitions` of a stored cube with a freshly aggregated delta cube."""
+    kept = cube[~in_partitions(cube, partitions)]
+    if not len(kept):
+        # Nothing stored for these years yet (new year): the delta is the cube
+        return delta.sort_values(CUBE_DIMS, kind="stable", na_position="last").reset_index(drop=True)
+    if len(delta):
+        # Categoricals are left alone: casting to the stored categories would
+        # turn values first seen in this release into NaN
+        delta = delta.astype({
+            col: dtype for col, dtype in kept.dtypes.items() if not isinstance(dtype, pd.CategoricalDtype)
+        })
+    return (
+        pd.concat([kept, delta], ignore_index=True)
+        .sort_values(CUBE_DIMS, kind="stable", na_position="last")
+        .reset_index(drop=True)
+    )
+
+
+def results_digest(paths: list[Path]) -> str | None:
+    """SHA-256 over the contents of the result files; None if one is missing."""
+    digest = hashlib.sha256()
+    for path in paths:
+        if not path.exists():
+            return None
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def load_state(state_dir: Path, config_key: str, results: str | None) -> pd.DataFrame | None:
+    """Load the partition fingerprints of the previous run.
+
+    Returns None when there is no usable state: missing files, another state
+    version, state built for a different output configuration, or result files
+    that differ from the ones the state produced (e.g. a run whose results
+    were never committed).
+    """
+    state_file = state_dir / "state.json"
+    partitions_file = state_dir / "partitions.parquet"
+    if not (state_file.exists() and partitions_file.exists()):
+        return None
+
+    state = json.loads(state_file.read_text(encoding="utf-8"))
+    if state.get("version") != STATE_VERSION or state.get("config") != config_key:
+        return None
+    if results is None or state.get("results") != results:
+        return None
+
+    return pd.read_parquet(partitions_file)
+
+
+def load_cube(state_dir: Path, years: set[int], partitions: pd.DataFrame) -> pd.DataFrame | None:
+    """Read the stored cube rows of `years`.
+
+    `partitions` are the fingerprints of the stored state. A year without
+    stored partitions (e.g. the first months of a new year) has no cube rows
+    yet; returns None only when the file of a stored year is missing.
+    """
+    stored_years = set(partitions["y"].astype(int))
+    frames = []
+    for year in sorted(years & stored_years):
+        path = state_dir / "cube" / f"{year}.parquet"
+        if not path.exists():
+            return None
+        frames.append(pd.read_parquet(path))
+    if not frames:
+        return pd.DataFrame(columns=CUBE_DIMS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def save_state(
+    state_dir: Path,
+    config_key: str,
+    results: str,
+    partitions: pd.DataFrame,
+    cube: pd.DataFrame,
+    years: set[int] | None = None,
+) -> None:
+    """Store the partition fingerprints and the cube for the next incremental run.
+
+    Only the cube files of `years` are rewritten (all years when None); year
+    files without rows left in the cube are removed.
+    """
+    cube_dir = state_dir / "cube"
+    cube_dir.mkdir(parents=True, exist_ok=True)
+    if years is None:
+        for old in cube_dir.glob("*.parquet"):
+            old.unlink()
+        years = set(cube["y"].dropna().astype(int))
+
+    by_year = dict(tuple(cube.groupby("y", sort=True)))
+    for year in years:
+        path = cube_dir / f"{year}.parquet"
+        if year in by_year:
+            by_year[year].to_parquet(path, index=False)
+        else:
+            path.unlink(missing_ok=True)
+
+    partitions.to_parquet(state_dir / "partitions.parquet", index=False)
+    (state_dir / "state.json").write_text(
+        json.dumps({"version": STATE_VERSION, "config": config_key, "results": results}, indent=2),
+        encoding="utf-8",
+    )
+
+
+def patch_records(path: Path, fresh: pd.DataFrame, years: set[int], sort_keys: list[str]) -> pd.DataFrame:
+    """Merge recomputed records for `years` into an existing result file.
+
+    Records of other years are kept as they are; the merged frame is sorted
+    like a full rebuild would sort it.
+    """
+    existing = pd.DataFrame(json.loads(path.read_text(encoding="utf-8")), columns=fresh.columns)
+    existing = existing[~existing["y"].isin(years)]
+    if existing.empty:
+        return fresh
+    merged = pd.concat([existing, fresh], ignore_index=True)
+    return merged.sort_values(sort_keys, kind="stable").reset_index(drop=True)
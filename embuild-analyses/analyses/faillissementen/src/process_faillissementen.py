@@ -7,25 +7,70 @@ Downloads the most recent year's data and processes it for the dashboard.
 Focuses on construction sector (NACE section F) but includes all sectors for comparison.
 """
 
-import io
+import hashlib
 import json
 import os
-import zipfile
+import sys
 from datetime import datetime
 from pathlib import Path
 
 import pandas as pd
 import requests
 
+from derived_metrics import DERIVED_COLUMNS, derived_metrics
+from grouping_sets import build_cube, compute_grouping_sets
+from incremental import (
+    changed_partitions,
+    in_partitions,
+    load_cube,
+    load_state,
+    partition_fingerprints,
+    results_digest,
+    patch_records,
+    save_state,
+    splice_cube,
+)
+
 # Paths
 SCRIPT_DIR = Path(__file__).parent
 DATA_DIR = SCRIPT_DIR.parent / "data"
 RESULTS_DIR = SCRIPT_DIR.parent / "results"
 RESULTS_DIR.mkdir(exist_ok=True)
+# Opt-in dictionary-encoded copies of the outputs (see shared-data/json_columnar.py)
+COLUMNAR_DIR_NAME = "columnar"
+SHARED_DATA_DIR = SCRIPT_DIR.parent.parent.parent / "shared-data"
+
+sys.path.insert(0, str(SHARED_DATA_DIR))
+from json_columnar import write_json_columnar  # noqa: E402
+from json_records import write_json_records  # noqa: E402
+from parquet_cache import CACHE_DIR_NAME, load_or_parse  # noqa: E402
+from statbel_schema import CATEGORY, INT, ORDINAL, apply_schema, decode_categories  # noqa: E402
+from xlsx_stream import read_xlsx  # noqa: E402
+
+CACHE_DIR = DATA_DIR / CACHE_DIR_NAME
+# Version of read_archive in the parquet cache key; bump it when the parsed frame changes
+PARSE_VERSION = 3
+# Cube and partition fingerprints of the previous run (incremental mode)
+STATE_DIR = DATA_DIR / ".incremental"
 
 # Statbel URL pattern
 BASE_URL = "https://statbel.fgov.be/sites/default/files/files/opendata/BRI_Nace"
 
+# Download chunk size; the archive is streamed to disk, never held in memory
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# Columns of TF_BANKRUPTCIES used by the pipeline; the others are never loaded
+RAW_COLUMNS = [
+    "CD_YEAR",
+    "CD_MONTH",
+    "TX_NACE_REV2_SECTION",
+    "CD_PROV_REFNIS",
+    "TX_COMPANY_DURATION_NL",
+    "TX_EMPLOYMENT_CLASS_DESCR_NL",
+    "MS_COUNTOF_BANKRUPTCIES",
+    "MS_COUNTOF_WORKERS",
+]
+
 # NACE sector mapping (section code -> Dutch name)
 SECTOR_NAMES = {
     "A": "Landbouw, bosbouw en visserij",
@@ -56,10 +101,113 @@ SECTOR_NAMES = {
 # Note: Brussels (21000) is technically an arrondissement, not a province, but is treated
 # as a province-equivalent for visualization purposes since Brussels Capital Region has no
 # province-level administrative division in the NIS hierarchy.
-SHARED_DATA_DIR = SCRIPT_DIR.parent.parent.parent / "shared-data"
 with open(SHARED_DATA_DIR / "belgian-provinces.json", "r") as f:
     BELGIAN_PROVINCES = {int(k): v for k, v in json.load(f).items()}
 
+CONSTRUCTION_SECTOR = "F"
+
+# Company duration classes in display order
+DURATION_ORDER = [
+    "Minder dan 1 jaar",
+    "Van 1 jaar tot minder dan 2 jaar",
+    "Van 2 jaar tot minder dan 3 jaar",
+    "Van 3 jaar tot minder dan 4 jaar",
+    "Van 4 jaar tot minder dan 5 jaar",
+    "Van 5 jaar tot minder dan 10 jaar",
+    "Van 10 jaar tot minder dan 15 jaar",
+    "Van 15 jaar tot minder dan 20 jaar",
+    "20 jaar of meer",
+]
+DURATION_SHORT = {
+    "Minder dan 1 jaar": "<1 jaar",
+    "Van 1 jaar tot minder dan 2 jaar": "1-2 jaar",
+    "Van 2 jaar tot minder dan 3 jaar": "2-3 jaar",
+    "Van 3 jaar tot minder dan 4 jaar": "3-4 jaar",
+    "Van 4 jaar tot minder dan 5 jaar": "4-5 jaar",
+    "Van 5 jaar tot minder dan 10 jaar": "5-10 jaar",
+    "Van 10 jaar tot minder dan 15 jaar": "10-15 jaar",
+    "Van 15 jaar tot minder dan 20 jaar": "15-20 jaar",
+    "20 jaar of meer": "20+ jaar",
+}
+
+# Dimension types of the raw records (see shared-data/statbel_schema.py)
+RAW_SCHEMA = {
+    "TX_NACE_REV2_SECTION": (CATEGORY, tuple(SECTOR_NAMES)),
+    "CD_PROV_REFNIS": (INT, ()),
+    "TX_COMPANY_DURATION_NL": (ORDINAL, tuple(DURATION_ORDER)),
+    "TX_EMPLOYMENT_CLASS_DESCR_NL": (CATEGORY, ()),
+}
+
+# Output file -> grouping set (see grouping_sets.py for the dimension keys).
+# Records are sorted by their dimensions, with durations in DURATION_ORDER.
+OUTPUTS = {
+    "monthly_totals.json": {"dims": ["y", "m"]},
+    "monthly_construction.json": {"dims": ["y", "m"], "sector": CONSTRUCTION_SECTOR},
+    "yearly_totals.json": {"dims": ["y"]},
+    "yearly_construction.json": {"dims": ["y"], "sector": CONSTRUCTION_SECTOR},
+    "yearly_by_sector.json": {"dims": ["y", "s"]},
+    "monthly_by_sector.json": {"dims": ["y", "m", "s"]},
+    "provinces_construction.json": {"dims": ["y", "p"], "sector": CONSTRUCTION_SECTOR},
+    "provinces.json": {"dims": ["y", "p"]},
+    "monthly_provinces_construction.json": {"dims": ["y", "m", "p"], "sector": CONSTRUCTION_SECTOR},
+    "monthly_provinces.json": {"dims": ["y", "m", "p"]},
+    "yearly_by_sector_province.json": {"dims": ["y", "s", "p"]},
+    "yearly_by_duration_construction.json": {"dims": ["y", "d"], "sector": CONSTRUCTION_SECTOR},
+    "yearly_by_duration.json": {"dims": ["y", "d"]},
+    "yearly_by_duration_province_construction.json": {"dims": ["y", "d", "p"], "sector": CONSTRUCTION_SECTOR},
+    "yearly_by_workers_construction.json": {"dims": ["y", "c"], "sector": CONSTRUCTION_SECTOR},
+    "yearly_by_workers.json": {"dims": ["y", "c"]},
+    "yearly_by_workers_province_construction.json": {"dims": ["y", "c", "p"], "sector": CONSTRUCTION_SECTOR},
+}
+
+# Derived monthly series (trailing 12 months, YoY deltas, sector shares; see
+# derived_metrics.py), computed from these outputs and written as columnar JSON
+DERIVED_FILE = "derived_monthly.json"
+DERIVED_SOURCES = {
+    "monthly_totals": "monthly_totals.json",
+    "monthly_by_sector": "monthly_by_sector.json",
+    "monthly_provinces": "monthly_provinces.json",
+    "monthly_provinces_sector": "monthly_provinces_construction.json",
+}
+
+
+def output_sort_keys(dims: list[str]) -> list[str]:
+    """Sort keys of an output file: its dimensions, with durations in DURATION_ORDER."""
+    return ["do" if key == "d" else key for key in dims]
+
+
+def config_key() -> str:
+    """Fingerprint of the output configuration that stored incremental state depends on."""
+    config = [OUTPUTS, sorted(BELGIAN_PROVINCES), DURATION_ORDER, DURATION_SHORT]
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def to_frame(frame: pd.DataFrame, dims: list[str]) -> pd.DataFrame:
+    """Shape an aggregated grouping set into the sorted output columns used by the dashboard."""
+    # Records with a missing dimension value are not reported
+    frame = decode_categories(frame.dropna(subset=dims))
+    if "p" in dims:
+        frame = frame[frame["p"].isin(list(BELGIAN_PROVINCES))]
+
+    out = frame[dims + ["n", "w"]].copy()
+    if "d" in dims:
+        out.insert(dims.index("d") + 1, "ds", out["d"].map(DURATION_SHORT).fillna(out["d"]))
+        order = pd.Series(range(len(DURATION_ORDER)), index=DURATION_ORDER)
+        out.insert(dims.index("d") + 2, "do", out["d"].map(order).fillna(99).astype(int))
+
+    out = out.sort_values(output_sort_keys(dims), kind="stable")
+    if "p" in dims:
+        out["p"] = out["p"].astype(int).astype(str)
+    return out
+
+
+def output_columns(frame: pd.DataFrame) -> dict[str, tuple[str, str]]:
+    """JSON column map for a frame produced by `to_frame`."""
+    return {
+        col: (col, "int" if col in ("y", "m", "do", "n", "w") else "str")
+        for col in frame.columns
+    }
+
 
 def download_data() -> pd.DataFrame:
     """Download bankruptcy data from Statbel.
@@ -82,23 +230,26 @@ def download_data() -> pd.DataFrame:
     for url in urls_to_try:
         print(f"Trying URL: {url}")
         try:
-            response = requests.get(url, timeout=120)
-            if response.status_code == 200:
-                print(f"Successfully downloaded from: {url}")
-
-                # Save zip to data directory for reference
-                zip_filename = url.split("/")[-1]
-                zip_path = DATA_DIR / zip_filename
+            with requests.get(url, stream=True, timeout=120) as response:
+                if response.status_code != 200:
+                    print(f"Got HTTP {response.status_code} from {url}")
+                    continue
+
+                # Stream the zip to the data directory
+                zip_path = DATA_DIR / url.split("/")[-1]
+                DATA_DIR.mkdir(parents=True, exist_ok=True)
                 with open(zip_path, "wb") as f:
-                    f.write(response.content)
-
-                # Extract and read Excel
-                with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
-                    excel_name = [n for n in zf.namelist() if n.endswith(".xlsx")][0]
-                    with zf.open(excel_name) as excel_file:
-                        df = pd.read_excel(excel_file)
-                        print(f"Loaded {len(df)} records from {excel_name}")
-                        return df
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+            print(f"Successfully downloaded from: {url}")
+
+            # Read the Excel sheet in row batches (skipped when this exact archive was parsed before)
+            def read_archive() -> pd.DataFrame:
+                df = read_xlsx(zip_path, columns=RAW_COLUMNS)
+                print(f"Loaded {len(df)} records from {zip_path.name}")
+                return df
+
+            return load_or_parse(zip_path, read_archive, CACHE_DIR, "TF_BANKRUPTCIES", PARSE_VERSION)
         except Exception as e:
             print(f"Failed to download from {url}: {e}")
             continue
@@ -106,440 +257,90 @@ def download_data() -> pd.DataFrame:
     raise RuntimeError("Could not download data from any URL")
 
 
-def process_data(df: pd.DataFrame) -> None:
-    """Process bankruptcy data and save aggregated results."""
+def process_data(df: pd.DataFrame, incremental: bool = False, columnar: bool = False) -> None:
+    """Process bankruptcy data and save aggregated results.
 
-    # Use all Belgian data (no region filter)
-    df_be = df.copy()
+    With `incremental`, the cube of the previous run is loaded from STATE_DIR
+    and only the (year, month) partitions that changed since then are
+    re-aggregated; result files are patched for the affected years. Without
+    usable state this falls back to a full rebuild.
+
+    With `columnar`, every output is also written in the dictionary-encoded
+    columnar format to RESULTS_DIR/columnar/.
+    """
+
+    # Use all Belgian data (no region filter); dimensions become categoricals
+    df_be = apply_schema(df, RAW_SCHEMA)
     print(f"Processing {len(df_be)} Belgian records")
 
     # Clean up sector code
     df_be["sector"] = df_be["TX_NACE_REV2_SECTION"].fillna("?")
 
-    # Get year range
+    # Years whose records need recomputing; None means rebuild every output
+    years = None
+    cube = None
+    if incremental:
+        partitions = partition_fingerprints(df_be)
+        result_files = [RESULTS_DIR / filename for filename in [*OUTPUTS, DERIVED_FILE]]
+        if columnar:
+            # Enabling columnar output invalidates the state, so every file gets written
+            result_files += [RESULTS_DIR / COLUMNAR_DIR_NAME / filename for filename in OUTPUTS]
+        previous_partitions = load_state(STATE_DIR, config_key(), results_digest(result_files))
+        if previous_partitions is not None:
+            changed = changed_partitions(previous_partitions, partitions)
+            years = set(changed["y"].astype(int))
+            stored = load_cube(STATE_DIR, years, previous_partitions)
+            if stored is None:
+                years = None
+            else:
+                # Re-aggregate only the changed months and splice them into the stored years
+                delta = build_cube(df_be[in_partitions(df_be, changed, "CD_YEAR", "CD_MONTH")])
+                cube = splice_cube(stored, delta, changed)
+                print(f"Incremental run: {len(changed)} changed month(s) in years {sorted(years)}")
+        if years is None:
+            print("No usable incremental state, rebuilding all outputs")
+
+    if cube is None:
+        # Single scan over the raw records; every output below is rolled up from this cube
+        cube = build_cube(df_be)
+    print(f"Aggregated to {len(cube)} cube cells")
+
+    # Get year range (from the raw records: an incremental cube only holds the changed years)
     min_year = int(df_be["CD_YEAR"].min())
     max_year = int(df_be["CD_YEAR"].max())
-    max_month = int(df_be[df_be["CD_YEAR"] == max_year]["CD_MONTH"].max())
+    max_month = int(df_be.loc[df_be["CD_YEAR"] == max_year, "CD_MONTH"].max())
     print(f"Data range: {min_year} - {max_year}/{max_month}")
 
     # =========================================================================
-    # AGGREGATE 1: Monthly totals for ALL sectors
-    # =========================================================================
-    monthly_all = df_be.groupby(["CD_YEAR", "CD_MONTH"]).agg({
-        "MS_COUNTOF_BANKRUPTCIES": "sum",
-        "MS_COUNTOF_WORKERS": "sum",
-    }).reset_index()
-
-    monthly_all_json = [
-        {
-            "y": int(row["CD_YEAR"]),
-            "m": int(row["CD_MONTH"]),
-            "n": int(row["MS_COUNTOF_BANKRUPTCIES"]),
-            "w": int(row["MS_COUNTOF_WORKERS"]),
-        }
-        for _, row in monthly_all.iterrows()
-    ]
-    monthly_all_json.sort(key=lambda x: (x["y"], x["m"]))
-
-    with open(RESULTS_DIR / "monthly_totals.json", "w") as f:
-        json.dump(monthly_all_json, f)
-
-    # =========================================================================
-    # AGGREGATE 2: Monthly totals for CONSTRUCTION sector only
-    # =========================================================================
-    df_bouw = df_be[df_be["sector"] == "F"]
-
-    monthly_bouw = df_bouw.groupby(["CD_YEAR", "CD_MONTH"]).agg({
-        "MS_COUNTOF_BANKRUPTCIES": "sum",
-        "MS_COUNTOF_WORKERS": "sum",
-    }).reset_index()
-
-    monthly_bouw_json = [
-        {
-            "y": int(row["CD_YEAR"]),
-            "m": int(row["CD_MONTH"]),
-            "n": int(row["MS_COUNTOF_BANKRUPTCIES"]),
-            "w": int(row["MS_COUNTOF_WORKERS"]),
-        }
-        for _, row in monthly_bouw.iterrows()
-    ]
-    monthly_bouw_json.sort(key=lambda x: (x["y"], x["m"]))
-
-    with open(RESULTS_DIR / "monthly_construction.json", "w") as f:
-        json.dump(monthly_bouw_json, f)
-
-    # =========================================================================
-    # AGGREGATE 3: Yearly totals for ALL sectors
-    # =========================================================================
-    yearly_all = df_be.groupby(["CD_YEAR"]).agg({
-        "MS_COUNTOF_BANKRUPTCIES": "sum",
-        "MS_COUNTOF_WORKERS": "sum",
-    }).reset_index()
-
-    yearly_all_json = [
-        {
-            "y": int(row["CD_YEAR"]),
-            "n": int(row["MS_COUNTOF_BANKRUPTCIES"]),
-            "w": int(row["MS_COUNTOF_WORKERS"]),
-        }
-        for _, row in yearly_all.iterrows()
-    ]
-    yearly_all_json.sort(key=lambda x: x["y"])
-
-    with open(RESULTS_DIR / "yearly_totals.json", "w") as f:
-        json.dump(yearly_all_json, f)
-
-    # =========================================================================
-    # AGGREGATE 4: Yearly totals for CONSTRUCTION sector only
-    # =========================================================================
-    yearly_bouw = df_bouw.groupby(["CD_YEAR"]).agg({
-        "MS_COUNTOF_BANKRUPTCIES": "sum",
-        "MS_COUNTOF_WORKERS": "sum",
-    }).reset_index()
-
-    yearly_bouw_json = [
-        {
-            "y": int(row["CD_YEAR"]),
-            "n": int(row["MS_COUNTOF_BANKRUPTCIES"]),
-            "w": int(row["MS_COUNTOF_WORKERS"]),
-        }
-        for _, row in yearly_bouw.iterrows()
-    ]
-    yearly_bouw_json.sort(key=lambda x: x["y"])
-
-    with open(RESULTS_DIR / "yearly_construction.json", "w") as f:
-        json.dump(yearly_bouw_json, f)
-
-    # =========================================================================
-    # AGGREGATE 5: Yearly by sector (for sector comparison)
+    # AGGREGATES: one grouping set per output file
     # =========================================================================
-    yearly_by_sector = df_be.groupby(["CD_YEAR", "sector"]).agg({
-        "MS_COUNTOF_BANKRUPTCIES": "sum",
-        "MS_COUNTOF_WORKERS": "sum",
-    }).reset_index()
-
-    yearly_sector_json = [
-        {
-            "y": int(row["CD_YEAR"]),
-            "s": row["sector"],
-            "n": int(row["MS_COUNTOF_BANKRUPTCIES"]),
-            "w": int(row["MS_COUNTOF_WORKERS"]),
-        }
-        for _, row in yearly_by_sector.iterrows()
-    ]
-    yearly_sector_json.sort(key=lambda x: (x["y"], x["s"]))
-
-    with open(RESULTS_DIR / "yearly_by_sector.json", "w") as f:
-        json.dump(yearly_sector_json, f)
-
-    # =========================================================================
-    # AGGREGATE 6: Monthly by sector (for sector comparison charts)
-    # =========================================================================
-    monthly_by_sector = df_be.groupby(["CD_YEAR", "CD_MONTH", "sector"]).agg({
-        "MS_COUNTOF_BANKRUPTCIES": "sum",
-        "MS_COUNTOF_WORKERS": "sum",
-    }).reset_index()
-
-    monthly_sector_json = [
-        {
-            "y": int(row["CD_YEAR"]),
-            "m": int(row["CD_MONTH"]),
-            "s": row["sector"],
-            "n": int(row["MS_COUNTOF_BANKRUPTCIES"]),
-            "w": int(row["MS_COUNTOF_WORKERS"]),
-        }
-        for _, row in monthly_by_sector.iterrows()
-    ]
-    monthly_sector_json.sort(key=lambda x: (x["y"], x["m"], x["s"]))
-
-    with open(RESULTS_DIR / "monthly_by_sector.json", "w") as f:
-        json.dump(monthly_sector_json, f)
-
-    # =========================================================================
-    # AGGREGATE 7: By province (construction sector)
-    # =========================================================================
-    df_bouw_prov = df_bouw[df_bouw["CD_PROV_REFNIS"].notna()].copy()
-    df_bouw_prov["CD_PROV_REFNIS"] = df_bouw_prov["CD_PROV_REFNIS"].astype(int)
-
-    provinces_yearly = df_bouw_prov.groupby(["CD_YEAR", "CD_PROV_REFNIS"]).agg({
-        "MS_COUNTOF_BANKRUPTCIES": "sum",
-        "MS_COUNTOF_WORKERS": "sum",
-    }).reset_index()
-
-    provinces_json = [
-        {
-            "y": int(row["CD_YEAR"]),
-            "p": str(int(row["CD_PROV_REFNIS"])),
-            "n": int(row["MS_COUNTOF_BANKRUPTCIES"]),
-            "w": int(row["MS_COUNTOF_WORKERS"]),
-        }
-        for _, row in provinces_yearly.iterrows()
-        if int(row["CD_PROV_REFNIS"]) in BELGIAN_PROVINCES
-    ]
-    provinces_json.sort(key=lambda x: (x["y"], x["p"]))
-
-    with open(RESULTS_DIR / "provinces_construction.json", "w") as f:
-        json.dump(provinces_json, f)
-
-    # =========================================================================
-    # AGGREGATE 8: By province (all sectors)
-    # =========================================================================
-    df_be_prov = df_be[df_be["CD_PROV_REFNIS"].notna()].copy()
-    df_be_prov["CD_PROV_REFNIS"] = df_be_prov["CD_PROV_REFNIS"].astype(int)
-
-    provinces_all_yearly = df_be_prov.groupby(["CD_YEAR", "CD_PROV_REFNIS"]).agg({
-        "MS_COUNTOF_BANKRUPTCIES": "sum",
-        "MS_COUNTOF_WORKERS": "sum",
-    }).reset_index()
-
-    provinces_all_json = [
-        {
-            "y": int(row["CD_YEAR"]),
-            "p": str(int(row["CD_PROV_REFNIS"])),
-            "n": int(row["MS_COUNTOF_BANKRUPTCIES"]),
-            "w": int(row["MS_COUNTOF_WORKERS"]),
-        }
-        for _, row in provinces_all_yearly.iterrows()
-        if int(row["CD_PROV_REFNIS"]) in BELGIAN_PROVINCES
-    ]
-    provinces_all_json.sort(key=lambda x: (x["y"], x["p"]))
-
-    with open(RESULTS_DIR / "provinces.json", "w") as f:
-        json.dump(provinces_all_json, f)
-
-    # =========================================================================
-    # AGGREGATE 9: Monthly by province (construction sector)
-    # =========================================================================
-    monthly_prov_bouw = df_bouw_prov.groupby(["CD_YEAR", "CD_MONTH", "CD_PROV_REFNIS"]).agg({
-        "MS_COUNTOF_BANKRUPTCIES": "sum",
-        "MS_COUNTOF_WORKERS": "sum",
-    }).reset_index()
-
-    monthly_prov_bouw_json = [
-        {
-            "y": int(row["CD_YEAR"]),
-            "m": int(row["CD_MONTH"]),
-            "p": str(int(row["CD_PROV_REFNIS"])),
-            "n": int(row["MS_COUNTOF_BANKRUPTCIES"]),
-            "w": int(row["MS_COUNTOF_WORKERS"]),
-        }
-        for _, row in monthly_prov_bouw.iterrows()
-        if int(row["CD_PROV_REFNIS"]) in BELGIAN_PROVINCES
-    ]
-    monthly_prov_bouw_json.sort(key=lambda x: (x["y"], x["m"], x["p"]))
-
-    with open(RESULTS_DIR / "monthly_provinces_construction.json", "w") as f:
-        json.dump(monthly_prov_bouw_json, f)
-
-    # =========================================================================
-    # AGGREGATE 10: Monthly by province (all sectors)
-    # =========================================================================
-    monthly_prov_all = df_be_prov.groupby(["CD_YEAR", "CD_MONTH", "CD_PROV_REFNIS"]).agg({
-        "MS_COUNTOF_BANKRUPTCIES": "sum",
-        "MS_COUNTOF_WORKERS": "sum",
-    }).reset_index()
-
-    monthly_prov_all_json = [
-        {
-            "y": int(row["CD_YEAR"]),
-            "m": int(row["CD_MONTH"]),
-            "p": str(int(row["CD_PROV_REFNIS"])),
-            "n": int(row["MS_COUNTOF_BANKRUPTCIES"]),
-            "w": int(row["MS_COUNTOF_WORKERS"]),
-        }
-        for _, row in monthly_prov_all.iterrows()
-        if int(row["CD_PROV_REFNIS"]) in BELGIAN_PROVINCES
-    ]
-    monthly_prov_all_json.sort(key=lambda x: (x["y"], x["m"], x["p"]))
-
-    with open(RESULTS_DIR / "monthly_provinces.json", "w") as f:
-        json.dump(monthly_prov_all_json, f)
-
-    # =========================================================================
-    # AGGREGATE 11: Yearly by sector and province (for geo filter in sector comparison)
-    # =========================================================================
-    yearly_sector_prov = df_be_prov.groupby(["CD_YEAR", "sector", "CD_PROV_REFNIS"]).agg({
-        "MS_COUNTOF_BANKRUPTCIES": "sum",
-        "MS_COUNTOF_WORKERS": "sum",
-    }).reset_index()
-
-    yearly_sector_prov_json = [
-        {
-            "y": int(row["CD_YEAR"]),
-            "s": row["sector"],
-            "p": str(int(row["CD_PROV_REFNIS"])),
-            "n": int(row["MS_COUNTOF_BANKRUPTCIES"]),
-            "w": int(row["MS_COUNTOF_WORKERS"]),
-        }
-        for _, row in yearly_sector_prov.iterrows()
-        if int(row["CD_PROV_REFNIS"]) in BELGIAN_PROVINCES
-    ]
-    yearly_sector_prov_json.sort(key=lambda x: (x["y"], x["s"], x["p"]))
-
-    with open(RESULTS_DIR / "yearly_by_sector_province.json", "w") as f:
-        json.dump(yearly_sector_prov_json, f)
-
-    # =========================================================================
-    # AGGREGATE 12: By company duration (construction sector)
-    # =========================================================================
-    duration_order = [
-        "Minder dan 1 jaar",
-        "Van 1 jaar tot minder dan 2 jaar",
-        "Van 2 jaar tot minder dan 3 jaar",
-        "Van 3 jaar tot minder dan 4 jaar",
-        "Van 4 jaar tot minder dan 5 jaar",
-        "Van 5 jaar tot minder dan 10 jaar",
-        "Van 10 jaar tot minder dan 15 jaar",
-        "Van 15 jaar tot minder dan 20 jaar",
-        "20 jaar of meer",
-    ]
-    duration_short = {
-        "Minder dan 1 jaar": "<1 jaar",
-        "Van 1 jaar tot minder dan 2 jaar": "1-2 jaar",
-        "Van 2 jaar tot minder dan 3 jaar": "2-3 jaar",
-        "Van 3 jaar tot minder dan 4 jaar": "3-4 jaar",
-        "Van 4 jaar tot minder dan 5 jaar": "4-5 jaar",
-        "Van 5 jaar tot minder dan 10 jaar": "5-10 jaar",
-        "Van 10 jaar tot minder dan 15 jaar": "10-15 jaar",
-        "Van 15 jaar tot minder dan 20 jaar": "15-20 jaar",
-        "20 jaar of meer": "20+ jaar",
-    }
-
-    # Construction by duration
-    duration_bouw = df_bouw.groupby(["CD_YEAR", "TX_COMPANY_DURATION_NL"]).agg({
-        "MS_COUNTOF_BANKRUPTCIES": "sum",
-        "MS_COUNTOF_WORKERS": "sum",
-    }).reset_index()
-
-    duration_bouw_json = [
-        {
-            "y": int(row["CD_YEAR"]),
-            "d": row["TX_COMPANY_DURATION_NL"],
-            "ds": duration_short.get(row["TX_COMPANY_DURATION_NL"], row["TX_COMPANY_DURATION_NL"]),
-            "do": duration_order.index(row["TX_COMPANY_DURATION_NL"]) if row["TX_COMPANY_DURATION_NL"] in duration_order else 99,
-            "n": int(row["MS_COUNTOF_BANKRUPTCIES"]),
-            "w": int(row["MS_COUNTOF_WORKERS"]),
-        }
-        for _, row in duration_bouw.iterrows()
-    ]
-    duration_bouw_json.sort(key=lambda x: (x["y"], x["do"]))
-
-    with open(RESULTS_DIR / "yearly_by_duration_construction.json", "w") as f:
-        json.dump(duration_bouw_json, f)
-
-    # All sectors by duration
-    duration_all = df_be.groupby(["CD_YEAR", "TX_COMPANY_DURATION_NL"]).agg({
-        "MS_COUNTOF_BANKRUPTCIES": "sum",
-        "MS_COUNTOF_WORKERS": "sum",
-    }).reset_index()
-
-    duration_all_json = [
-        {
-            "y": int(row["CD_YEAR"]),
-            "d": row["TX_COMPANY_DURATION_NL"],
-            "ds": duration_short.get(row["TX_COMPANY_DURATION_NL"], row["TX_COMPANY_DURATION_NL"]),
-            "do": duration_order.index(row["TX_COMPANY_DURATION_NL"]) if row["TX_COMPANY_DURATION_NL"] in duration_order else 99,
-            "n": int(row["MS_COUNTOF_BANKRUPTCIES"]),
-            "w": int(row["MS_COUNTOF_WORKERS"]),
-        }
-        for _, row in duration_all.iterrows()
-    ]
-    duration_all_json.sort(key=lambda x: (x["y"], x["do"]))
-
-    with open(RESULTS_DIR / "yearly_by_duration.json", "w") as f:
-        json.dump(duration_all_json, f)
-
-    # By duration and province (construction)
-    df_bouw_prov_dur = df_bouw[df_bouw["CD_PROV_REFNIS"].notna()].copy()
-    df_bouw_prov_dur["CD_PROV_REFNIS"] = df_bouw_prov_dur["CD_PROV_REFNIS"].astype(int)
-
-    duration_prov_bouw = df_bouw_prov_dur.groupby(["CD_YEAR", "TX_COMPANY_DURATION_NL", "CD_PROV_REFNIS"]).agg({
-        "MS_COUNTOF_BANKRUPTCIES": "sum",
-        "MS_COUNTOF_WORKERS": "sum",
-    }).reset_index()
-
-    duration_prov_bouw_json = [
-        {
-            "y": int(row["CD_YEAR"]),
-            "d": row["TX_COMPANY_DURATION_NL"],
-            "ds": duration_short.get(row["TX_COMPANY_DURATION_NL"], row["TX_COMPANY_DURATION_NL"]),
-            "do": duration_order.index(row["TX_COMPANY_DURATION_NL"]) if row["TX_COMPANY_DURATION_NL"] in duration_order else 99,
-            "p": str(int(row["CD_PROV_REFNIS"])),
-            "n": int(row["MS_COUNTOF_BANKRUPTCIES"]),
-            "w": int(row["MS_COUNTOF_WORKERS"]),
-        }
-        for _, row in duration_prov_bouw.iterrows()
-        if int(row["CD_PROV_REFNIS"]) in BELGIAN_PROVINCES
-    ]
-    duration_prov_bouw_json.sort(key=lambda x: (x["y"], x["do"], x["p"]))
-
-    with open(RESULTS_DIR / "yearly_by_duration_province_construction.json", "w") as f:
-        json.dump(duration_prov_bouw_json, f)
-
-    # =========================================================================
-    # AGGREGATE 13: By worker count class (construction sector)
-    # =========================================================================
-    # Employment class is already in the data as TX_EMPLOYMENT_CLASS_DESCR_NL
-    workers_bouw = df_bouw.groupby(["CD_YEAR", "TX_EMPLOYMENT_CLASS_DESCR_NL"]).agg({
-        "MS_COUNTOF_BANKRUPTCIES": "sum",
-        "MS_COUNTOF_WORKERS": "sum",
-    }).reset_index()
-
-    workers_bouw_json = [
-        {
-            "y": int(row["CD_YEAR"]),
-            "c": row["TX_EMPLOYMENT_CLASS_DESCR_NL"],
-            "n": int(row["MS_COUNTOF_BANKRUPTCIES"]),
-            "w": int(row["MS_COUNTOF_WORKERS"]),
-        }
-        for _, row in workers_bouw.iterrows()
-    ]
-    workers_bouw_json.sort(key=lambda x: (x["y"], x["c"]))
-
-    with open(RESULTS_DIR / "yearly_by_workers_construction.json", "w") as f:
-        json.dump(workers_bouw_json, f)
-
-    # All sectors by worker class
-    workers_all = df_be.groupby(["CD_YEAR", "TX_EMPLOYMENT_CLASS_DESCR_NL"]).agg({
-        "MS_COUNTOF_BANKRUPTCIES": "sum",
-        "MS_COUNTOF_WORKERS": "sum",
-    }).reset_index()
-
-    workers_all_json = [
-        {
-            "y": int(row["CD_YEAR"]),
-            "c": row["TX_EMPLOYMENT_CLASS_DESCR_NL"],
-            "n": int(row["MS_COUNTOF_BANKRUPTCIES"]),
-            "w": int(row["MS_COUNTOF_WORKERS"]),
-        }
-        for _, row in workers_all.iterrows()
-    ]
-    workers_all_json.sort(key=lambda x: (x["y"], x["c"]))
-
-    with open(RESULTS_DIR / "yearly_by_workers.json", "w") as f:
-        json.dump(workers_all_json, f)
-
-    # By worker class and province (construction)
-    workers_prov_bouw = df_bouw_prov.groupby(["CD_YEAR", "TX_EMPLOYMENT_CLASS_DESCR_NL", "CD_PROV_REFNIS"]).agg({
-        "MS_COUNTOF_BANKRUPTCIES": "sum",
-        "MS_COUNTOF_WORKERS": "sum",
-    }).reset_index()
-
-    workers_prov_bouw_json = [
-        {
-            "y": int(row["CD_YEAR"]),
-            "c": row["TX_EMPLOYMENT_CLASS_DESCR_NL"],
-            "p": str(int(row["CD_PROV_REFNIS"])),
-            "n": int(row["MS_COUNTOF_BANKRUPTCIES"]),
-            "w": int(row["MS_COUNTOF_WORKERS"]),
-        }
-        for _, row in workers_prov_bouw.iterrows()
-        if int(row["CD_PROV_REFNIS"]) in BELGIAN_PROVINCES
-    ]
-    workers_prov_bouw_json.sort(key=lambda x: (x["y"], x["c"], x["p"]))
-
-    with open(RESULTS_DIR / "yearly_by_workers_province_construction.json", "w") as f:
-        json.dump(workers_prov_bouw_json, f)
+    if years is None:
+        aggregates = compute_grouping_sets(cube, OUTPUTS)
+    else:
+        # Every output is split by year, so only the changed years are rolled up
+        aggregates = compute_grouping_sets(cube[cube["y"].isin(years)], OUTPUTS) if years else {}
+
+    written = {}
+    for filename, aggregate in aggregates.items():
+        dims = OUTPUTS[filename]["dims"]
+        out = to_frame(aggregate, dims)
+        if years is not None:
+            out = patch_records(RESULTS_DIR / filename, out, years, output_sort_keys(dims))
+        write_json_records(out, RESULTS_DIR / filename, output_columns(out))
+        if columnar:
+            (RESULTS_DIR / COLUMNAR_DIR_NAME).mkdir(exist_ok=True)
+            write_json_columnar(out, RESULTS_DIR / COLUMNAR_DIR_NAME / filename, output_columns(out))
+        written[filename] = out
+
+    # Derived series span all years, so they are recomputed from the full monthly files
+    if aggregates:
+        sources = {name: written[filename] for name, filename in DERIVED_SOURCES.items()}
+        sources["monthly_provinces_sector"] = sources["monthly_provinces_sector"].assign(s=CONSTRUCTION_SECTOR)
+        derived = derived_metrics(**sources)
+        write_json_columnar(derived, RESULTS_DIR / DERIVED_FILE, DERIVED_COLUMNS)
+
+    if incremental:
+        save_state(STATE_DIR, config_key(), results_digest(result_files), partitions, cube, years)
 
     # =========================================================================
     # LOOKUPS for UI
@@ -559,8 +360,8 @@ def process_data(df: pd.DataFrame) -> None:
 
     # Duration lookup
     durations_lookup = [
-        {"code": d, "short": duration_short[d]}
-        for d in duration_order
+        {"code": d, "short": DURATION_SHORT[d]}
+        for d in DURATION_ORDER
     ]
 
     # Worker class lookup (get unique values from data)
@@ -574,7 +375,7 @@ def process_data(df: pd.DataFrame) -> None:
         "sectors": sectors_lookup,
         "provinces": provinces_lookup,
         "years": list(range(min_year, max_year + 1)),
-        "construction_sector": "F",
+        "construction_sector": CONSTRUCTION_SECTOR,
         "durations": durations_lookup,
         "worker_classes": worker_classes_lookup,
     }
@@ -585,13 +386,15 @@ def process_data(df: pd.DataFrame) -> None:
     # =========================================================================
     # METADATA
     # =========================================================================
+    construction_records = int((df_be["sector"] == CONSTRUCTION_SECTOR).sum())
+
     metadata = {
         "min_year": min_year,
         "max_year": max_year,
         "max_month": max_month,
         "last_updated": datetime.now().isoformat(),
         "total_records": len(df_be),
-        "construction_records": len(df_bouw),
+        "construction_records": construction_records,
         "source_url": "https://statbel.fgov.be/nl/themas/ondernemingen/faillissementen",
     }
 
@@ -601,10 +404,16 @@ def process_data(df: pd.DataFrame) -> None:
     print(f"\nProcessing complete!")
     print(f"Data range: {min_year} - {max_year}/{max_month}")
     print(f"Total Belgian records: {len(df_be)}")
-    print(f"Construction sector records: {len(df_bouw)}")
+    print(f"Construction sector records: {construction_records}")
     print(f"Output files saved to: {RESULTS_DIR}")
 
 
 if __name__ == "__main__":
     df = download_data()
-    process_data(df)
+    # INCREMENTAL=1 reuses the cube of the previous run (see incremental.py),
+    # COLUMNAR_OUTPUT=1 also writes results/columnar/*.json
+    process_data(
+        df,
+        incremental=os.environ.get("INCREMENTAL") == "1",
+        columnar=os.environ.get("COLUMNAR_OUTPUT") == "1",
+    )
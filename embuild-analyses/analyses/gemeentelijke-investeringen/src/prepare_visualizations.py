@@ -9,12 +9,16 @@ Creates aggregated JSON files for the dashboard:
 import pandas as pd
 import json
 import numpy as np
+import sys
 from pathlib import Path
 
 # Load NIS municipality lookups
 SHARED_DATA_DIR = Path(__file__).parent.parent.parent.parent / 'shared-data'
 NIS_FILE = SHARED_DATA_DIR / 'nis' / 'refnis.csv'
 
+sys.path.insert(0, str(SHARED_DATA_DIR))
+from json_records import write_json_records  # noqa: E402
+
 # Directories
 SCRIPT_DIR = Path(__file__).parent
 PUBLIC_DATA_DIR = SCRIPT_DIR.parent.parent.parent / 'public' / 'data' / 'gemeentelijke-investeringen'
@@ -79,6 +83,30 @@ def save_json(data, filename, chunk_size=None):
     print(f"  → {filename} ({size_mb:.2f} MB)")
     return 1
 
+# Column kinds for the record outputs; all other columns are written as strings
+RECORD_KINDS = {
+    'Rapportjaar': 'int',
+    'Totaal': 'float',
+    'Per_inwoner': 'float',
+}
+
+def save_records(df, filename, chunk_size=None):
+    """Save a DataFrame as compact JSON records (NaN -> null) with optional chunking."""
+    columns = {col: (col, RECORD_KINDS.get(col, 'str')) for col in df.columns}
+
+    if chunk_size:
+        n_chunks = 0
+        for start in range(0, len(df), chunk_size):
+            chunk_filename = f"{filename.replace('.json', '')}_chunk_{n_chunks}.json"
+            write_json_records(df.iloc[start:start + chunk_size], RESULTS_DIR / chunk_filename, columns)
+            n_chunks += 1
+        return n_chunks
+
+    output_path = RESULTS_DIR / filename
+    size_mb = write_json_records(df, output_path, columns) / 1024 / 1024
+    print(f"  → {filename} ({size_mb:.2f} MB)")
+    return 1
+
 # NIS 2025 Fusions mapping (Sources -> Target)
 NIS_MERGERS_LOOKUP = {
     '11007': '11002', # Borsbeek -> Antwerpen
@@ -212,11 +240,10 @@ def prepare_bv_data():
     print(f"Lookups: {len(domains)} domains, {len(subdomeins)} subdomeins, {len(beleidsvelds)} beleidsvelds")
 
     # Municipality data (all records)
-    muni_data = df_agg.to_dict('records')
+    muni_data = df_agg
 
     # Vlaanderen totals (sum across all municipalities)
-    vlaanderen_totals = df_agg.groupby(['Rapportjaar', 'BV_domein', 'BV_subdomein', 'Beleidsveld'], dropna=False)[['Totaal', 'Per_inwoner']].sum().reset_index()
-    vlaanderen_data = vlaanderen_totals.to_dict('records')
+    vlaanderen_data = df_agg.groupby(['Rapportjaar', 'BV_domein', 'BV_subdomein', 'Beleidsveld'], dropna=False)[['Totaal', 'Per_inwoner']].sum().reset_index()
 
     return {
         'lookups': lookups,
@@ -251,11 +278,10 @@ def prepare_rek_data():
     print(f"Lookups: {len(niveau3s)} niveau3s, {len(alg_rekenings)} alg_rekenings")
 
     # Municipality data
-    muni_data = df_agg.to_dict('records')
+    muni_data = df_agg
 
     # Vlaanderen totals
-    vlaanderen_totals = df_agg.groupby(['Rapportjaar', 'Niveau_3', 'Alg_rekening'], dropna=False)[['Totaal', 'Per_inwoner']].sum().reset_index()
-    vlaanderen_data = vlaanderen_totals.to_dict('records')
+    vlaanderen_data = df_agg.groupby(['Rapportjaar', 'Niveau_3', 'Alg_rekening'], dropna=False)[['Totaal', 'Per_inwoner']].sum().reset_index()
 
     return {
         'lookups': lookups,
@@ -273,8 +299,8 @@ def main():
     # Also save lookups to internal results dir for nisUtils.ts imports
     save_json(bv_results['lookups'], RESULTS_INTERNAL_DIR / 'bv_lookups.json')
     
-    bv_chunks = save_json(bv_results['municipality_data'], 'bv_municipality_data.json', chunk_size=chunk_size)
-    save_json(bv_results['vlaanderen_data'], 'bv_vlaanderen_data.json')
+    bv_chunks = save_records(bv_results['municipality_data'], 'bv_municipality_data.json', chunk_size=chunk_size)
+    save_records(bv_results['vlaanderen_data'], 'bv_vlaanderen_data.json')
 
     # Prepare REK data
     rek_results = prepare_rek_data()
@@ -282,8 +308,8 @@ def main():
     # Also save lookups to internal results dir for nisUtils.ts imports
     save_json(rek_results['lookups'], RESULTS_INTERNAL_DIR / 'rek_lookups.json')
 
-    rek_chunks = save_json(rek_results['municipality_data'], 'rek_municipality_data.json', chunk_size=chunk_size)
-    save_json(rek_results['vlaanderen_data'], 'rek_vlaanderen_data.json')
+    rek_chunks = save_records(rek_results['municipality_data'], 'rek_municipality_data.json', chunk_size=chunk_size)
+    save_records(rek_results['vlaanderen_data'], 'rek_vlaanderen_data.json')
 
     # Create metadata
     df_bv = pd.read_parquet(INPUT_BV)
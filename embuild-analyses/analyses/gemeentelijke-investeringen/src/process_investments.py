@@ -13,11 +13,17 @@ Data structure:
 """
 
 import pandas as pd
+import numpy as np
 import os
+import sys
 from pathlib import Path
 
 # Directory setup
 SCRIPT_DIR = Path(__file__).parent
+SHARED_DATA_DIR = SCRIPT_DIR.parent.parent.parent / 'shared-data'
+sys.path.insert(0, str(SHARED_DATA_DIR))
+from belgian_numbers import parse_belgian_numbers  # noqa: E402
+
 DATA_DIR = SCRIPT_DIR.parent / 'data'
 RESULTS_DIR = SCRIPT_DIR.parent / 'results'
 RESULTS_DIR.mkdir(exist_ok=True)
@@ -97,6 +103,9 @@ def process_rek_file(file_path, rapportjaar):
     df_data = df.iloc[nis_row_idx+1:].copy()
     nis_code_header = df.iloc[nis_row_idx, 1:].tolist()
 
+    # Converteer waarden per kolom (lege of ongeldige cellen worden NaN)
+    values = df_data.iloc[:, 1:].apply(parse_belgian_numbers).to_numpy()
+
     # Maak tidy data
     tidy_rows = []
     for gemeente_idx in range(len(df_data)):
@@ -107,25 +116,14 @@ def process_rek_file(file_path, rapportjaar):
         if not is_flemish(raw_nis): continue
         nis_code = get_mapped_nis(raw_nis, rapportjaar)
 
-        for col_idx in range(1, len(df.columns)):
-            value = df_data.iloc[gemeente_idx, col_idx]
-            if pd.isna(value) or value == '': continue
+        # Skip empty, zero or negative values
+        for col_idx in (np.flatnonzero(values[gemeente_idx] > 0) + 1).tolist():
+            value_num = values[gemeente_idx, col_idx-1]
 
             # Extract metadata for this column
             col_meta = {k: v[col_idx-1] for k, v in metadata.items() if (col_idx-1) < len(v)}
             value_type = nis_code_header[col_idx-1]
 
-            # Converteer waarde
-            value_str = str(value).replace('.', '').replace(',', '.')
-            try:
-                value_num = float(value_str)
-            except:
-                continue
-
-            # Skip zero or negative values
-            if value_num <= 0:
-                continue
-
             # Filter for investments only in REK
             # Check if ANY Niveau field contains "Investering"
             is_investment = False
@@ -212,9 +210,12 @@ def process_bv_file(file_path, rapportjaar, chunk_size=200):
     all_chunks = []
     chunk_num = 0
 
-    for df_chunk in pd.read_csv(file_path, sep=';', skiprows=nis_row_idx+1, chunksize=chunk_size, header=None):
+    # Read as text, so '1.234' is parsed as a Belgian number and not as a float
+    for df_chunk in pd.read_csv(file_path, sep=';', skiprows=nis_row_idx+1, chunksize=chunk_size, header=None, dtype=str):
         chunk_num += 1
         tidy_rows = []
+        # Converteer waarden per kolom (lege of ongeldige cellen worden NaN)
+        values = df_chunk.iloc[:, 1:].apply(parse_belgian_numbers).to_numpy()
         for gemeente_idx in range(len(df_chunk)):
             raw_nis = str(df_chunk.iloc[gemeente_idx, 0]).split('.')[0]
             if not raw_nis.isdigit(): continue
@@ -222,25 +223,15 @@ def process_bv_file(file_path, rapportjaar, chunk_size=200):
             if not is_flemish(raw_nis): continue
             nis_code = get_mapped_nis(raw_nis, rapportjaar)
 
-            for col_idx in range(1, len(df_chunk.columns)):
-                value = df_chunk.iloc[gemeente_idx, col_idx]
-                if pd.isna(value) or value == '': continue
+            # Filter out empty, zero and negative values to drastically reduce data size
+            for col_idx in (np.flatnonzero(values[gemeente_idx] > 0) + 1).tolist():
+                value_num = values[gemeente_idx, col_idx-1]
 
                 meta_idx = col_idx - 1
                 
                 # Verify meta_idx is within bounds
                 if meta_idx >= len(nis_code_header): continue
 
-                value_str = str(value).replace('.', '').replace(',', '.')
-                try:
-                    value_num = float(value_str)
-                except:
-                    continue
-                
-                # Filter out zero values to drastically reduce data size
-                if value_num <= 0:
-                    continue
-
                 boekjaar = int(metadata.get('Boekjaar', [0]*len(df_chunk.columns))[meta_idx])
                 bv_domein = str(metadata.get('BV_domein', [None]*len(df_chunk.columns))[meta_idx])
                 bv_subdomein = str(metadata.get('BV_subdomein', [None]*len(df_chunk.columns))[meta_idx])
@@ -8,6 +8,7 @@ Data source: https://www.vlaanderen.be/statistiek-vlaanderen/bevolking/huishoude
 """
 
 import json
+import sys
 from pathlib import Path
 
 import pandas as pd
@@ -17,6 +18,10 @@ DATA_DIR = BASE_DIR / "data"
 RESULTS_DIR = BASE_DIR / "results"
 SHARED_DATA_DIR = BASE_DIR.parent.parent / "shared-data"
 
+sys.path.insert(0, str(SHARED_DATA_DIR))
+from nis_hierarchy import MUNICIPALITY, PROVINCE, nis_names, resolve_nis  # noqa: E402
+from result_sink import CSV, JSON, write_results  # noqa: E402
+
 INPUT_FILE = DATA_DIR / "huishoudens.csv"
 
 # Mapping household size categories (Dutch labels)
@@ -27,70 +32,6 @@ HOUSEHOLD_SIZE_LABELS = {
     "4+": "4+ personen",
 }
 
-# Province mapping based on NIS code prefix
-PROVINCE_MAP = {
-    11: {"code": "10000", "name": "Antwerpen"},
-    12: {"code": "10000", "name": "Antwerpen"},
-    13: {"code": "10000", "name": "Antwerpen"},
-    23: {"code": "20001", "name": "Vlaams-Brabant"},
-    24: {"code": "20001", "name": "Vlaams-Brabant"},
-    31: {"code": "30000", "name": "West-Vlaanderen"},
-    32: {"code": "30000", "name": "West-Vlaanderen"},
-    33: {"code": "30000", "name": "West-Vlaanderen"},
-    34: {"code": "30000", "name": "West-Vlaanderen"},
-    35: {"code": "30000", "name": "West-Vlaanderen"},
-    36: {"code": "30000", "name": "West-Vlaanderen"},
-    37: {"code": "30000", "name": "West-Vlaanderen"},
-    38: {"code": "30000", "name": "West-Vlaanderen"},
-    41: {"code": "40000", "name": "Oost-Vlaanderen"},
-    42: {"code": "40000", "name": "Oost-Vlaanderen"},
-    43: {"code": "40000", "name": "Oost-Vlaanderen"},
-    44: {"code": "40000", "name": "Oost-Vlaanderen"},
-    45: {"code": "40000", "name": "Oost-Vlaanderen"},
-    46: {"code": "40000", "name": "Oost-Vlaanderen"},
-    71: {"code": "70000", "name": "Limburg"},
-    72: {"code": "70000", "name": "Limburg"},
-    73: {"code": "70000", "name": "Limburg"},
-}
-
-
-def get_province_from_nis(nis: int) -> dict | None:
-    """Get province info from NIS code."""
-    prefix = nis // 1000
-    return PROVINCE_MAP.get(prefix)
-
-
-def load_municipality_names() -> dict[str, str]:
-    """Load municipality names from shared data."""
-    refnis_file = SHARED_DATA_DIR / "nis" / "refnis.csv"
-    if not refnis_file.exists():
-        return {}
-
-    df = pd.read_csv(refnis_file)
-    # Level 4 = municipalities
-    muni = df[df["LVL_REFNIS"] == 4][["CD_REFNIS", "TX_REFNIS_NL"]].copy()
-    muni["CD_REFNIS"] = muni["CD_REFNIS"].astype(str)
-    return dict(zip(muni["CD_REFNIS"], muni["TX_REFNIS_NL"]))
-
-
-def clean_for_json(records: list[dict]) -> list[dict]:
-    """Clean records for JSON serialization (handle NaN values)."""
-    cleaned = []
-    for r in records:
-        clean_r = {}
-        for k, v in r.items():
-            if pd.isna(v):
-                clean_r[k] = None
-            elif isinstance(v, (int, float)) and not isinstance(v, bool):
-                if v != v:  # NaN check
-                    clean_r[k] = None
-                else:
-                    clean_r[k] = int(v) if float(v).is_integer() else float(v)
-            else:
-                clean_r[k] = v
-        cleaned.append(clean_r)
-    return cleaned
-
 
 def process_data() -> None:
     """Main data processing function."""
@@ -105,12 +46,10 @@ def process_data() -> None:
     df["aantal"] = pd.to_numeric(df["aantal"], errors="coerce").astype("Int64")
 
     # Add province code
-    df["province_code"] = df["niscode"].apply(
-        lambda x: get_province_from_nis(int(x))["code"] if get_province_from_nis(int(x)) else None
-    )
+    df["province_code"] = resolve_nis(df["niscode"], PROVINCE)
 
     # Load municipality names
-    muni_names = load_municipality_names()
+    muni_names = nis_names(MUNICIPALITY)
 
     # ============================================================
     # 1. Municipality-level data (gemeente niveau)
@@ -144,9 +83,7 @@ def process_data() -> None:
     muni_totals["name"] = muni_totals["nis"].map(muni_names)
 
     # Add province code to municipality totals
-    muni_totals["p"] = muni_totals["nis"].apply(
-        lambda x: get_province_from_nis(int(x))["code"] if get_province_from_nis(int(x)) else None
-    )
+    muni_totals["p"] = resolve_nis(muni_totals["nis"], PROVINCE)
 
     # ============================================================
     # 2. Province-level aggregates
@@ -254,57 +191,20 @@ def process_data() -> None:
     # 6. Write output files
     # ============================================================
 
-    # Detailed data by household size
-    muni_detail_records = clean_for_json(muni_detail.to_dict(orient="records"))
-    prov_detail_records = clean_for_json(prov_detail.to_dict(orient="records"))
-    region_detail_records = clean_for_json(region_detail.to_dict(orient="records"))
-
-    # Total data with growth rates
-    muni_records = clean_for_json(muni_totals.to_dict(orient="records"))
-    prov_records = clean_for_json(prov_totals.to_dict(orient="records"))
-    region_records = clean_for_json(region_totals.to_dict(orient="records"))
-
-    # Write JSON files
-    (RESULTS_DIR / "municipalities.json").write_text(
-        json.dumps(muni_records, ensure_ascii=False, separators=(",", ":")),
-        encoding="utf-8",
-    )
-
-    (RESULTS_DIR / "municipalities_by_size.json").write_text(
-        json.dumps(muni_detail_records, ensure_ascii=False, separators=(",", ":")),
-        encoding="utf-8",
-    )
-
-    (RESULTS_DIR / "provinces.json").write_text(
-        json.dumps(prov_records, ensure_ascii=False, separators=(",", ":")),
-        encoding="utf-8",
-    )
-
-    (RESULTS_DIR / "provinces_by_size.json").write_text(
-        json.dumps(prov_detail_records, ensure_ascii=False, separators=(",", ":")),
-        encoding="utf-8",
-    )
-
-    (RESULTS_DIR / "region.json").write_text(
-        json.dumps(region_records, ensure_ascii=False, separators=(",", ":")),
-        encoding="utf-8",
-    )
-
-    (RESULTS_DIR / "region_by_size.json").write_text(
-        json.dumps(region_detail_records, ensure_ascii=False, separators=(",", ":")),
-        encoding="utf-8",
-    )
+    write_results({
+        "municipalities": (muni_totals, (JSON, CSV)),
+        "municipalities_by_size": (muni_detail, (JSON,)),
+        "provinces": (prov_totals, (JSON, CSV)),
+        "provinces_by_size": (prov_detail, (JSON,)),
+        "region": (region_totals, (JSON, CSV)),
+        "region_by_size": (region_detail, (JSON,)),
+    }, RESULTS_DIR)
 
     (RESULTS_DIR / "lookups.json").write_text(
         json.dumps(lookups, ensure_ascii=False, separators=(",", ":")),
         encoding="utf-8",
     )
 
-    # Write CSV files
-    muni_totals.to_csv(RESULTS_DIR / "municipalities.csv", index=False)
-    prov_totals.to_csv(RESULTS_DIR / "provinces.csv", index=False)
-    region_totals.to_csv(RESULTS_DIR / "region.csv", index=False)
-
     # Metadata
     years = sorted(df["jaar"].dropna().unique().tolist())
     metadata = {
@@ -1,6 +1,7 @@
 import json
 import os
 import re
+import sys
 import zipfile
 from pathlib import Path
 
@@ -13,6 +14,15 @@ RESULTS_DIR = BASE_DIR / "results"
 CONTENT_FILE = BASE_DIR / "content.mdx"
 METADATA_XLSX = DATA_DIR / "metadata-VAR_VAT_SURVIVALS.xlsx"
 OUTPUT_METADATA_FILE = RESULTS_DIR / "metadata.json"
+SHARED_DATA_DIR = BASE_DIR.parent.parent / "shared-data"
+
+sys.path.insert(0, str(SHARED_DATA_DIR))
+from parquet_cache import CACHE_DIR_NAME, load_or_parse  # noqa: E402
+from statbel_schema import CATEGORY, NACE_SECTIONS, PROVINCE_CODES, REGION_CODES, apply_schema, to_category  # noqa: E402
+
+CACHE_DIR = DATA_DIR / CACHE_DIR_NAME
+# Version of read_input in the parquet cache key; bump it when the parsed frame changes
+PARSE_VERSION = 2
 
 DEFAULT_INPUT_URL = "https://statbel.fgov.be/sites/default/files/files/opendata/TF_VAT_SURVIVAL/TF_VAT_SURVIVALS.zip"
 DEFAULT_ZIP_NAME = "TF_VAT_SURVIVALS.zip"
@@ -26,6 +36,16 @@ COUNT_COLS = [
     "MS_CNT_SURV_YEAR_5",
 ]
 
+# Dimension types of TF_VAT_SURVIVALS (see shared-data/statbel_schema.py)
+SCHEMA = {
+    "CD_RGN_REFNIS": (CATEGORY, REGION_CODES),
+    "CD_PROV_REFNIS": (CATEGORY, PROVINCE_CODES),
+    "CD_NACE_LVL1": (CATEGORY, NACE_SECTIONS),
+    "CD_NACE_LVL2": (CATEGORY, ()),
+    "CD_LGL_CO_TYP": (CATEGORY, ()),
+    "CD_CLS_WRKR": (CATEGORY, ()),
+}
+
 
 def update_mdx_frontmatter_date(path: Path, date_str: str) -> bool:
     if not path.exists():
@@ -146,42 +166,44 @@ def process_data() -> None:
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     RESULTS_DIR.mkdir(parents=True, exist_ok=True)
 
-    txt_path: Path | None = None
     if input_file_path and Path(input_file_path).exists():
-        p = Path(input_file_path)
-        if p.suffix.lower() == ".zip":
-            txt_path = extract_txt_from_zip(p, DATA_DIR)
-        else:
-            txt_path = p
+        source = Path(input_file_path)
     else:
-        zip_path = DATA_DIR / input_filename
-        download_input_zip(input_url, zip_path)
-        txt_path = extract_txt_from_zip(zip_path, DATA_DIR)
-
-    df = pd.read_csv(
-        txt_path,
-        sep="|",
-        encoding="utf-8-sig",
-        dtype=str,
-        low_memory=False,
-    )
+        source = DATA_DIR / input_filename
+        download_input_zip(input_url, source)
+
+    def read_input() -> pd.DataFrame:
+        txt_path = extract_txt_from_zip(source, DATA_DIR) if source.suffix.lower() == ".zip" else source
+
+        df = pd.read_csv(
+            txt_path,
+            sep="|",
+            encoding="utf-8-sig",
+            dtype=str,
+            low_memory=False,
+        )
 
-    def normalize_refnis_region(code: str | None) -> str | None:
-        if code is None:
-            return None
-        s = str(code).strip()
-        if not s:
-            return None
-        if s.isdigit():
-            s = s.lstrip("0") or "0"
-        return s
+        def normalize_refnis_region(code: str | None) -> str | None:
+            if code is None:
+                return None
+            s = str(code).strip()
+            if not s:
+                return None
+            if s.isdigit():
+                s = s.lstrip("0") or "0"
+            return s
+
+        # Normalize each distinct code once; the schema below re-encodes the result
+        df["CD_RGN_REFNIS"] = to_category(df["CD_RGN_REFNIS"]).map(normalize_refnis_region)
 
-    df["CD_RGN_REFNIS"] = df["CD_RGN_REFNIS"].map(normalize_refnis_region)
+        for c in COUNT_COLS:
+            df[c] = pd.to_numeric(df[c], errors="coerce")
 
-    for c in COUNT_COLS:
-        df[c] = pd.to_numeric(df[c], errors="coerce")
+        df["CD_YEAR"] = pd.to_numeric(df["CD_YEAR"], errors="coerce").astype("Int64")
+        return apply_schema(df, SCHEMA)
 
-    df["CD_YEAR"] = pd.to_numeric(df["CD_YEAR"], errors="coerce").astype("Int64")
+    # Parsed, typed frame is cached by the SHA-256 of the downloaded archive
+    df = load_or_parse(source, read_input, CACHE_DIR, "TF_VAT_SURVIVALS", PARSE_VERSION)
 
     max_year = int(df["CD_YEAR"].max())
     update_mdx_frontmatter_date(CONTENT_FILE, f"{max_year}-12-31")
@@ -189,7 +211,7 @@ def process_data() -> None:
     group_cols = ["CD_YEAR", "CD_RGN_REFNIS", "CD_PROV_REFNIS", "CD_NACE_LVL1"]
     grouped = (
         df[group_cols + COUNT_COLS]
-        .groupby(group_cols, dropna=False)[COUNT_COLS]
+        .groupby(group_cols, dropna=False, observed=True)[COUNT_COLS]
         .sum(min_count=1)
         .reset_index()
     )
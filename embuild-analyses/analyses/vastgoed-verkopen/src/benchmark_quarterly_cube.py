@@ -0,0 +1,68 @@
+"""
+Benchmark loading the quarterly data from quarterly.json vs quarterly_cube.bin.
+
+Both paths end with the n/p50/p25/p75 values in NumPy arrays:
+- json: json.load of quarterly.json, then one array per field
+- cube: read_quarterly_cube (header JSON + typed-array views on the .bin)
+
+Run after process_data.py:
+
+    python benchmark_quarterly_cube.py [--repeat 5]
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from quarterly_cube import COUNT_FIELDS, CUBE_NAME, PRICE_FIELDS, read_quarterly_cube
+
+RESULTS_DIR = Path(__file__).resolve().parent.parent / "results"
+
+
+def load_json(path: Path) -> dict[str, np.ndarray]:
+    with open(path, encoding="utf-8") as f:
+        records = json.load(f)
+    arrays = {field: np.array([r[field] for r in records], dtype=np.int32) for field in COUNT_FIELDS}
+    for field in PRICE_FIELDS:
+        arrays[field] = np.array([r[field] for r in records], dtype=np.float64)
+    return arrays
+
+
+def load_cube(path: Path) -> dict[str, np.ndarray]:
+    return read_quarterly_cube(path)[1]
+
+
+def best_of(load, path: Path, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load(path)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--results", type=Path, default=RESULTS_DIR)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    json_path = args.results / "quarterly.json"
+    header_path = args.results / f"{CUBE_NAME}.json"
+    bin_path = args.results / f"{CUBE_NAME}.bin"
+
+    json_time = best_of(load_json, json_path, args.repeat)
+    cube_time = best_of(load_cube, header_path, args.repeat)
+
+    json_mb = json_path.stat().st_size / 1024 / 1024
+    cube_mb = (header_path.stat().st_size + bin_path.stat().st_size) / 1024 / 1024
+    print(f"json: {json_time * 1000:8.1f} ms  {json_mb:6.2f} MB")
+    print(f"cube: {cube_time * 1000:8.1f} ms  {cube_mb:6.2f} MB")
+    print(f"speedup: {json_time / cube_time:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+Transaction-weighted price percentiles for rolled-up geographies.
+
+Statbel publishes P25/P50/P75 prices per municipality, province, region and
+Belgium. Averaging those medians over a group of rows ignores how many
+transactions each row stands for and is not a median of the combined
+market. This module approximates the percentiles of the combined sales
+instead:
+
+- Every member (row or cube cell) with transactions and all three knots is
+  modelled as a piecewise-linear CDF through (P0, 0), (P25, .25), (P50, .5),
+  (P75, .75), (P100, 1). The tails mirror the inner quartile segments:
+  P0 = max(0, 2 * P25 - P50) and P100 = 2 * P75 - P50.
+- A group's CDF is the transaction-weighted mixture of its members' CDFs,
+  which is again piecewise linear; its P25/P50/P75 are read off by inverting
+  it exactly between breakpoints.
+- A group with a single complete member keeps that member's knots. A group
+  without complete members (Statbel leaves percentiles empty for small
+  counts) falls back to the transaction-weighted mean of the knots that are
+  there.
+
+All groups are solved together with sorted breakpoint arrays, without a
+Python loop over groups:
+
+    percentiles = rollup_percentiles(counts, knots, group_ids, group_count)
+
+`group_percentiles` applies this to a pandas groupby and `rollup_cube` to
+user-defined groupings of the quarterly cube (see quarterly_cube.py), e.g.
+arrondissements, centrumsteden or municipalities merged in 2025.
+"""
+
+from collections.abc import Iterable
+
+import numpy as np
+
+from quarterly_cube import COUNT_FIELDS, MISSING_COUNT
+
+QUANTILES = (0.25, 0.5, 0.75)
+
+# Quantile levels of the piecewise-linear member CDF (tails included)
+_LEVELS = np.array([0.0, 0.25, 0.5, 0.75, 1.0])
+
+# Tolerance on the CDF when looking up a quantile, so knots shared by all
+# members are returned as-is
+_EPS = 1e-12
+
+
+def _weighted_mean_knots(counts, knots, groups, group_count) -> np.ndarray:
+    out = np.full((group_count, knots.shape[1]), np.nan)
+    for j in range(knots.shape[1]):
+        finite = np.isfinite(knots[:, j])
+        g, k, w = groups[finite], knots[finite, j], counts[finite]
+        members = np.bincount(g, minlength=group_count)
+        total = np.bincount(g, weights=k, minlength=group_count)
+        weight = np.bincount(g, weights=w, minlength=group_count)
+        weighted = np.bincount(g, weights=w * k, minlength=group_count)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            value = np.where(weight > 0, weighted / weight, total / members)
+        # A single value is kept exactly
+        out[:, j] = np.select([members == 1, members > 1], [total, value], np.nan)
+    return out
+
+
+def _mixture_quantiles(counts, knots, groups) -> tuple[np.ndarray, np.ndarray]:
+    """Quantiles of the weighted mixture of member CDFs, for every group in `groups`."""
+    inner = np.sort(knots, axis=1)
+    lower = np.maximum(2 * inner[:, 0] - inner[:, 1], 0.0)
+    upper = 2 * inner[:, 2] - inner[:, 1]
+    points = np.column_stack([np.minimum(lower, inner[:, 0]), inner, upper])
+
+    # Each member puts a quarter of its weight, normalised per group, on every segment
+    group_weight = np.bincount(groups, weights=counts)
+    mass = 0.25 * counts / group_weight[groups]
+
+    width = np.diff(points, axis=1)
+    sloped = width > 0
+    slope = np.where(sloped, mass[:, None] / np.where(sloped, width, 1.0), 0.0)
+
+    # One breakpoint event per knot: the change in slope there, and a point
+    # mass for an empty segment starting there
+    zeros = np.zeros((len(points), 1))
+    dslope = (np.hstack([slope, zeros]) - np.hstack([zeros, slope])).ravel()
+    jump = np.hstack([np.where(sloped, 0.0, mass[:, None]), zeros]).ravel()
+    x = points.ravel()
+    event_groups = np.repeat(groups, points.shape[1])
+
+    # Sorted by group, then by price (two passes beat lexsort on floats)
+    order = np.argsort(x)
+    order = order[np.argsort(event_groups[order], kind="stable")]
+    x, event_groups, dslope, jump = x[order], event_groups[order], dslope[order], jump[order]
+    starts = np.r_[True, event_groups[1:] != event_groups[:-1]]
+    start_idx = np.flatnonzero(starts)
+    sizes = np.diff(np.r_[start_idx, len(x)])
+
+    def group_cumsum(values):
+        total = np.cumsum(values)
+        return total - np.repeat(total[start_idx] - values[start_idx], sizes)
+
+    slope_after = group_cumsum(dslope)
+    slope_before = np.where(starts, 0.0, np.r_[0.0, slope_after[:-1]])
+    dx = np.where(starts, 0.0, np.r_[0.0, np.diff(x)])
+    increment = slope_before * dx + jump
+    cdf = group_cumsum(increment)
+
+    # CDF values are in [0, 1]; offsetting each group by twice its rank makes
+    # them sorted over all groups, so every quantile is one searchsorted
+    ranks = np.cumsum(starts) - 1
+    key = cdf + 2.0 * ranks
+    solved = event_groups[start_idx]
+    out = np.empty((len(solved), len(QUANTILES)))
+    for j, q in enumerate(QUANTILES):
+        k = np.searchsorted(key, q - _EPS + 2.0 * np.arange(len(solved)), side="left")
+        k = np.minimum(k, len(x) - 1)
+        before = np.maximum(k - 1, 0)
+        left_cdf = cdf[k] - jump[k]
+        within = (left_cdf >= q - _EPS) & ~starts[k] & (slope_before[k] > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            interpolated = x[before] + (q - cdf[before]) / slope_before[k]
+        out[:, j] = np.where(within, np.minimum(interpolated, x[k]), x[k])
+    return solved, out
+
+
+def rollup_percentiles(
+    counts: np.ndarray,
+    knots: np.ndarray,
+    groups: np.ndarray,
+    group_count: int,
+) -> np.ndarray:
+    """Transaction-weighted P25/P50/P75 of every group.
+
+    Args:
+        counts: Transactions per member (M,); NaN and negative counts weigh 0.
+        knots: P25, P50, P75 per member (M, 3); NaN where not published.
+        groups: Group number of every member (M,), in [0, group_count).
+        group_count: Number of groups.
+
+    Returns:
+        (group_count, 3) array of P25, P50, P75; NaN for groups without any
+        published percentile.
+    """
+    counts = np.nan_to_num(np.asarray(counts, dtype=np.float64), nan=0.0).clip(min=0)
+    knots = np.asarray(knots, dtype=np.float64)
+    groups = np.asarray(groups, dtype=np.int64)
+
+    out = _weighted_mean_knots(counts, knots, groups, group_count)
+
+    complete = np.isfinite(knots).all(axis=1) & (counts > 0)
+    members = np.bincount(groups[complete], minlength=group_count)
+
+    single = complete & (members[groups] == 1)
+    out[groups[single]] = knots[single]
+
+    mixed = complete & (members[groups] > 1)
+    if mixed.any():
+        solved, values = _mixture_quantiles(counts[mixed], knots[mixed], groups[mixed])
+        out[solved] = values
+    return out
+
+
+def group_percentiles(grouped, count: str, knots: list[str]) -> np.ndarray:
+    """rollup_percentiles for a DataFrameGroupBy, in the order of its aggregates.
+
+    `count` is the transactions column and `knots` the P25, P50 and P75
+    columns of the grouped frame.
+    """
+    frame = grouped.obj
+    return rollup_percentiles(
+        frame[count].to_numpy(dtype=np.float64, na_value=np.nan),
+        frame[knots].to_numpy(dtype=np.float64, na_value=np.nan),
+        grouped.ngroup().to_numpy(),
+        grouped.ngroups,
+    )
+
+
+def rollup_cube(
+    header: dict,
+    arrays: dict[str, np.ndarray],
+    groups: dict[str, Iterable[str]],
+    level: int,
+    names: dict[str, str] | None = None,
+) -> tuple[dict, dict[str, np.ndarray]]:
+    """Cube of user-defined groups of the entities of a quarterly cube.
+
+    `groups` maps a group code to the NIS codes of its members (entities of
+    `header`; a code may be in several groups). The result has the layout of
+    read_quarterly_cube with one entity per group at geo level `level`:
+    summed counts and rolled-up percentiles, rounded to whole euros.
+    """
+    entity_pos = {nis: i for i, nis in enumerate(header["entities"]["nis"])}
+    missing = sorted({nis for members in groups.values() for nis in members if nis not in entity_pos})
+    if missing:
+        raise KeyError(f"NIS codes not in the cube: {missing}")
+
+    pairs = [(entity_pos[nis], g) for g, members in enumerate(groups.values()) for nis in members]
+    member_entities = np.array([e for e, _ in pairs], dtype=np.int64)
+    member_groups = np.array([g for _, g in pairs], dtype=np.int64)
+
+    _, types, quarters = header["shape"]
+    cells = types * quarters
+    count_field = COUNT_FIELDS[0]
+    counts = arrays[count_field].reshape(len(entity_pos), cells)[member_entities].ravel()
+    cell_groups = (member_groups[:, None] * cells + np.arange(cells)).ravel()
+    present = counts != MISSING_COUNT
+
+    group_count = len(groups) * cells
+    n = np.bincount(cell_groups[present], weights=counts[present], minlength=group_count)
+    has_record = np.bincount(cell_groups[present], minlength=group_count) > 0
+
+    price_fields = [f"p{int(q * 100)}" for q in QUANTILES]
+    knots = np.column_stack([
+        arrays[field].reshape(len(entity_pos), cells)[member_entities].ravel() for field in price_fields
+    ])
+    percentiles = rollup_percentiles(counts[present], knots[present], cell_groups[present], group_count)
+
+    shape = (len(groups), types, quarters)
+    out = {count_field: np.where(has_record, n, MISSING_COUNT).astype("<i4").reshape(shape)}
+    for j, field in enumerate(price_fields):
+        out[field] = np.round(percentiles[:, j]).astype("<f4").reshape(shape)
+
+    codes = list(groups)
+    rolled = {
+        **header,
+        "shape": list(shape),
+        "entities": {
+            "lvl": [level] * len(codes),
+            "nis": codes,
+            "name": [(names or {}).get(code) for code in codes],
+        },
+    }
+    rolled["arrays"] = [
+        {**entry, "offset": i * int(np.prod(shape)) * 4} for i, entry in enumerate(header["arrays"])
+    ]
+    rolled["bytes"] = len(rolled["arrays"]) * int(np.prod(shape)) * 4
+    return rolled, {entry["name"]: out[entry["name"]] for entry in header["arrays"]}
+
@@ -8,16 +8,36 @@ aggregated JSON/CSV files for the blog dashboard.
 import json
 import os
 import re
+import sys
 import zipfile
 from pathlib import Path
 
 import pandas as pd
 import requests
 
+from percentile_rollup import group_percentiles
+from quarterly_cube import cube_records, write_quarterly_cube
+from series_files import SERIES_DIR_NAME, write_series_files
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR / "data"
 RESULTS_DIR = BASE_DIR / "results"
 CONTENT_FILE = BASE_DIR / "content.mdx"
+SHARED_DATA_DIR = BASE_DIR.parent.parent / "shared-data"
+
+sys.path.insert(0, str(SHARED_DATA_DIR))
+from json_records import record_columns  # noqa: E402
+from nis_hierarchy import normalize_nis_codes  # noqa: E402
+from parquet_cache import CACHE_DIR_NAME, load_or_build_json, load_or_parse  # noqa: E402
+from result_sink import CSV, JSON, write_results  # noqa: E402
+from statbel_schema import CATEGORY, apply_schema, to_category  # noqa: E402
+from txt_stream import FLOAT, INT, STR, read_txt  # noqa: E402
+
+CACHE_DIR = DATA_DIR / CACHE_DIR_NAME
+# Version of read_input in the parquet cache key; bump it when the parsed frame changes
+PARSE_VERSION = 3
+# Version of build_lookups and the aggregates it reads; bump it when lookups.json changes
+LOOKUPS_VERSION = 1
 
 DEFAULT_INPUT_URL = "https://statbel.fgov.be/sites/default/files/files/opendata/immo/vastgoed_2010_9999.zip"
 DEFAULT_ZIP_NAME = "vastgoed_2010_9999.zip"
@@ -30,6 +50,14 @@ PROPERTY_TYPES = {
     "Appartementen": "appartementen",
 }
 
+# Dimension types of the transaction table (see shared-data/statbel_schema.py)
+SCHEMA = {
+    "CD_REFNIS": (CATEGORY, ()),
+    "CD_REFNIS_NL": (CATEGORY, ()),
+    "CD_TYPE_NL": (CATEGORY, tuple(PROPERTY_TYPES)),
+    "CD_PERIOD": (CATEGORY, ()),
+}
+
 # NIS code levels
 # 1 = Belgium, 2 = Region, 3 = Province, 4 = Arrondissement, 5 = Municipality
 LEVEL_BELGIUM = 1
@@ -38,6 +66,29 @@ LEVEL_PROVINCE = 3
 LEVEL_ARRONDISSEMENT = 4
 LEVEL_MUNICIPALITY = 5
 
+# Columns read from the TXT and their types (see shared-data/txt_stream.py)
+INPUT_COLUMNS = {
+    "CD_YEAR": INT,
+    "CD_TYPE_NL": STR,
+    "CD_REFNIS": STR,
+    "CD_REFNIS_NL": STR,
+    "CD_PERIOD": STR,
+    "MS_TOTAL_TRANSACTIONS": INT,
+    "MS_P_25": FLOAT,
+    "MS_P_50_median": FLOAT,
+    "MS_P_75": FLOAT,
+    "CD_niveau_refnis": INT,
+}
+
+# P25, P50 and P75 price columns, re-aggregated with percentile_rollup.py
+PERCENTILE_COLUMNS = ["MS_P_25", "MS_P_50_median", "MS_P_75"]
+
+# Rows outside these periods and geo levels are dropped while reading
+INPUT_FILTERS = {
+    "CD_PERIOD": {"Y", "Q1", "Q2", "Q3", "Q4"},
+    "CD_niveau_refnis": {LEVEL_BELGIUM, LEVEL_REGION, LEVEL_PROVINCE, LEVEL_MUNICIPALITY},
+}
+
 
 def update_mdx_frontmatter_date(path: Path, date_str: str) -> bool:
     """Update the date field in MDX frontmatter."""
@@ -126,67 +177,26 @@ def extract_txt_from_zip(zip_path: Path, extract_dir: Path) -> Path:
         return extract_dir / Path(chosen).name
 
 
-def normalize_nis_code(code: str | int | None) -> str | None:
-    """Normalize NIS codes to consistent string format."""
-    if code is None or pd.isna(code):
-        return None
-    s = str(int(float(code))) if isinstance(code, (float, int)) else str(code).strip()
-    return s if s else None
-
-
-def map_nis_to_region(nis: str | None) -> str | None:
-    """Map NIS code to region code (2000, 3000, 4000)."""
-    if not nis:
-        return None
-    try:
-        code = int(nis)
-    except ValueError:
-        return None
-
-    # Flanders: 10000-49999 -> 2000
-    if 10000 <= code < 50000:
-        return "2000"
-    # Wallonia: 50000-99999 -> 3000
-    if 50000 <= code < 100000:
-        return "3000"
-    # Brussels: 21000-21999 -> 4000
-    if 21000 <= code < 22000:
-        return "4000"
-    # Already a region code
-    if code in [1000, 2000, 3000, 4000]:
-        return str(code)
-    return None
-
-
-def map_nis_to_province(nis: str | None) -> str | None:
-    """Map municipality NIS code to province code."""
-    if not nis:
-        return None
-    try:
-        code = int(nis)
-    except ValueError:
-        return None
-
-    # Province codes are 5 digits starting with 1-4 + 0000
-    # e.g., Antwerpen = 10000, Limburg = 70000, etc.
-    province_map = {
-        range(10000, 13000): "10000",  # Antwerpen
-        range(20000, 25000): "20001",  # Vlaams-Brabant
-        range(30000, 35000): "30000",  # West-Vlaanderen
-        range(40000, 45000): "40000",  # Oost-Vlaanderen
-        range(70000, 73000): "70000",  # Limburg
-        range(21000, 22000): "21000",  # Brussels
-        range(25000, 29000): "20002",  # Waals-Brabant
-        range(50000, 53000): "50000",  # Henegouwen
-        range(55000, 58000): "55000",  # Namen
-        range(60000, 65000): "60000",  # Luik
-        range(80000, 85000): "80000",  # Luxemburg
-    }
+def build_lookups(*frames: pd.DataFrame) -> dict:
+    """Property types and the geographic entities per level of the aggregated frames."""
+    # Deduplicate per frame first; only the few distinct entities are concatenated
+    geo = pd.concat([f[["lvl", "nis", "name"]].drop_duplicates().astype(object) for f in frames], ignore_index=True)
+    geo = geo.drop_duplicates().sort_values(["lvl", "nis"], kind="stable")
+    geo["name"] = geo["name"].where(geo["name"].notna(), None)
+
+    def entities(level: int) -> list[dict]:
+        rows = geo[geo["lvl"] == level]
+        return [{"code": code, "name": name} for code, name in zip(rows["nis"], rows["name"])]
 
-    for r, prov in province_map.items():
-        if code in r:
-            return prov
-    return None
+    return {
+        "property_types": [
+            {"code": v, "nl": k}
+            for k, v in PROPERTY_TYPES.items()
+        ],
+        "regions": entities(LEVEL_REGION),
+        "provinces": entities(LEVEL_PROVINCE),
+        "municipalities": entities(LEVEL_MUNICIPALITY),
+    }
 
 
 def process_data() -> None:
@@ -198,39 +208,27 @@ def process_data() -> None:
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     RESULTS_DIR.mkdir(parents=True, exist_ok=True)
 
-    txt_path: Path | None = None
     if input_file_path and Path(input_file_path).exists():
-        p = Path(input_file_path)
-        if p.suffix.lower() == ".zip":
-            txt_path = extract_txt_from_zip(p, DATA_DIR)
-        else:
-            txt_path = p
+        source = Path(input_file_path)
     else:
-        zip_path = DATA_DIR / input_filename
-        download_input_zip(input_url, zip_path)
-        txt_path = extract_txt_from_zip(zip_path, DATA_DIR)
-
-    # Read data with latin-1 encoding for special characters
-    df = pd.read_csv(
-        txt_path,
-        sep="|",
-        encoding="latin-1",
-        dtype=str,
-        low_memory=False,
-    )
+        source = DATA_DIR / input_filename
+        download_input_zip(input_url, source)
+
+    def read_input() -> pd.DataFrame:
+        txt_path = extract_txt_from_zip(source, DATA_DIR) if source.suffix.lower() == ".zip" else source
 
-    # Normalize NIS codes
-    df["CD_REFNIS"] = df["CD_REFNIS"].apply(normalize_nis_code)
-    df["CD_niveau_refnis"] = pd.to_numeric(df["CD_niveau_refnis"], errors="coerce").astype("Int64")
+        # Only the used columns, typed while parsing, and only the rows the
+        # aggregates below use (latin-1 encoding for special characters)
+        df = read_txt(txt_path, INPUT_COLUMNS, INPUT_FILTERS, sep="|", encoding="latin-1")
 
-    # Convert numeric columns
-    for col in ["MS_TOTAL_TRANSACTIONS", "MS_P_25", "MS_P_50_median", "MS_P_75"]:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
+        df["CD_REFNIS"] = normalize_nis_codes(df["CD_REFNIS"])
+        return apply_schema(df, SCHEMA)
 
-    df["CD_YEAR"] = pd.to_numeric(df["CD_YEAR"], errors="coerce").astype("Int64")
+    # Parsed, typed frame is cached by the SHA-256 of the downloaded archive
+    df = load_or_parse(source, read_input, CACHE_DIR, "vastgoed", PARSE_VERSION)
 
     # Map property types to short codes
-    df["property_type"] = df["CD_TYPE_NL"].map(PROPERTY_TYPES)
+    df["property_type"] = to_category(df["CD_TYPE_NL"].map(PROPERTY_TYPES), tuple(PROPERTY_TYPES.values()))
 
     # Update MDX date to latest quarter/year in data
     max_year = int(df["CD_YEAR"].max())
@@ -259,14 +257,18 @@ def process_data() -> None:
     ].copy()
 
     # Aggregate by year, geo level, NIS code, and property type
-    yearly_agg = yearly_df.groupby(
+    yearly_grouped = yearly_df.groupby(
         ["CD_YEAR", "CD_niveau_refnis", "CD_REFNIS", "property_type"],
-        dropna=False
-    ).agg({
+        dropna=False,
+        observed=True,
+    )
+    yearly_agg = yearly_grouped.agg({
         "MS_TOTAL_TRANSACTIONS": "sum",
-        "MS_P_50_median": "mean",  # Average of median prices
         "CD_REFNIS_NL": "first",
-    }).reset_index()
+    })
+    # Transaction-weighted median of the combined rows (see percentile_rollup.py)
+    yearly_agg["MS_P_50_median"] = group_percentiles(yearly_grouped, "MS_TOTAL_TRANSACTIONS", PERCENTILE_COLUMNS)[:, 1]
+    yearly_agg = yearly_agg[["MS_TOTAL_TRANSACTIONS", "MS_P_50_median", "CD_REFNIS_NL"]].reset_index()
 
     # Rename columns for compact JSON
     yearly_agg = yearly_agg.rename(columns={
@@ -291,16 +293,26 @@ def process_data() -> None:
     # Extract quarter number
     quarterly_df["quarter"] = quarterly_df["CD_PERIOD"].str.extract(r"Q(\d)").astype(int)
 
-    quarterly_agg = quarterly_df.groupby(
-        ["CD_YEAR", "quarter", "CD_niveau_refnis", "CD_REFNIS", "property_type"],
-        dropna=False
-    ).agg({
+    # Grouped per geographic entity first, so quarterly.json lists each entity's
+    # records contiguously and scripts/chunk-vastgoed-data.py can stream it
+    quarterly_grouped = quarterly_df.groupby(
+        ["CD_niveau_refnis", "CD_REFNIS", "CD_YEAR", "quarter", "property_type"],
+        dropna=False,
+        observed=True,
+    )
+    quarterly_agg = quarterly_grouped.agg({
         "MS_TOTAL_TRANSACTIONS": "sum",
-        "MS_P_50_median": "mean",
-        "MS_P_25": "mean",
-        "MS_P_75": "mean",
         "CD_REFNIS_NL": "first",
-    }).reset_index()
+    })
+    quarterly_agg[PERCENTILE_COLUMNS] = group_percentiles(
+        quarterly_grouped, "MS_TOTAL_TRANSACTIONS", PERCENTILE_COLUMNS
+    )
+    quarterly_agg = quarterly_agg[
+        ["MS_TOTAL_TRANSACTIONS", "MS_P_50_median", "MS_P_25", "MS_P_75", "CD_REFNIS_NL"]
+    ].reset_index()
+    quarterly_agg = quarterly_agg[
+        ["CD_YEAR", "quarter", "CD_niveau_refnis", "CD_REFNIS", "property_type", *quarterly_agg.columns[5:]]
+    ]
 
     quarterly_agg = quarterly_agg.rename(columns={
         "CD_YEAR": "y",
@@ -319,74 +331,38 @@ def process_data() -> None:
     for col in ["p50", "p25", "p75"]:
         quarterly_agg[col] = quarterly_agg[col].round(0)
 
-    # 3. Create lookups for geographic entities
-    geo_lookup = df[
-        df["CD_niveau_refnis"].isin([LEVEL_BELGIUM, LEVEL_REGION, LEVEL_PROVINCE, LEVEL_MUNICIPALITY])
-    ][["CD_REFNIS", "CD_REFNIS_NL", "CD_niveau_refnis"]].drop_duplicates()
-
-    lookups = {
-        "property_types": [
-            {"code": v, "nl": k}
-            for k, v in PROPERTY_TYPES.items()
-        ],
-        "regions": [
-            {"code": row["CD_REFNIS"], "name": row["CD_REFNIS_NL"]}
-            for _, row in geo_lookup[geo_lookup["CD_niveau_refnis"] == LEVEL_REGION].iterrows()
-        ],
-        "provinces": [
-            {"code": row["CD_REFNIS"], "name": row["CD_REFNIS_NL"]}
-            for _, row in geo_lookup[geo_lookup["CD_niveau_refnis"] == LEVEL_PROVINCE].iterrows()
-        ],
-        "municipalities": [
-            {"code": row["CD_REFNIS"], "name": row["CD_REFNIS_NL"]}
-            for _, row in geo_lookup[geo_lookup["CD_niveau_refnis"] == LEVEL_MUNICIPALITY].iterrows()
-        ],
-    }
+    # 3. Lookups for geographic entities, rebuilt only when the source, the parse
+    # or the lookups builder changed
+    lookups = load_or_build_json(
+        source, lambda: build_lookups(yearly_agg, quarterly_agg), CACHE_DIR, "vastgoed-lookups",
+        f"{PARSE_VERSION}.{LOOKUPS_VERSION}",
+    )
 
     # ============================================================
     # Write output files
     # ============================================================
 
-    # Clean up NaN values for JSON serialization
-    def clean_for_json(records):
-        cleaned = []
-        for r in records:
-            clean_r = {}
-            for k, v in r.items():
-                if pd.isna(v):
-                    clean_r[k] = None
-                elif isinstance(v, (int, float)) and not isinstance(v, bool):
-                    if v != v:  # Check for NaN
-                        clean_r[k] = None
-                    else:
-                        clean_r[k] = int(v) if float(v).is_integer() else float(v)
-                else:
-                    clean_r[k] = v
-            cleaned.append(clean_r)
-        return cleaned
-
-    yearly_records = clean_for_json(yearly_agg.to_dict(orient="records"))
-    quarterly_records = clean_for_json(quarterly_agg.to_dict(orient="records"))
-
-    (RESULTS_DIR / "yearly.json").write_text(
-        json.dumps(yearly_records, ensure_ascii=False, separators=(",", ":")),
-        encoding="utf-8",
-    )
+    # JSON and CSV of each frame are written concurrently
+    write_results({
+        "yearly": (yearly_agg, (JSON, CSV)),
+        "quarterly": (quarterly_agg, (JSON, CSV)),
+    }, RESULTS_DIR)
 
-    (RESULTS_DIR / "quarterly.json").write_text(
-        json.dumps(quarterly_records, ensure_ascii=False, separators=(",", ":")),
-        encoding="utf-8",
-    )
+    # One small file per geographic entity for the drill-down views
+    series = write_series_files(quarterly_agg, record_columns(quarterly_agg), RESULTS_DIR / SERIES_DIR_NAME)
+
+    # Same records as typed arrays, for loading without a JSON parse. Records of
+    # source types missing from PROPERTY_TYPES have no cell in the cube.
+    cube_frame = cube_records(quarterly_agg)
+    if len(cube_frame) < len(quarterly_agg):
+        print(f"Quarterly cube: skipped {len(quarterly_agg) - len(cube_frame)} records without a property type")
+    cube = write_quarterly_cube(cube_frame, RESULTS_DIR)
 
     (RESULTS_DIR / "lookups.json").write_text(
         json.dumps(lookups, ensure_ascii=False, separators=(",", ":")),
         encoding="utf-8",
     )
 
-    # Also write CSV versions
-    yearly_agg.to_csv(RESULTS_DIR / "yearly.csv", index=False)
-    quarterly_agg.to_csv(RESULTS_DIR / "quarterly.csv", index=False)
-
     # Write metadata
     metadata = {
         "source_url": input_url,
@@ -401,8 +377,10 @@ def process_data() -> None:
     )
 
     print(f"Processed {len(df)} rows")
-    print(f"Yearly records: {len(yearly_records)}")
-    print(f"Quarterly records: {len(quarterly_records)}")
+    print(f"Yearly records: {len(yearly_agg)}")
+    print(f"Quarterly records: {len(quarterly_agg)}")
+    print(f"Series files: {len(series['index'])}")
+    print(f"Quarterly cube: {' x '.join(map(str, cube['shape']))} ({cube['bytes'] / 1024 / 1024:.2f} MB)")
     print(f"Latest data: {date_str}")
 
 
@@ -0,0 +1,188 @@
+"""
+Binary typed-array export of the vastgoed-verkopen quarterly data.
+
+quarterly.json repeats every key in every record and has to be parsed
+number by number. The same data is also written as a dense cube of
+little-endian typed arrays, laid out by (entity, type, quarter):
+
+    results/quarterly_cube.bin    n (Int32), p50/p25/p75 (Float32), back to back
+    results/quarterly_cube.json   header: shape, axis labels, array offsets
+
+The frontend fetches the .bin as an ArrayBuffer and views each array with
+`new Int32Array(buffer, offset, size)` / `new Float32Array(...)`, without a
+parse step (see src/lib/quarterly-cube.ts). The value of entity e, type t
+and quarter q is at index (e * types + t) * quarters + q.
+
+Header:
+- `shape`: [entities, types, quarters]
+- `entities`: {"lvl": [...], "nis": [...], "name": [...]}, sorted by (lvl, nis)
+- `types`: property type codes
+- `quarters`: [year, quarter] of every quarter, consecutive from the first
+  to the last quarter in the data
+- `arrays`: [{"name", "dtype", "offset", "missing"}]; `missing` is the
+  value of cells without a record (-1 for counts, null = NaN for prices)
+
+Prices are rounded to whole euros, which Float32 holds exactly up to 2^24;
+the writer fails instead of silently rounding larger values.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+CUBE_NAME = "quarterly_cube"
+FORMAT_VERSION = 1
+
+DIMS = ["entity", "type", "quarter"]
+COUNT_FIELDS = ["n"]
+PRICE_FIELDS = ["p50", "p25", "p75"]
+
+# Value of cells without a record in count arrays
+MISSING_COUNT = -1
+
+# Columns of the frame returned by cube_to_frame (same as quarterly.json)
+RECORD_COLUMNS = ["y", "q", "lvl", "nis", "type", *COUNT_FIELDS, *PRICE_FIELDS, "name"]
+
+
+def _quarter_numbers(years: np.ndarray, quarters: np.ndarray) -> np.ndarray:
+    return years.astype(np.int64) * 4 + quarters.astype(np.int64) - 1
+
+
+def cube_records(frame: pd.DataFrame) -> pd.DataFrame:
+    """Records of `frame` the cube can hold: those with a property type and an entity.
+
+    Source types missing from PROPERTY_TYPES give records without a type.
+    """
+    return frame[frame["type"].notna() & frame["lvl"].notna() & frame["nis"].notna()]
+
+
+def write_quarterly_cube(frame: pd.DataFrame, out_dir: Path, name: str = CUBE_NAME) -> dict:
+    """Write the records of `frame` as `<name>.bin` and `<name>.json` in `out_dir`.
+
+    `frame` has the columns of quarterly.json, without records lacking a type
+    or entity (see cube_records). Returns the header.
+    """
+    unplaced = len(frame) - len(cube_records(frame))
+    if unplaced:
+        raise ValueError(f"{unplaced} record(s) without a type or entity; filter them with cube_records")
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    entities = (
+        frame[["lvl", "nis", "name"]]
+        .astype({"nis": str})
+        .drop_duplicates(["lvl", "nis"])
+        .sort_values(["lvl", "nis"], kind="stable")
+    )
+    entity_index = pd.MultiIndex.from_frame(entities[["lvl", "nis"]])
+    entity_pos = entity_index.get_indexer(
+        pd.MultiIndex.from_arrays([frame["lvl"], frame["nis"].astype(str)])
+    )
+
+    if isinstance(frame["type"].dtype, pd.CategoricalDtype):
+        types = [str(t) for t in frame["type"].cat.categories]
+    else:
+        types = sorted(frame["type"].astype(str).unique())
+    type_pos = pd.Index(types).get_indexer(frame["type"].astype(str))
+    if (entity_pos < 0).any() or (type_pos < 0).any():
+        raise ValueError("Records whose entity or type is not on the cube axes")
+
+    periods = _quarter_numbers(frame["y"].to_numpy(), frame["q"].to_numpy())
+    first = int(periods.min()) if len(periods) else 0
+    quarter_count = int(periods.max()) - first + 1 if len(periods) else 0
+
+    shape = [len(entities), len(types), quarter_count]
+    size = shape[0] * shape[1] * shape[2]
+    flat = (entity_pos * shape[1] + type_pos) * shape[2] + (periods - first)
+    if len(np.unique(flat)) != len(flat):
+        raise RuntimeError("More than one record for an (entity, type, quarter) cell")
+
+    arrays = []
+    for field in COUNT_FIELDS:
+        values = np.full(size, MISSING_COUNT, dtype="<i4")
+        values[flat] = frame[field].to_numpy(dtype=np.int64)
+        arrays.append((field, values, MISSING_COUNT))
+    for field in PRICE_FIELDS:
+        source = frame[field].to_numpy(dtype=np.float64, na_value=np.nan)
+        converted = source.astype("<f4")
+        if not np.array_equal(converted.astype(np.float64), source, equal_nan=True):
+            raise ValueError(f"Values of '{field}' are not exactly representable as Float32")
+        values = np.full(size, np.nan, dtype="<f4")
+        values[flat] = converted
+        arrays.append((field, values, None))
+
+    bin_path = out_dir / f"{name}.bin"
+    entries = []
+    offset = 0
+    with open(bin_path, "wb") as f:
+        for field, values, missing in arrays:
+            entries.append({"name": field, "dtype": values.dtype.name, "offset": offset, "missing": missing})
+            offset += f.write(values.tobytes())
+
+    header = {
+        "version": FORMAT_VERSION,
+        "byte_order": "little",
+        "file": bin_path.name,
+        "bytes": offset,
+        "dims": DIMS,
+        "shape": shape,
+        "entities": {
+            "lvl": entities["lvl"].astype(int).tolist(),
+            "nis": entities["nis"].tolist(),
+            "name": entities["name"].astype(object).where(entities["name"].notna(), None).tolist(),
+        },
+        "types": types,
+        "quarters": [[(first + i) // 4, (first + i) % 4 + 1] for i in range(quarter_count)],
+        "arrays": entries,
+    }
+    (out_dir / f"{name}.json").write_text(
+        json.dumps(header, ensure_ascii=False, separators=(",", ":")), encoding="utf-8"
+    )
+    return header
+
+
+def read_quarterly_cube(header_path: Path) -> tuple[dict, dict[str, np.ndarray]]:
+    """Read a cube written by write_quarterly_cube.
+
+    Returns the header and {array name: ndarray of the header's shape}. The
+    arrays are read-only views on one buffer, as on the frontend.
+    """
+    header = json.loads(Path(header_path).read_text(encoding="utf-8"))
+    if header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported cube version {header.get('version')}, expected {FORMAT_VERSION}")
+
+    buffer = Path(header_path).with_name(header["file"]).read_bytes()
+    if len(buffer) != header["bytes"]:
+        raise ValueError(f"{header['file']} has {len(buffer)} bytes, header expects {header['bytes']}")
+
+    shape = tuple(header["shape"])
+    size = int(np.prod(shape))
+    arrays = {
+        entry["name"]: np.frombuffer(buffer, dtype=np.dtype(entry["dtype"]).newbyteorder("<"), count=size,
+                                     offset=entry["offset"]).reshape(shape)
+        for entry in header["arrays"]
+    }
+    return header, arrays
+
+
+def cube_to_frame(header: dict, arrays: dict[str, np.ndarray]) -> pd.DataFrame:
+    """Records of a cube (cells with a count) as a frame with RECORD_COLUMNS."""
+    present = arrays[COUNT_FIELDS[0]] != MISSING_COUNT
+    entity, type_, quarter = np.nonzero(present)
+
+    entities = header["entities"]
+    quarters = np.asarray(header["quarters"], dtype=np.int64).reshape(-1, 2)
+    frame = pd.DataFrame({
+        "y": quarters[quarter, 0],
+        "q": quarters[quarter, 1],
+        "lvl": np.asarray(entities["lvl"], dtype=np.int64)[entity],
+        "nis": np.asarray(entities["nis"], dtype=object)[entity],
+        "type": np.asarray(header["types"], dtype=object)[type_],
+    })
+    for field in COUNT_FIELDS:
+        frame[field] = arrays[field][present].astype(np.int64)
+    for field in PRICE_FIELDS:
+        frame[field] = arrays[field][present].astype(np.float64)
+    frame["name"] = np.asarray(entities["name"], dtype=object)[entity]
+    return frame[RECORD_COLUMNS]
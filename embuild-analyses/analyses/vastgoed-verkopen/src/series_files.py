@@ -0,0 +1,95 @@
+"""
+Per-entity time-series files for the vastgoed-verkopen drill-down.
+
+A municipality (or province, region, Belgium) view needs every quarter of
+one NIS code. Those records are spread over multi-MB chunks, so the pipeline
+also writes one small file per geographic entity:
+
+    results/series/<nis>.json   JSON array of the entity's quarterly records
+    results/series/manifest.json
+
+The records are the same as in quarterly.json. The manifest lists every
+entity: `index` maps NIS code -> [lvl, records, bytes] (see `index_fields`),
+and `file_pattern` gives the file name of a code.
+
+Rows are encoded to JSON once for the whole frame. The ~600 files are then
+written by a thread pool.
+"""
+
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SHARED_DATA_DIR = Path(__file__).resolve().parent.parent.parent.parent / "shared-data"
+
+sys.path.insert(0, str(SHARED_DATA_DIR))
+from json_records import encode_json_records  # noqa: E402
+
+SERIES_DIR_NAME = "series"
+MANIFEST_FILE = "manifest.json"
+FILE_PATTERN = "{nis}.json"
+INDEX_FIELDS = ["lvl", "records", "bytes"]
+
+# Files are small; writing is I/O bound, so threads are enough
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+
+def _write(path: Path, body: bytes) -> int:
+    with open(path, "wb") as f:
+        return f.write(body)
+
+
+def write_series_files(
+    frame: pd.DataFrame,
+    columns: dict[str, tuple[str, str]],
+    out_dir: Path,
+    workers: int = DEFAULT_WORKERS,
+) -> dict:
+    """Write one JSON file per (lvl, nis) entity of `frame` plus the manifest.
+
+    `columns` is a json_records column map for the records. Files of
+    entities that are no longer in `frame` are removed. Returns the manifest.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    order = np.lexsort((frame["nis"].astype(str).to_numpy(), frame["lvl"].to_numpy()))
+    frame = frame.iloc[order]
+    rows = encode_json_records(frame, columns)
+    lvls = frame["lvl"].to_numpy()
+    codes = frame["nis"].astype(str).to_numpy()
+
+    # Start of every entity's run of rows
+    starts = np.flatnonzero(np.r_[True, (lvls[1:] != lvls[:-1]) | (codes[1:] != codes[:-1])])
+    bounds = np.r_[starts, len(rows)]
+
+    index = {}
+    jobs = []
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        nis = codes[start]
+        if nis in index:
+            raise RuntimeError(f"NIS code {nis} appears at more than one geo level")
+        body = ("[" + ",".join(rows[start:stop].tolist()) + "]").encode("utf-8")
+        index[nis] = [int(lvls[start]), int(stop - start), len(body)]
+        jobs.append((out_dir / FILE_PATTERN.format(nis=nis), body))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda job: _write(*job), jobs))
+
+    keep = {path.name for path, _ in jobs} | {MANIFEST_FILE}
+    for old in out_dir.glob("*.json"):
+        if old.name not in keep:
+            old.unlink()
+
+    manifest = {
+        "records": len(rows),
+        "file_pattern": FILE_PATTERN,
+        "index_fields": INDEX_FIELDS,
+        "index": index,
+    }
+    (out_dir / MANIFEST_FILE).write_text(json.dumps(manifest, separators=(",", ":")), encoding="utf-8")
+    return manifest
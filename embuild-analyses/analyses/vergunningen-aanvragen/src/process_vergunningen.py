@@ -11,12 +11,42 @@ Output structure:
 
 import pandas as pd
 import json
+import sys
 from pathlib import Path
 
 # Paths
 DATA_DIR = Path(__file__).parent.parent / "data"
 RESULTS_DIR = Path(__file__).parent.parent / "results"
 RESULTS_DIR.mkdir(exist_ok=True)
+SHARED_DATA_DIR = Path(__file__).parent.parent.parent.parent / "shared-data"
+
+sys.path.insert(0, str(SHARED_DATA_DIR))
+from json_records import write_json_records  # noqa: E402
+
+# Output keys per aggregate column (only the columns present in a frame are written)
+OUTPUT_COLUMNS = {
+    "jaar": ("y", "int"),
+    "kwartaal_nr": ("q", "int"),
+    "functie_kort": ("t", "str"),
+    "besluit_type": ("b", "str"),
+    "aantal_projecten": ("p", "int"),
+    "aantal_gebouwen": ("g", "int"),
+    "aantal_wooneenheden": ("w", "int"),
+    "woonoppervlakte_m2": ("m2", "float"),
+    "gesloopt_m2": ("m2", "float"),
+    "gesloopt_m3": ("m3", "float"),
+}
+
+
+def save_aggregate(frame: pd.DataFrame, filename: str) -> None:
+    """Write an aggregate as compact JSON records, rounding surfaces/volumes to whole units."""
+    columns = {col: spec for col, spec in OUTPUT_COLUMNS.items() if col in frame.columns}
+    frame = frame.copy()
+    for col, (_, kind) in columns.items():
+        if kind == "float":
+            frame[col] = frame[col].round(0)
+    write_json_records(frame, RESULTS_DIR / filename, columns)
+
 
 # Read CSV
 df = pd.read_csv(
@@ -92,12 +122,7 @@ nieuwbouw_quarterly = df_nieuwbouw.groupby(["jaar", "kwartaal_nr"]).agg({
     "woonoppervlakte_m2": "sum"
 }).reset_index().sort_values(["jaar", "kwartaal_nr"])
 
-with open(RESULTS_DIR / "nieuwbouw_quarterly.json", "w") as f:
-    json.dump([
-        {"y": int(r["jaar"]), "q": int(r["kwartaal_nr"]), "p": int(r["aantal_projecten"]),
-         "g": int(r["aantal_gebouwen"]), "w": int(r["aantal_wooneenheden"]), "m2": round(r["woonoppervlakte_m2"], 0)}
-        for _, r in nieuwbouw_quarterly.iterrows()
-    ], f)
+save_aggregate(nieuwbouw_quarterly, "nieuwbouw_quarterly.json")
 
 # Yearly totals
 nieuwbouw_yearly = df_nieuwbouw.groupby(["jaar"]).agg({
@@ -107,12 +132,7 @@ nieuwbouw_yearly = df_nieuwbouw.groupby(["jaar"]).agg({
     "woonoppervlakte_m2": "sum"
 }).reset_index().sort_values("jaar")
 
-with open(RESULTS_DIR / "nieuwbouw_yearly.json", "w") as f:
-    json.dump([
-        {"y": int(r["jaar"]), "p": int(r["aantal_projecten"]), "g": int(r["aantal_gebouwen"]),
-         "w": int(r["aantal_wooneenheden"]), "m2": round(r["woonoppervlakte_m2"], 0)}
-        for _, r in nieuwbouw_yearly.iterrows()
-    ], f)
+save_aggregate(nieuwbouw_yearly, "nieuwbouw_yearly.json")
 
 # By type - yearly
 nieuwbouw_by_type = df_nieuwbouw.groupby(["jaar", "functie_kort"]).agg({
@@ -122,12 +142,7 @@ nieuwbouw_by_type = df_nieuwbouw.groupby(["jaar", "functie_kort"]).agg({
     "woonoppervlakte_m2": "sum"
 }).reset_index().sort_values(["jaar", "functie_kort"])
 
-with open(RESULTS_DIR / "nieuwbouw_by_type.json", "w") as f:
-    json.dump([
-        {"y": int(r["jaar"]), "t": r["functie_kort"], "p": int(r["aantal_projecten"]),
-         "g": int(r["aantal_gebouwen"]), "w": int(r["aantal_wooneenheden"]), "m2": round(r["woonoppervlakte_m2"], 0)}
-        for _, r in nieuwbouw_by_type.iterrows()
-    ], f)
+save_aggregate(nieuwbouw_by_type, "nieuwbouw_by_type.json")
 
 # ============================================================================
 # SECTION 2: VERBOUW (Renovation)
@@ -143,12 +158,7 @@ verbouw_quarterly = df_verbouw.groupby(["jaar", "kwartaal_nr"]).agg({
     "woonoppervlakte_m2": "sum"
 }).reset_index().sort_values(["jaar", "kwartaal_nr"])
 
-with open(RESULTS_DIR / "verbouw_quarterly.json", "w") as f:
-    json.dump([
-        {"y": int(r["jaar"]), "q": int(r["kwartaal_nr"]), "p": int(r["aantal_projecten"]),
-         "g": int(r["aantal_gebouwen"]), "w": int(r["aantal_wooneenheden"]), "m2": round(r["woonoppervlakte_m2"], 0)}
-        for _, r in verbouw_quarterly.iterrows()
-    ], f)
+save_aggregate(verbouw_quarterly, "verbouw_quarterly.json")
 
 # Yearly totals
 verbouw_yearly = df_verbouw.groupby(["jaar"]).agg({
@@ -158,12 +168,7 @@ verbouw_yearly = df_verbouw.groupby(["jaar"]).agg({
     "woonoppervlakte_m2": "sum"
 }).reset_index().sort_values("jaar")
 
-with open(RESULTS_DIR / "verbouw_yearly.json", "w") as f:
-    json.dump([
-        {"y": int(r["jaar"]), "p": int(r["aantal_projecten"]), "g": int(r["aantal_gebouwen"]),
-         "w": int(r["aantal_wooneenheden"]), "m2": round(r["woonoppervlakte_m2"], 0)}
-        for _, r in verbouw_yearly.iterrows()
-    ], f)
+save_aggregate(verbouw_yearly, "verbouw_yearly.json")
 
 # By type - yearly
 verbouw_by_type = df_verbouw.groupby(["jaar", "functie_kort"]).agg({
@@ -173,12 +178,7 @@ verbouw_by_type = df_verbouw.groupby(["jaar", "functie_kort"]).agg({
     "woonoppervlakte_m2": "sum"
 }).reset_index().sort_values(["jaar", "functie_kort"])
 
-with open(RESULTS_DIR / "verbouw_by_type.json", "w") as f:
-    json.dump([
-        {"y": int(r["jaar"]), "t": r["functie_kort"], "p": int(r["aantal_projecten"]),
-         "g": int(r["aantal_gebouwen"]), "w": int(r["aantal_wooneenheden"]), "m2": round(r["woonoppervlakte_m2"], 0)}
-        for _, r in verbouw_by_type.iterrows()
-    ], f)
+save_aggregate(verbouw_by_type, "verbouw_by_type.json")
 
 # ============================================================================
 # SECTION 3: SLOOP (Demolition)
@@ -194,12 +194,7 @@ sloop_quarterly = df_sloop.groupby(["jaar", "kwartaal_nr"]).agg({
     "gesloopt_m3": "sum"
 }).reset_index().sort_values(["jaar", "kwartaal_nr"])
 
-with open(RESULTS_DIR / "sloop_quarterly.json", "w") as f:
-    json.dump([
-        {"y": int(r["jaar"]), "q": int(r["kwartaal_nr"]), "p": int(r["aantal_projecten"]),
-         "g": int(r["aantal_gebouwen"]), "m2": round(r["gesloopt_m2"], 0), "m3": round(r["gesloopt_m3"], 0)}
-        for _, r in sloop_quarterly.iterrows()
-    ], f)
+save_aggregate(sloop_quarterly, "sloop_quarterly.json")
 
 # Yearly totals
 sloop_yearly = df_sloop.groupby(["jaar"]).agg({
@@ -209,12 +204,7 @@ sloop_yearly = df_sloop.groupby(["jaar"]).agg({
     "gesloopt_m3": "sum"
 }).reset_index().sort_values("jaar")
 
-with open(RESULTS_DIR / "sloop_yearly.json", "w") as f:
-    json.dump([
-        {"y": int(r["jaar"]), "p": int(r["aantal_projecten"]), "g": int(r["aantal_gebouwen"]),
-         "m2": round(r["gesloopt_m2"], 0), "m3": round(r["gesloopt_m3"], 0)}
-        for _, r in sloop_yearly.iterrows()
-    ], f)
+save_aggregate(sloop_yearly, "sloop_yearly.json")
 
 # By besluit type (who decides: gemeente, provincie, etc)
 sloop_by_besluit = df_sloop.groupby(["jaar", "besluit_type"]).agg({
@@ -224,12 +214,7 @@ sloop_by_besluit = df_sloop.groupby(["jaar", "besluit_type"]).agg({
     "gesloopt_m3": "sum"
 }).reset_index().sort_values(["jaar", "besluit_type"])
 
-with open(RESULTS_DIR / "sloop_by_besluit.json", "w") as f:
-    json.dump([
-        {"y": int(r["jaar"]), "b": r["besluit_type"], "p": int(r["aantal_projecten"]),
-         "g": int(r["aantal_gebouwen"]), "m2": round(r["gesloopt_m2"], 0), "m3": round(r["gesloopt_m3"], 0)}
-        for _, r in sloop_by_besluit.iterrows()
-    ], f)
+save_aggregate(sloop_by_besluit, "sloop_by_besluit.json")
 
 # ============================================================================
 # LOOKUPS for UI
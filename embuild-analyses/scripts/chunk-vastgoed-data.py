@@ -4,11 +4,23 @@ Chunk vastgoed-verkopen quarterly.json into smaller files for lazy-loading.
 
 This script splits the 17 MB quarterly.json file into ~3 MB chunks to prevent
 Out of Memory errors during Next.js build and improve runtime loading performance.
+
+Records are partitioned by geographic entity (geo level + NIS code) instead of
+by position: all quarters and property types of one entity land in the same
+chunk, and metadata.json carries an index from NIS code to its chunk and byte
+range. A view for one municipality, province or region only needs that chunk
+(or that byte range of it).
+
+The input is streamed: process_data.py writes quarterly.json with each
+entity's records contiguous, so records are parsed one at a time, their
+source text is copied into the current chunk as-is and a chunk is closed
+as soon as the next entity would overflow it. Memory stays at one entity's
+records. An input in any other order falls back to partitioning in memory.
 """
 
 import json
-import os
 import math
+import shutil
 from pathlib import Path
 
 # Paths
@@ -21,82 +33,220 @@ PUBLIC_DATA_DIR = EMBUILD_DIR / "public" / "data" / "vastgoed-verkopen"
 TARGET_CHUNK_SIZE_MB = 3
 BYTES_PER_MB = 1024 * 1024
 
-def estimate_json_size(data):
-    """Estimate JSON size in bytes without serializing."""
-    return len(json.dumps(data, separators=(',', ':')))
+# Characters read from the input per block
+READ_BLOCK_SIZE = 1 << 20
+
+# Chunks are partitioned on these record fields; one key is never split
+PARTITION_KEY = ["lvl", "nis"]
+
+# Layout of the entries in metadata["index"]
+INDEX_FIELDS = ["lvl", "chunk", "offset", "length", "records"]
+
+# Per-entity series files written by process_data.py (see src/series_files.py)
+SERIES_DIR_NAME = "series"
+SERIES_MANIFEST = "manifest.json"
+
+
+class UnorderedInput(Exception):
+    """The records of a partition key are not contiguous in the input."""
+
+
+def iter_json_array(path, block_size=READ_BLOCK_SIZE):
+    """Yield (record, source text) for each element of a JSON array file.
+
+    The file is read in blocks; only the unparsed tail of the current block
+    is kept in memory.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buf = f.read(block_size).lstrip()
+        if not buf.startswith("["):
+            raise ValueError(f"{path} does not contain a JSON array")
+        pos = 1
+        eof = False
+        while True:
+            # Skip whitespace and separators; refill when the block runs out
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos == len(buf):
+                if eof:
+                    raise ValueError(f"{path}: unterminated JSON array")
+                block = f.read(block_size)
+                buf, pos, eof = buf[pos:] + block, 0, not block
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                record, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                block = f.read(block_size)
+                buf, pos, eof = buf[pos:] + block, 0, not block
+                continue
+            yield record, buf[pos:end]
+            pos = end
+
+
+def partition_key(record):
+    return (record.get("lvl") or 0, str(record.get("nis") or ""))
+
+
+def stream_partitions(records):
+    """Group contiguous (record, text) pairs per key, encoded as UTF-8 bytes.
+
+    Raises UnorderedInput when keys are not in ascending order, since a key
+    seen before could then come back after its chunk was written.
+    """
+    key, items, previous = None, [], None
+    for record, text in records:
+        record_key = partition_key(record)
+        if record_key != key:
+            if items:
+                yield key, items
+            if previous is not None and record_key < previous:
+                raise UnorderedInput(f"{record_key} follows {previous}")
+            key, items, previous = record_key, [], record_key
+        items.append(text.encode("utf-8"))
+    if items:
+        yield key, items
+
+
+def partition_records(records):
+    """Group all (record, text) pairs per key in memory, in key order."""
+    partitions = {}
+    for record, text in records:
+        partitions.setdefault(partition_key(record), []).append(text.encode("utf-8"))
+    return [(key, partitions[key]) for key in sorted(partitions)]
+
+
+def write_chunks(partitions, out_dir, target_bytes):
+    """Write partitions into chunk files of at most ~target_bytes each.
+
+    Consecutive keys are packed into the current chunk until the next key
+    would overflow it. Returns the chunk summaries and the index entries
+    (lvl, nis, chunk, offset, length, records); offsets are exact byte
+    positions inside the chunk, counted as the bytes are written.
+    """
+    chunks, entries = [], []
+    f = None
+
+    def close():
+        f.write(b"]")
+        chunks[-1]["size"] = f.tell()
+        f.close()
+
+    try:
+        for key, items in partitions:
+            body = b",".join(items)
+            if f is not None and f.tell() + 1 + len(body) + 1 > target_bytes:
+                close()
+                f = None
+            if f is None:
+                filename = f"quarterly_chunk_{len(chunks)}.json"
+                f = open(out_dir / filename, 'wb')
+                f.write(b"[")
+                chunks.append({"filename": filename, "records": 0, "first": key})
+            else:
+                f.write(b",")
+            entries.append((key[0], key[1], len(chunks) - 1, f.tell(), len(body), len(items)))
+            f.write(body)
+            chunks[-1]["records"] += len(items)
+            chunks[-1]["last"] = key
+    except BaseException:
+        if f is not None:
+            f.close()
+        raise
+    if f is not None:
+        close()
+    return chunks, entries
+
 
 def chunk_quarterly_data():
     """Split quarterly.json into chunks."""
-    print("Loading quarterly.json...")
+    print("Streaming quarterly.json...")
     quarterly_path = RESULTS_DIR / "quarterly.json"
 
     if not quarterly_path.exists():
         print(f"Error: {quarterly_path} not found")
         return
 
-    with open(quarterly_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    print(f"Loaded {len(data)} quarterly records")
-    print(f"Total size: {estimate_json_size(data) / BYTES_PER_MB:.2f} MB")
-
-    # Calculate optimal chunk size
-    total_records = len(data)
-    avg_record_size = estimate_json_size(data) / total_records
-    records_per_chunk = int((TARGET_CHUNK_SIZE_MB * BYTES_PER_MB) / avg_record_size)
-    num_chunks = math.ceil(total_records / records_per_chunk)
-
-    print(f"Creating {num_chunks} chunks with ~{records_per_chunk} records each")
-
     # Create public data directory
     PUBLIC_DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-    # Split data into chunks
-    chunks_metadata = []
-    for i in range(num_chunks):
-        start_idx = i * records_per_chunk
-        end_idx = min((i + 1) * records_per_chunk, total_records)
-        chunk_data = data[start_idx:end_idx]
+    target_bytes = TARGET_CHUNK_SIZE_MB * BYTES_PER_MB
+    try:
+        chunks, entries = write_chunks(
+            stream_partitions(iter_json_array(quarterly_path)), PUBLIC_DATA_DIR, target_bytes
+        )
+    except UnorderedInput as e:
+        print(f"  Records are not grouped per geographic entity ({e}); partitioning in memory")
+        chunks, entries = write_chunks(
+            partition_records(iter_json_array(quarterly_path)), PUBLIC_DATA_DIR, target_bytes
+        )
+    num_chunks = len(chunks)
 
-        chunk_filename = f"quarterly_chunk_{i}.json"
-        chunk_path = PUBLIC_DATA_DIR / chunk_filename
+    # Remove chunks left over from a previous run with more chunks
+    for old in PUBLIC_DATA_DIR.glob("quarterly_chunk_*.json"):
+        if int(old.stem.rsplit("_", 1)[1]) >= num_chunks:
+            old.unlink()
 
-        with open(chunk_path, 'w', encoding='utf-8') as f:
-            json.dump(chunk_data, f, separators=(',', ':'))
+    index = {}
+    for lvl, nis, chunk, offset, length, records in entries:
+        if nis in index:
+            raise RuntimeError(f"NIS code {nis} appears at more than one geo level")
+        index[nis] = [lvl, chunk, offset, length, records]
 
-        chunk_size = chunk_path.stat().st_size
+    chunks_metadata = []
+    for i, chunk in enumerate(chunks):
         chunks_metadata.append({
             "index": i,
-            "filename": chunk_filename,
-            "records": len(chunk_data),
-            "size_mb": chunk_size / BYTES_PER_MB
+            "filename": chunk["filename"],
+            "records": chunk["records"],
+            "size_mb": chunk["size"] / BYTES_PER_MB,
+            "first": list(chunk["first"]),
+            "last": list(chunk["last"]),
         })
+        print(f"  Created {chunk['filename']}: {chunk['records']} records, {chunk['size'] / BYTES_PER_MB:.2f} MB")
 
-        print(f"  Created {chunk_filename}: {len(chunk_data)} records, {chunk_size / BYTES_PER_MB:.2f} MB")
+    total_records = sum(c["records"] for c in chunks)
+    print(f"Chunked {total_records} quarterly records for {len(entries)} geographic entities")
 
     # Create metadata file
     metadata = {
         "quarterly_chunks": num_chunks,
         "total_records": total_records,
-        "records_per_chunk": records_per_chunk,
-        "chunks": chunks_metadata
+        "records_per_chunk": math.ceil(total_records / num_chunks) if num_chunks else 0,
+        "partition_key": PARTITION_KEY,
+        "chunks": chunks_metadata,
+        "index_fields": INDEX_FIELDS,
+        "index": index,
     }
 
+    # Point the frontend at the per-entity files when the pipeline wrote them
+    series_manifest = RESULTS_DIR / SERIES_DIR_NAME / SERIES_MANIFEST
+    if series_manifest.exists():
+        with open(series_manifest, 'r', encoding='utf-8') as f:
+            metadata["series"] = f"{SERIES_DIR_NAME}/{json.load(f)['file_pattern']}"
+
     metadata_path = PUBLIC_DATA_DIR / "metadata.json"
     with open(metadata_path, 'w', encoding='utf-8') as f:
-        json.dump(metadata, f, indent=2)
+        json.dump(metadata, f, separators=(',', ':'))
 
-    print(f"\nCreated metadata.json with {num_chunks} chunk entries")
+    print(f"\nCreated metadata.json with {num_chunks} chunk entries and {len(index)} index entries")
     print(f"Total chunked size: {sum(c['size_mb'] for c in chunks_metadata):.2f} MB")
 
 def copy_other_files():
-    """Copy yearly, municipalities, and lookups to public/data."""
+    """Copy yearly, municipalities, lookups and the quarterly cube to public/data."""
     print("\nCopying other data files...")
 
     files_to_copy = [
         "yearly.json",
         "municipalities.json",
-        "lookups.json"
+        "lookups.json",
+        # Typed-array export of the quarterly data (see src/quarterly_cube.py)
+        "quarterly_cube.json",
+        "quarterly_cube.bin",
     ]
 
     for filename in files_to_copy:
@@ -104,17 +254,25 @@ def copy_other_files():
         dst = PUBLIC_DATA_DIR / filename
 
         if src.exists():
-            with open(src, 'r', encoding='utf-8') as f_in:
-                data = json.load(f_in)
-
-            with open(dst, 'w', encoding='utf-8') as f_out:
-                json.dump(data, f_out, separators=(',', ':'))
+            # The results are already compact JSON; copy them byte-for-byte
+            shutil.copyfile(src, dst)
 
             size_mb = dst.stat().st_size / BYTES_PER_MB
             print(f"  Copied {filename}: {size_mb:.2f} MB")
         else:
             print(f"  Warning: {filename} not found in results directory")
 
+    src = RESULTS_DIR / SERIES_DIR_NAME
+    dst = PUBLIC_DATA_DIR / SERIES_DIR_NAME
+    if src.is_dir():
+        # Replace the whole directory so files of vanished entities do not linger
+        if dst.exists():
+            shutil.rmtree(dst)
+        shutil.copytree(src, dst)
+        print(f"  Copied {SERIES_DIR_NAME}/: {sum(1 for _ in dst.glob('*.json')) - 1} series files")
+    else:
+        print(f"  Warning: {SERIES_DIR_NAME}/ not found in results directory")
+
 if __name__ == "__main__":
     print("=" * 60)
     print("Chunking vastgoed-verkopen data for lazy-loading")
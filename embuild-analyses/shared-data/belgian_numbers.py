@@ -0,0 +1,55 @@
+"""
+Vectorized parsing of Belgian-formatted numbers.
+
+The BBC/meerjarenplan exports and the PowerBI dumps write numbers as
+"1.234.567,89": dots group thousands and a comma marks the decimals,
+sometimes behind a currency sign ("€ 1.234"). Pipelines converted them one
+value at a time with `str(v).replace('.', '').replace(',', '.')` and a
+try/except around float(). This module does the same for a whole column with
+pandas string methods and a single `to_numeric` call:
+
+    amounts = parse_belgian_numbers(df["2026,Uitgave"]).fillna(0)
+    bedrag = parse_belgian_numbers(df["Totaal bedrag"], currency="€")
+
+- Text loses its thousands dots and surrounding whitespace, the decimal
+  comma becomes a point and `currency` is dropped.
+- Values that already are numbers (a numeric column, or ints and floats in
+  an object column) are kept as they are.
+- Missing values and text that is not a number become NaN; callers choose
+  the fill value.
+"""
+
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+
+def _parse_text(text: pd.Series, currency: str | None) -> pd.Series:
+    if currency:
+        text = text.str.replace(currency, "", regex=False)
+    text = text.str.replace(".", "", regex=False).str.replace(",", ".", regex=False).str.strip()
+    return pd.to_numeric(text, errors="coerce").astype("float64")
+
+
+def parse_belgian_numbers(values, currency: str | None = None) -> pd.Series:
+    """Parse a column of Belgian-formatted numbers to float64.
+
+    Args:
+        values: Series (or anything `pd.Series` accepts) of strings and/or numbers.
+        currency: Symbol to remove from the text before parsing, e.g. "€".
+
+    Returns:
+        float64 Series with the index of `values`; NaN where a value is
+        missing or not a number.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    if is_numeric_dtype(series):
+        return series.astype("float64")
+    if series.dtype != object:
+        return _parse_text(series.astype("string"), currency)
+
+    # Mixed object column: only the strings are Belgian text
+    is_text = series.map(lambda v: isinstance(v, str)).astype(bool)
+    parsed = pd.to_numeric(series.mask(is_text), errors="coerce").astype("float64")
+    if is_text.any():
+        parsed[is_text] = _parse_text(series[is_text].astype("string"), currency)
+    return parsed
@@ -0,0 +1,107 @@
+"""
+Dictionary-encoded columnar JSON format for dashboard results.
+
+Record arrays repeat every key and every label in each record. The columnar
+format stores one array per column instead (struct-of-arrays) and replaces
+string values by integer codes into a per-column dictionary:
+
+    {
+      "format": "columnar",
+      "version": 1,
+      "length": 3,
+      "columns": {"y": [2023, 2023, 2024], "p": [0, 1, 0], "n": [12, 4, 9]},
+      "dictionaries": {"p": ["10000", "20001"]}
+    }
+
+Decoding (see decode_columnar, and src/lib/columnar-json.ts for the dashboard):
+- There are `length` records; record i takes the i-th value of every column,
+  in the order of the `columns` object.
+- Columns listed in `dictionaries` hold codes: code c decodes to
+  dictionaries[col][c], code -1 decodes to null.
+- All other columns hold their values as-is (null for missing values).
+
+Columns are described with the same `{column: (key, kind)}` maps as
+json_records.py: "str" columns are dictionary-encoded, "int"/"float"/"num"
+columns are written as plain numbers.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from json_records import KINDS
+
+FORMAT = "columnar"
+VERSION = 1
+
+
+def _number_values(series: pd.Series, kind: str) -> list:
+    # Same typing rules as json_records: "num" values are ints when integral
+    values = series.to_numpy(dtype="float64", na_value=np.nan)
+    finite = np.isfinite(values)
+    if kind == "int":
+        as_int = finite
+    elif kind == "num":
+        as_int = finite & (values == np.floor(values))
+    else:
+        as_int = np.zeros(len(values), dtype=bool)
+
+    out = values.astype(object)
+    out[as_int] = values[as_int].astype(np.int64).astype(object)
+    out[~finite] = None
+    return out.tolist()
+
+
+def encode_columnar(df: pd.DataFrame, columns: dict[str, tuple[str, str]]) -> dict:
+    """Encode `df` as a columnar payload (see module docstring)."""
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        raise KeyError(f"Columns not found in DataFrame: {missing}")
+
+    data = {}
+    dictionaries = {}
+    for col, (key, kind) in columns.items():
+        if kind not in KINDS:
+            raise ValueError(f"Unknown column kind '{kind}', expected one of {KINDS}")
+        if kind == "str":
+            codes, uniques = pd.factorize(df[col], use_na_sentinel=True)
+            data[key] = codes.tolist()
+            dictionaries[key] = [str(u) for u in uniques]
+        else:
+            data[key] = _number_values(df[col], kind)
+
+    return {
+        "format": FORMAT,
+        "version": VERSION,
+        "length": len(df),
+        "columns": data,
+        "dictionaries": dictionaries,
+    }
+
+
+def write_json_columnar(df: pd.DataFrame, path: Path, columns: dict[str, tuple[str, str]]) -> int:
+    """Write `df` to `path` as compact columnar JSON. Returns the number of bytes written."""
+    payload = json.dumps(encode_columnar(df, columns), ensure_ascii=False, separators=(",", ":"))
+    data = payload.encode("utf-8")
+    path.write_bytes(data)
+    return len(data)
+
+
+def decode_columnar(payload: dict) -> list[dict]:
+    """Reference decoder: turn a columnar payload back into a list of records."""
+    if payload.get("format") != FORMAT or payload.get("version") != VERSION:
+        raise ValueError(f"Unsupported payload: {payload.get('format')} v{payload.get('version')}")
+
+    dictionaries = payload.get("dictionaries", {})
+    decoded = {}
+    for key, values in payload["columns"].items():
+        labels = dictionaries.get(key)
+        if labels is None:
+            decoded[key] = values
+        else:
+            decoded[key] = [None if code < 0 else labels[code] for code in values]
+
+    keys = list(decoded)
+    return [dict(zip(keys, row)) for row in zip(*decoded.values())] if keys else []
@@ -0,0 +1,149 @@
+"""
+Column-oriented JSON record writer shared by the analysis pipelines.
+
+Serializes a DataFrame to a compact JSON array of records without walking the
+rows in Python: every column is encoded to JSON text once as a NumPy array
+(nulls, int/float typing and string escaping are handled per column), after
+which the records are assembled with vectorized string concatenation and
+streamed to disk in batches.
+
+Column maps have the form ``{column: (key, kind)}`` where ``kind`` is one of:
+- "int": integer (truncated, like ``int(x)``)
+- "float": float, always written with a decimal point or exponent
+- "num": integer when the value is integral, float otherwise (the behaviour of
+  the old per-analysis ``clean_for_json`` helpers)
+- "str": JSON string
+
+Missing values (None, NaN, NA, +/-inf) are written as ``null`` for every kind.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+KINDS = ("int", "float", "num", "str")
+
+# Rows encoded per write; bounds the size of the intermediate string arrays
+DEFAULT_BATCH_SIZE = 100_000
+
+
+def _encode_strings(series: pd.Series, ensure_ascii: bool) -> np.ndarray:
+    # Escape each distinct value once; the -1 NA code picks the trailing "null"
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    encoded = [json.dumps(str(u), ensure_ascii=ensure_ascii) for u in uniques]
+    return np.array(encoded + ["null"], dtype=object)[codes]
+
+
+def _format_ints(values: np.ndarray) -> np.ndarray:
+    return values.astype(np.int64).astype(str).astype(object)
+
+
+def _encode_numbers(series: pd.Series, kind: str) -> np.ndarray:
+    out = np.full(len(series), "null", dtype=object)
+
+    if pd.api.types.is_integer_dtype(series.dtype) and kind != "float":
+        # Integer columns (including nullable Int64) never need float formatting
+        valid = ~series.isna().to_numpy()
+        out[valid] = _format_ints(series.to_numpy(dtype="int64", na_value=0)[valid])
+        return out
+
+    values = series.to_numpy(dtype="float64", na_value=np.nan)
+    finite = np.isfinite(values)
+
+    if kind == "int":
+        out[finite] = _format_ints(values[finite])
+    elif kind == "float":
+        # NumPy uses the same shortest round-trip repr as json.dumps
+        out[finite] = values[finite].astype(str).astype(object)
+    else:
+        integral = finite & (values == np.floor(values))
+        fractional = finite & ~integral
+        out[integral] = _format_ints(values[integral])
+        out[fractional] = values[fractional].astype(str).astype(object)
+    return out
+
+
+def encode_column(series: pd.Series, kind: str, ensure_ascii: bool = False) -> np.ndarray:
+    """Encode a column to an object array of JSON value literals."""
+    if kind not in KINDS:
+        raise ValueError(f"Unknown column kind '{kind}', expected one of {KINDS}")
+    if kind == "str":
+        return _encode_strings(series, ensure_ascii)
+    return _encode_numbers(series, kind)
+
+
+def encode_json_records(
+    df: pd.DataFrame,
+    columns: dict[str, tuple[str, str]],
+    ensure_ascii: bool = False,
+) -> np.ndarray:
+    """Encode every row of `df` to the JSON text of its record (object array)."""
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        raise KeyError(f"Columns not found in DataFrame: {missing}")
+
+    rows = np.full(len(df), "", dtype=object)
+    for i, (col, (key, kind)) in enumerate(columns.items()):
+        prefix = ("{" if i == 0 else ",") + json.dumps(key, ensure_ascii=ensure_ascii) + ":"
+        rows = rows + prefix + encode_column(df[col], kind, ensure_ascii)
+    return rows + "}"
+
+
+def iter_json_records(
+    df: pd.DataFrame,
+    columns: dict[str, tuple[str, str]],
+    ensure_ascii: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+):
+    """Yield JSON text for the records of `df`, one comma-joined batch at a time."""
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        raise KeyError(f"Columns not found in DataFrame: {missing}")
+
+    for start in range(0, len(df), batch_size):
+        rows = encode_json_records(df.iloc[start:start + batch_size], columns, ensure_ascii)
+        yield ",".join(rows.tolist())
+
+
+def dumps_json_records(
+    df: pd.DataFrame,
+    columns: dict[str, tuple[str, str]],
+    ensure_ascii: bool = False,
+) -> str:
+    """Return `df` as a compact JSON array of records."""
+    return "[" + ",".join(iter_json_records(df, columns, ensure_ascii=ensure_ascii)) + "]"
+
+
+def write_json_records(
+    df: pd.DataFrame,
+    path: Path,
+    columns: dict[str, tuple[str, str]],
+    ensure_ascii: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """Stream `df` to `path` as a compact JSON array of records.
+
+    Returns the number of bytes written.
+    """
+    written = 0
+    with open(path, "wb") as f:
+        written += f.write(b"[")
+        for i, chunk in enumerate(iter_json_records(df, columns, ensure_ascii, batch_size)):
+            if i:
+                written += f.write(b",")
+            written += f.write(chunk.encode("utf-8"))
+        written += f.write(b"]")
+    return written
+
+
+def record_columns(df: pd.DataFrame, numeric_kind: str = "num") -> dict[str, tuple[str, str]]:
+    """Column map that keeps the DataFrame's column names as record keys.
+
+    Numeric columns are written as `numeric_kind`, all other columns as strings.
+    """
+    return {
+        col: (col, numeric_kind if pd.api.types.is_numeric_dtype(df[col].dtype) else "str")
+        for col in df.columns
+    }
@@ -0,0 +1,128 @@
+"""
+Vectorized NIS code hierarchy built from nis/refnis.csv.
+
+Pipelines used to map NIS codes to their province or region row by row, with
+hand-written prefix tables or `range` lookups. This module builds the REFNIS
+hierarchy once (municipality -> arrondissement -> province -> region) as a
+table indexed by integer code, and resolves whole columns in one call:
+
+    df["p"] = resolve_nis(df["nis"], PROVINCE)
+    df["r"] = resolve_nis(df["nis"], REGION)
+
+Rules:
+- A code resolves to its ancestor at the requested level, or to itself when
+  it is at that level. Codes above the level or unknown codes give NA.
+- Codes that changed parent over time (e.g. the arrondissements of the old
+  province of Brabant) use their most recent REFNIS record.
+- The Brussels-Capital arrondissement (21000) has no province in REFNIS; it
+  acts as its own province, as in belgian-provinces.json.
+- Municipality codes missing from refnis.csv (e.g. created by a merger after
+  the file was produced) resolve through their arrondissement, which is the
+  code with the last three digits set to zero.
+
+Resolved codes are strings without leading zeros ("2000", "10000").
+"""
+
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SHARED_DATA_DIR = Path(__file__).parent
+REFNIS_CSV = SHARED_DATA_DIR / "nis" / "refnis.csv"
+
+# LVL_REFNIS values
+REGION = 1
+PROVINCE = 2
+ARRONDISSEMENT = 3
+MUNICIPALITY = 4
+LEVELS = (REGION, PROVINCE, ARRONDISSEMENT, MUNICIPALITY)
+
+
+def normalize_nis_codes(codes: pd.Series) -> pd.Series:
+    """Normalize a column of NIS codes to strings (vectorized).
+
+    Numbers become their integer digits, strings are stripped and empty
+    values become NA. Leading zeros of string codes are kept.
+    """
+    # Normalize each distinct value once
+    positions, uniques = pd.factorize(codes, use_na_sentinel=True)
+    uniques = pd.Series(uniques)
+    if pd.api.types.is_numeric_dtype(uniques.dtype):
+        values = uniques.astype("Int64").astype("string")
+    else:
+        values = uniques.astype("string").str.strip()
+    values = values.mask(values == "")
+    labels = np.append(values.astype(object).where(values.notna(), None).to_numpy(), None)
+    return pd.Series(labels[positions], index=codes.index, name=codes.name, dtype=object)
+
+
+@lru_cache(maxsize=None)
+def load_hierarchy(path: Path = REFNIS_CSV) -> pd.DataFrame:
+    """Hierarchy table: one row per code with its level, Dutch name and ancestors.
+
+    Indexed by integer code; the columns 1..4 hold the ancestor code at each
+    level (Int64, NA when there is none).
+    """
+    refnis = pd.read_csv(path, dtype=str)
+    refnis["end"] = pd.to_datetime(refnis["DT_VLDT_END"], format="%d/%m/%Y")
+    latest = refnis.sort_values("end", kind="stable").drop_duplicates("CD_REFNIS", keep="last")
+
+    table = pd.DataFrame({
+        "level": latest["LVL_REFNIS"].astype(int).to_numpy(),
+        "name": latest["TX_REFNIS_NL"].to_numpy(),
+        "parent": pd.to_numeric(latest["CD_SUP_REFNIS"], errors="coerce").astype("Int64").array,
+    }, index=pd.Index(latest["CD_REFNIS"].astype(int).to_numpy(), name="code"))
+    table = table.sort_index()
+    for level in LEVELS:
+        table[level] = pd.array([pd.NA] * len(table), dtype="Int64")
+
+    # Parents are processed before their children, so ancestors can be copied down
+    for level in LEVELS:
+        rows = table.index[table["level"] == level]
+        parents = table["parent"].loc[rows].to_numpy()
+        known = pd.notna(parents)
+        for ancestor in LEVELS[:level - 1]:
+            values = pd.array([pd.NA] * len(rows), dtype="Int64")
+            values[known] = table[ancestor].reindex(parents[known].astype(int)).to_numpy()
+            table.loc[rows, ancestor] = values
+        table.loc[rows, level] = rows.to_numpy()
+
+    # Arrondissements directly under a region (Brussels) act as their own province
+    own = (table["level"] >= ARRONDISSEMENT) & table[PROVINCE].isna() & table[ARRONDISSEMENT].notna()
+    table.loc[own, PROVINCE] = table.loc[own, ARRONDISSEMENT]
+    return table
+
+
+def resolve_nis(codes: pd.Series, level: int, hierarchy: pd.DataFrame | None = None) -> pd.Series:
+    """Ancestor code at `level` for every NIS code in `codes` (see module docstring)."""
+    if level not in LEVELS:
+        raise ValueError(f"Unknown NIS level {level}, expected one of {LEVELS}")
+    table = load_hierarchy() if hierarchy is None else hierarchy
+
+    # Resolve each distinct code once
+    positions, uniques = pd.factorize(codes, use_na_sentinel=True)
+    numbers = pd.to_numeric(pd.Series(np.asarray(uniques, dtype=object)), errors="coerce").to_numpy()
+    numbers = np.where(np.isfinite(numbers) & (numbers == np.floor(numbers)), numbers, -1).astype(np.int64)
+
+    rows = table.index.get_indexer(numbers)
+    # Unknown municipality codes fall back to their arrondissement
+    fallback = (rows < 0) & (numbers > 0) & (numbers % 1000 != 0)
+    parent_rows = table.index.get_indexer(numbers // 1000 * 1000)
+    fallback &= (parent_rows >= 0) & (table["level"].to_numpy()[parent_rows] == ARRONDISSEMENT)
+    rows = np.where(fallback, parent_rows, rows)
+
+    column = table[level].to_numpy(dtype=object, na_value=None)
+    resolved = np.where(rows >= 0, column[rows], None)
+    if level == MUNICIPALITY:
+        resolved = np.where(fallback, numbers, resolved)
+    labels = np.array([None if v is None else str(v) for v in resolved] + [None], dtype=object)
+    return pd.Series(labels[positions], index=codes.index, name=codes.name)
+
+
+def nis_names(level: int, hierarchy: pd.DataFrame | None = None) -> dict[str, str]:
+    """{code: Dutch name} of every code at `level`, using its most recent name."""
+    table = load_hierarchy() if hierarchy is None else hierarchy
+    rows = table[table["level"] == level]
+    return dict(zip(rows.index.astype(str), rows["name"]))
@@ -0,0 +1,163 @@
+"""
+Content-addressed Parquet cache for parsed Statbel downloads.
+
+Statbel publishes its open data as ZIP archives that are re-downloaded on
+every pipeline run, even when nothing changed upstream. Parsing the XLSX or
+pipe-delimited TXT inside is the slow part, so the parsed frame is stored as
+Parquet under the SHA-256 of the archive. A later run that downloads a
+byte-identical archive memory-maps that Parquet file instead of parsing again.
+
+The key also holds a version of the parser (`version`). Callers bump it when
+their parse or build function changes, so an unchanged archive is parsed
+again instead of returning a frame in the old shape.
+
+Parquet support comes from pyarrow. When it is not installed the cache is
+silently disabled and every run parses the archive as before.
+"""
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Default cache directory name, created inside an analysis' data/ folder
+CACHE_DIR_NAME = ".parquet-cache"
+
+# Set to "0" to bypass the cache (always parse, never write)
+CACHE_ENV_VAR = "STATBEL_PARQUET_CACHE"
+
+_HASH_BLOCK_SIZE = 1 << 20
+
+
+@lru_cache(maxsize=32)
+def _file_sha256(path: Path, size: int, mtime_ns: int) -> str:
+    # Keyed on size and mtime too, so a rewritten file is hashed again
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def sha256_of(source: bytes | Path) -> str:
+    """Return the hex SHA-256 of raw bytes or of a file on disk.
+
+    File digests are memoized per process, so the frame and the artifacts
+    cached for one archive hash it only once.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(source).hexdigest()
+    path = Path(source).resolve()
+    stat = path.stat()
+    return _file_sha256(path, stat.st_size, stat.st_mtime_ns)
+
+
+def cache_enabled() -> bool:
+    return HAS_PYARROW and os.environ.get(CACHE_ENV_VAR, "1") != "0"
+
+
+def cache_path(cache_dir: Path, name: str, digest: str, version: int | str = 1) -> Path:
+    """Location of the cached frame for archive `name` with content `digest`, parsed by parser `version`."""
+    return cache_dir / f"{name}-v{version}-{digest}.parquet"
+
+
+def _prune(cache_dir: Path, name: str, keep: Path) -> None:
+    """Remove cached files of older versions of the same archive."""
+    for old in cache_dir.glob(f"{name}-*{keep.suffix}"):
+        if old != keep:
+            old.unlink(missing_ok=True)
+
+
+def load_or_parse(
+    source: bytes | Path,
+    parse: Callable[[], pd.DataFrame],
+    cache_dir: Path,
+    name: str,
+    version: int | str = 1,
+) -> pd.DataFrame:
+    """Return the parsed frame for `source`, using the Parquet cache when possible.
+
+    Args:
+        source: The downloaded archive, as bytes or as a path on disk.
+        parse: Callable that parses the archive into a DataFrame (cache miss).
+        cache_dir: Directory holding the cached Parquet files.
+        name: Stable name of the archive (e.g. "TF_BANKRUPTCIES"); only the
+            most recent cached version per name is kept.
+        version: Version of `parse`; bump it whenever `parse` returns
+            something different for the same archive.
+
+    Returns:
+        The parsed DataFrame, either freshly parsed or read from the cache.
+    """
+    if not cache_enabled():
+        return parse()
+
+    path = cache_path(cache_dir, name, sha256_of(source), version)
+    if path.exists():
+        try:
+            df = pd.read_parquet(path, memory_map=True)
+            print(f"Loaded {len(df)} cached rows from {path.name}")
+            return df
+        except Exception as e:
+            print(f"Ignoring unreadable cache file {path.name}: {e}")
+
+    df = parse()
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".parquet.tmp")
+    try:
+        df.to_parquet(tmp_path, index=False)
+        tmp_path.replace(path)
+        _prune(cache_dir, name, keep=path)
+    except Exception as e:
+        # Mixed-type object columns cannot always be stored; keep going uncached
+        tmp_path.unlink(missing_ok=True)
+        print(f"Could not cache {name}: {e}")
+    return df
+
+
+def load_or_build_json(
+    source: bytes | Path,
+    build: Callable[[], Any],
+    cache_dir: Path,
+    name: str,
+    version: int | str = 1,
+) -> Any:
+    """Return a JSON-serializable value derived from `source`, cached by its SHA-256.
+
+    Like `load_or_parse`, for small artifacts (lookup tables, metadata) that
+    are built from an archive: on an unchanged archive `build` is not called.
+    Stored as `<name>-v<version>-<digest>.json` in `cache_dir`; bump `version`
+    whenever `build` or the data it reads changes (e.g. "<parse>.<build>").
+    Does not need pyarrow.
+    """
+    if os.environ.get(CACHE_ENV_VAR, "1") == "0":
+        return build()
+
+    path = cache_dir / f"{name}-v{version}-{sha256_of(source)}.json"
+    if path.exists():
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable cache file {path.name}: {e}")
+
+    value = build()
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(value, f, ensure_ascii=False, separators=(",", ":"))
+    tmp_path.replace(path)
+    _prune(cache_dir, name, keep=path)
+    return value
@@ -0,0 +1,96 @@
+"""
+Multi-format writer for pipeline result frames.
+
+Pipelines wrote each result frame once per format in sequence (a JSON dump,
+then `to_csv` of the same frame), so the second write only started when the
+first was on disk. This module takes every result frame once and fans it out
+to all of its formats on a thread pool, so encoding one file overlaps with
+writing another:
+
+    write_results({
+        "yearly": (yearly_agg, (JSON, CSV)),
+        "quarterly": (quarterly_agg, (JSON, CSV)),
+    }, RESULTS_DIR)
+
+Formats:
+- JSON: compact record array (`write_json_records` with `record_columns`)
+- CSV: `to_csv(index=False)`; missing values are empty fields
+- PARQUET: `to_parquet(index=False)`, keeps the column dtypes
+
+Set RESULTS_PARQUET=1 to also write a Parquet copy of every result. Parquet
+support comes from pyarrow; without it Parquet files are skipped.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from json_records import record_columns, write_json_records
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+JSON = "json"
+CSV = "csv"
+PARQUET = "parquet"
+FORMATS = (JSON, CSV, PARQUET)
+
+# Set to "1" to write every result as Parquet as well
+PARQUET_ENV_VAR = "RESULTS_PARQUET"
+
+# Writers are I/O bound or release the GIL in their C loops
+DEFAULT_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+
+def _write_json(frame: pd.DataFrame, path: Path) -> int:
+    return write_json_records(frame, path, record_columns(frame))
+
+
+def _write_csv(frame: pd.DataFrame, path: Path) -> int:
+    frame.to_csv(path, index=False)
+    return path.stat().st_size
+
+
+def _write_parquet(frame: pd.DataFrame, path: Path) -> int:
+    frame.to_parquet(path, index=False)
+    return path.stat().st_size
+
+
+WRITERS = {JSON: _write_json, CSV: _write_csv, PARQUET: _write_parquet}
+
+
+def parquet_enabled() -> bool:
+    return HAS_PYARROW and os.environ.get(PARQUET_ENV_VAR, "0") == "1"
+
+
+def write_results(
+    results: dict[str, tuple[pd.DataFrame, tuple[str, ...]]],
+    out_dir: Path,
+    workers: int = DEFAULT_WORKERS,
+) -> dict[Path, int]:
+    """Write every `{stem: (frame, formats)}` result to `out_dir/<stem>.<format>`.
+
+    Frames are only read, never copied. Returns the bytes written per path;
+    the first failing writer's exception is raised after all writers finished.
+    """
+    jobs = []
+    for stem, (frame, formats) in results.items():
+        unknown = [fmt for fmt in formats if fmt not in FORMATS]
+        if unknown:
+            raise ValueError(f"Unknown result format(s) {unknown} for '{stem}', expected one of {FORMATS}")
+        formats = tuple(formats)
+        if parquet_enabled() and PARQUET not in formats:
+            formats += (PARQUET,)
+        if not HAS_PYARROW:
+            formats = tuple(fmt for fmt in formats if fmt != PARQUET)
+        jobs.extend((WRITERS[fmt], frame, out_dir / f"{stem}.{fmt}") for fmt in formats)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {path: pool.submit(writer, frame, path) for writer, frame, path in jobs}
+    return {path: future.result() for path, future in futures.items()}
@@ -0,0 +1,107 @@
+"""
+Column schema for the dimensions of Statbel open-data tables.
+
+Statbel TXT and XLSX files are read with their dimensions (NIS codes, NACE
+sections, duration classes, ...) as plain string columns, so every groupby
+hashes and compares millions of strings. A pipeline declares the type of
+each dimension column once and converts them right after reading:
+
+    SCHEMA = {
+        "CD_NACE_LVL1": (CATEGORY, NACE_SECTIONS),
+        "TX_COMPANY_DURATION_NL": (ORDINAL, DURATION_ORDER),
+        "CD_PROV_REFNIS": (INT, ()),
+    }
+    df = apply_schema(df, SCHEMA)
+
+Kinds:
+- CATEGORY: pandas Categorical whose categories are the sorted union of the
+  known vocabulary and the values seen in the data. Sorting and grouping
+  therefore give the same order as the original strings.
+- ORDINAL: ordered Categorical in vocabulary order; values outside the
+  vocabulary are appended after it in sorted order.
+- INT: nullable 32-bit integer (for codes Statbel stores as numbers).
+
+Values outside a vocabulary are never dropped. Group categorical columns with
+`observed=True` so categories without rows do not produce empty groups.
+"""
+
+import csv
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SHARED_DATA_DIR = Path(__file__).parent
+
+CATEGORY = "category"
+ORDINAL = "ordinal"
+INT = "int"
+KINDS = (CATEGORY, ORDINAL, INT)
+
+# Province codes (Brussels 21000 included), as in belgian-provinces.json
+with open(SHARED_DATA_DIR / "belgian-provinces.json", "r", encoding="utf-8") as f:
+    PROVINCE_CODES = tuple(json.load(f))
+
+# Region codes without leading zeros: Flemish, Walloon and Brussels-Capital Region
+REGION_CODES = ("2000", "3000", "4000")
+
+# NACE-BEL sections (level 1 of nace/nace_codes.csv)
+with open(SHARED_DATA_DIR / "nace" / "nace_codes.csv", "r", encoding="utf-8") as f:
+    NACE_SECTIONS = tuple(row["CODE"] for row in csv.DictReader(f) if row["LEVEL"] == "1")
+
+
+def category_dtype(values, vocabulary=(), ordered: bool = False) -> pd.CategoricalDtype:
+    """Categorical dtype covering `vocabulary` and the distinct `values`.
+
+    Nominal categories are sorted; ordered categories keep the vocabulary
+    order with unseen values appended in sorted order.
+    """
+    seen = set(values)
+    if ordered:
+        known = list(dict.fromkeys(vocabulary))
+        categories = known + sorted(seen.difference(known))
+    else:
+        categories = sorted(seen.union(vocabulary))
+    return pd.CategoricalDtype(categories, ordered=ordered)
+
+
+def to_category(series: pd.Series, vocabulary=(), ordered: bool = False) -> pd.Series:
+    """Convert a string column to a Categorical (see category_dtype)."""
+    # One hashing pass over the rows; everything else works on the distinct values
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    labels = [str(value) for value in uniques]
+    dtype = category_dtype(labels, vocabulary, ordered)
+    positions = np.append(dtype.categories.get_indexer(labels), -1)
+    return pd.Series(
+        pd.Categorical.from_codes(positions[codes], dtype=dtype), index=series.index, name=series.name
+    )
+
+
+def apply_schema(df: pd.DataFrame, schema: dict[str, tuple[str, tuple]]) -> pd.DataFrame:
+    """Return a copy of `df` with the schema's columns converted.
+
+    `schema` maps column -> (kind, vocabulary). Columns that are not in `df`
+    are skipped, since Statbel occasionally drops optional columns.
+    """
+    out = df.copy()
+    for col, (kind, vocabulary) in schema.items():
+        if kind not in KINDS:
+            raise ValueError(f"Unknown column kind '{kind}', expected one of {KINDS}")
+        if col not in out.columns:
+            continue
+        if kind == INT:
+            out[col] = pd.to_numeric(out[col], errors="coerce").astype("Int32")
+        else:
+            out[col] = to_category(out[col], vocabulary, ordered=kind == ORDINAL)
+    return out
+
+
+def decode_categories(df: pd.DataFrame) -> pd.DataFrame:
+    """Turn the Categorical columns of `df` back into plain value columns."""
+    decoded = {
+        col: df[col].astype(df[col].cat.categories.dtype)
+        for col in df.columns
+        if isinstance(df[col].dtype, pd.CategoricalDtype)
+    }
+    return df.assign(**decoded) if decoded else df
@@ -0,0 +1,134 @@
+"""
+Reader with projection and predicate pushdown for Statbel delimited TXT files.
+
+Statbel's pipe-delimited TXT exports were read whole with `dtype=str`, then
+typed and filtered, so the full all-string frame (every column, every row)
+was the peak memory of the pipeline. This reader parses only the requested
+columns, types them while parsing and drops the rows that fail the filters
+block by block, so only the kept rows of the kept columns are ever
+accumulated:
+
+    df = read_txt(
+        path,
+        {"CD_YEAR": INT, "CD_REFNIS": STR, "MS_TOTAL_TRANSACTIONS": FLOAT},
+        filters={"CD_PERIOD": {"Y", "Q1"}},
+    )
+
+Filter columns are read (and typed) like the other columns; a filter keeps
+the rows whose value is in its set. Columns that are only needed for
+filtering can be dropped afterwards by the caller.
+
+With pyarrow installed the file is parsed by pyarrow's streaming CSV reader,
+otherwise by pandas in `chunksize` row chunks. Both give the same frame:
+STR columns as strings with NA for empty fields, INT columns as Int64 and
+FLOAT columns as float64.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+STR = "str"
+INT = "int"
+FLOAT = "float"
+KINDS = (STR, INT, FLOAT)
+
+ENGINES = ("auto", "pyarrow", "pandas")
+
+# Rows per pandas chunk; bounds the unfiltered rows alive at any time
+DEFAULT_CHUNKSIZE = 200_000
+
+# Bytes per pyarrow block (same role as DEFAULT_CHUNKSIZE)
+DEFAULT_BLOCK_SIZE = 16 << 20
+
+_PANDAS_DTYPES = {STR: str, INT: "Int64", FLOAT: "float64"}
+
+
+def _check(columns: dict[str, str], filters: dict) -> None:
+    for col, kind in columns.items():
+        if kind not in KINDS:
+            raise ValueError(f"Unknown column kind '{kind}' for {col}, expected one of {KINDS}")
+    missing = [col for col in filters if col not in columns]
+    if missing:
+        raise KeyError(f"Filter columns must be read as well: {missing}")
+
+
+def _read_pandas(path, columns, filters, sep, encoding, chunksize) -> pd.DataFrame:
+    reader = pd.read_csv(
+        path,
+        sep=sep,
+        encoding=encoding,
+        usecols=list(columns),
+        dtype={col: _PANDAS_DTYPES[kind] for col, kind in columns.items()},
+        chunksize=chunksize,
+    )
+    kept = []
+    with reader:
+        for chunk in reader:
+            mask = pd.Series(True, index=chunk.index)
+            for col, values in filters.items():
+                mask &= chunk[col].isin(values)
+            kept.append(chunk[mask])
+    if not kept:
+        return pd.DataFrame({col: pd.Series(dtype=_PANDAS_DTYPES[kind]) for col, kind in columns.items()})
+    return pd.concat(kept, ignore_index=True)[list(columns)]
+
+
+def _read_pyarrow(path, columns, filters, sep, encoding, block_size) -> pd.DataFrame:
+    arrow_types = {STR: pa.string(), INT: pa.int64(), FLOAT: pa.float64()}
+    reader = pa_csv.open_csv(
+        path,
+        read_options=pa_csv.ReadOptions(encoding=encoding, block_size=block_size),
+        parse_options=pa_csv.ParseOptions(delimiter=sep),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=list(columns),
+            column_types={col: arrow_types[kind] for col, kind in columns.items()},
+            strings_can_be_null=True,
+        ),
+    )
+    value_sets = {
+        col: pa.array(sorted(values), type=arrow_types[columns[col]]) for col, values in filters.items()
+    }
+    kept = []
+    for batch in reader:
+        mask = None
+        for col, value_set in value_sets.items():
+            match = pc.fill_null(pc.is_in(batch.column(col), value_set=value_set), False)
+            mask = match if mask is None else pc.and_(mask, match)
+        kept.append(batch if mask is None else batch.filter(mask))
+    table = pa.Table.from_batches(kept, schema=reader.schema)
+    df = table.to_pandas()
+    return df.astype({col: _PANDAS_DTYPES[kind] for col, kind in columns.items()})
+
+
+def read_txt(
+    path: Path,
+    columns: dict[str, str],
+    filters: dict[str, set] | None = None,
+    sep: str = "|",
+    encoding: str = "latin-1",
+    engine: str = "auto",
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> pd.DataFrame:
+    """Read `columns` ({column: kind}) of a delimited file, keeping the rows that pass `filters`.
+
+    `filters` maps a column to the set of (typed) values to keep; all
+    filters must match. `engine` is "pyarrow", "pandas" or "auto" (pyarrow
+    when installed).
+    """
+    filters = filters or {}
+    _check(columns, filters)
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}', expected one of {ENGINES}")
+    if engine == "pyarrow" or (engine == "auto" and HAS_PYARROW):
+        return _read_pyarrow(path, columns, filters, sep, encoding, block_size)
+    return _read_pandas(path, columns, filters, sep, encoding, chunksize)
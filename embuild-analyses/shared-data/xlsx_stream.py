@@ -0,0 +1,98 @@
+"""
+Memory-bounded reader for the XLSX sheets inside Statbel ZIP archives.
+
+`pd.read_excel` materializes every cell of the sheet as a Python object
+before building the DataFrame, so its peak memory grows with the number of
+years Statbel publishes. This reader opens the workbook in openpyxl's
+read-only (streaming) mode straight from the ZIP on disk and yields typed
+DataFrame batches of at most `batch_size` rows, keeping only the requested
+columns.
+"""
+
+import zipfile
+from operator import itemgetter
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+from openpyxl import load_workbook
+
+# Rows per yielded batch; bounds the Python objects alive at any time
+DEFAULT_BATCH_SIZE = 50_000
+
+
+def find_member(zf: zipfile.ZipFile, suffix: str = ".xlsx") -> str:
+    """Name of the first archive member ending in `suffix`."""
+    for name in zf.namelist():
+        if name.lower().endswith(suffix):
+            return name
+    raise RuntimeError(f"No {suffix} file found in {zf.filename}")
+
+
+def _to_frame(rows: list[tuple], columns: list[str]) -> pd.DataFrame:
+    # Same per-column type inference as read_excel: numbers, or strings/objects
+    return pd.DataFrame.from_records(rows, columns=columns).infer_objects()
+
+
+def iter_xlsx_batches(
+    archive: Path,
+    member: str | None = None,
+    columns: list[str] | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[pd.DataFrame]:
+    """Yield the first sheet of an XLSX file inside a ZIP archive in row batches.
+
+    Args:
+        archive: Path to the ZIP archive on disk.
+        member: XLSX member to read; defaults to the first .xlsx in the archive.
+        columns: Header names to keep (in this order); all columns when None.
+        batch_size: Maximum number of rows per yielded DataFrame.
+
+    Yields:
+        DataFrames with the selected columns. Numeric columns come out as
+        int64/float64, text columns as strings.
+    """
+    with zipfile.ZipFile(archive) as zf:
+        with zf.open(member or find_member(zf)) as xlsx:
+            workbook = load_workbook(xlsx, read_only=True, data_only=True, keep_links=False)
+            try:
+                rows = workbook.worksheets[0].iter_rows(values_only=True)
+                header = [str(h) if h is not None else "" for h in next(rows, ())]
+                wanted = columns if columns is not None else [h for h in header if h]
+                missing = [c for c in wanted if c not in header]
+                if missing:
+                    raise KeyError(f"Columns not found in sheet: {missing}")
+                # Only the selected cells of each row are kept until the batch is built
+                select = itemgetter(*[header.index(c) for c in wanted])
+                width = len(header)
+
+                batch = []
+                for row in rows:
+                    # Read-only mode can report trailing rows without values
+                    if not any(v is not None for v in row):
+                        continue
+                    if len(row) < width:
+                        row = row + (None,) * (width - len(row))
+                    values = select(row)
+                    batch.append(values if len(wanted) > 1 else (values,))
+                    if len(batch) >= batch_size:
+                        yield _to_frame(batch, wanted)
+                        batch = []
+                if batch:
+                    yield _to_frame(batch, wanted)
+            finally:
+                workbook.close()
+
+
+def read_xlsx(
+    archive: Path,
+    member: str | None = None,
+    columns: list[str] | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> pd.DataFrame:
+    """Read the selected columns of an archived XLSX sheet batch by batch."""
+    batches = list(iter_xlsx_batches(archive, member, columns, batch_size))
+    if not batches:
+        return pd.DataFrame(columns=columns)
+    # A batch where a column is empty types it as object; settle dtypes across batches
+    return pd.concat(batches, ignore_index=True).infer_objects()
@@ -2,7 +2,16 @@
 
 import { useState, useEffect, useMemo } from "react"
 import { useRef } from "react"
-import { Project, ProjectMetadata, ProjectFilters, SortOption } from "@/types/project-types"
+import {
+  LegacyProjectListItem,
+  Project,
+  ProjectChunkItem,
+  ProjectDetailShard,
+  ProjectListItem,
+  ProjectMetadata,
+  ProjectFilters,
+  SortOption,
+} from "@/types/project-types"
 import { ProjectFiltersComponent } from "./ProjectFilters"
 import { ProjectList } from "./ProjectList"
 import { ProjectDetailModal } from "./ProjectDetailModal"
@@ -14,8 +23,80 @@ import {
 } from "@/components/ui/popover"
 import { Download, Code, Check, Copy } from "lucide-react"
 import { getBasePath } from "@/lib/path-utils"
+import {
+  SEARCH_MANIFEST,
+  SearchManifest,
+  SearchShard,
+  candidateIds,
+  chunksForIds,
+  shardPathsForQuery,
+} from "@/lib/search-index"
 
 const BASE_PATH = getBasePath()
+const DATA_PATH = `${BASE_PATH}/data/bouwprojecten-gemeenten`
+
+const NO_YEARLY_AMOUNTS: Project["yearly_per_capita"] = {
+  "2026": 0,
+  "2027": 0,
+  "2028": 0,
+  "2029": 0,
+  "2030": 0,
+  "2031": 0,
+}
+
+function hasInlineDetails(item: ProjectChunkItem): item is LegacyProjectListItem {
+  return typeof (item as ProjectListItem).bd !== "number"
+}
+
+// Detail shard of a chunk that still holds its texts inline: one BD/AP entry per row
+function inlineShard(items: LegacyProjectListItem[]): ProjectDetailShard {
+  return {
+    ac_long: items.map(item => item.ac_long ?? ""),
+    bd: items.map(item => [item.bd_code ?? "", item.bd_short ?? "", item.bd_long ?? ""]),
+    ap: items.map(item => [item.ap_code ?? "", item.ap_short ?? "", item.ap_long ?? ""]),
+  }
+}
+
+// Project from a list chunk; its texts stay empty until the detail shard is loaded,
+// unless the chunk still holds them inline
+function toProject(item: ProjectChunkItem, chunk: number, row: number): Project {
+  const inline = hasInlineDetails(item) ? item : null
+  return {
+    municipality: item.municipality,
+    nis_code: item.nis_code,
+    bd_code: inline?.bd_code ?? "",
+    bd_short: inline?.bd_short ?? "",
+    bd_long: inline?.bd_long ?? "",
+    ap_code: inline?.ap_code ?? "",
+    ap_short: inline?.ap_short ?? "",
+    ap_long: inline?.ap_long ?? "",
+    ac_code: item.ac_code,
+    ac_short: item.ac_short,
+    ac_long: inline?.ac_long ?? "",
+    total_amount: item.total_amount,
+    amount_per_capita: item.amount_per_capita,
+    yearly_amounts: item.yearly_amounts,
+    yearly_per_capita: item.yearly_per_capita ?? NO_YEARLY_AMOUNTS,
+    categories: item.categories,
+    chunk,
+    row,
+  }
+}
+
+function withDetails(project: Project, item: ProjectListItem, shard: ProjectDetailShard): Project {
+  const [bd_code, bd_short, bd_long] = shard.bd[item.bd]
+  const [ap_code, ap_short, ap_long] = shard.ap[item.ap]
+  return {
+    ...project,
+    bd_code,
+    bd_short,
+    bd_long,
+    ap_code,
+    ap_short,
+    ap_long,
+    ac_long: shard.ac_long[project.row!],
+  }
+}
 
 export function ProjectBrowser() {
   const [projects, setProjects] = useState<Project[]>([])
@@ -24,6 +105,13 @@ export function ProjectBrowser() {
   const [failedChunks, setFailedChunks] = useState<Set<number>>(new Set())
   // Track in-flight chunk loads to avoid concurrent fetches for the same chunk
   const loadingChunksRef = useRef<Set<number>>(new Set())
+  // List items per loaded chunk, and the (pending) detail shard loads
+  const chunkItemsRef = useRef<Map<number, ProjectChunkItem[]>>(new Map())
+  const detailShardsRef = useRef<Map<number, ProjectDetailShard>>(new Map())
+  const loadingDetailsRef = useRef<Map<number, Promise<ProjectDetailShard | null>>>(new Map())
+  // Search index manifest and shards, fetched once each
+  const searchManifestRef = useRef<Promise<SearchManifest | null> | null>(null)
+  const searchShardsRef = useRef<Map<string, Promise<SearchShard | null>>>(new Map())
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
 
@@ -47,7 +135,7 @@ export function ProjectBrowser() {
 
   const loadMetadata = async () => {
     try {
-      const response = await fetch(`${BASE_PATH}/data/bouwprojecten-gemeenten/projects_metadata.json`)
+      const response = await fetch(`${DATA_PATH}/projects_metadata.json`)
       if (!response.ok) throw new Error("Failed to load metadata")
       const data = await response.json()
       setMetadata(data)
@@ -71,20 +159,22 @@ export function ProjectBrowser() {
         const timeoutId = setTimeout(() => controller.abort(), 30000) // 30s timeout
 
         const response = await fetch(
-          `${BASE_PATH}/data/bouwprojecten-gemeenten/projects_2026_chunk_${chunkIndex}.json`,
+          `${DATA_PATH}/projects_2026_chunk_${chunkIndex}.json`,
           { signal: controller.signal }
         )
         clearTimeout(timeoutId)
 
         if (!response.ok) throw new Error(`HTTP ${response.status}`)
-        const data = await response.json()
+        const items: ProjectChunkItem[] = await response.json()
+        chunkItemsRef.current.set(chunkIndex, items)
+        const data = items.map((item, row) => toProject(item, chunkIndex, row))
 
         // Append new projects and mark chunk as loaded
         setProjects(prev => {
           // Prevent duplicates by appending only projects that are not already present
           // Use a short-circuit key map based on nis_code+ac_code+ac_short
           const existingKeys = new Set(prev.map(p => `${p.nis_code}||${p.ac_code}||${p.ac_short}`))
-          const toAdd = data.filter((p: Project) => !existingKeys.has(`${p.nis_code}||${p.ac_code}||${p.ac_short}`))
+          const toAdd = data.filter(p => !existingKeys.has(`${p.nis_code}||${p.ac_code}||${p.ac_short}`))
           return [...prev, ...toAdd]
         })
         setLoadedChunks(prev => new Set([...prev, chunkIndex]))
@@ -108,6 +198,96 @@ export function ProjectBrowser() {
     return false
   }
 
+  // Load the long texts of a loaded chunk (once; a failed load is retried on the next call)
+  const loadDetails = (chunkIndex: number): Promise<ProjectDetailShard | null> => {
+    const pending = loadingDetailsRef.current.get(chunkIndex)
+    if (pending) return pending
+
+    // Chunks written before the detail shards carry their texts: nothing to fetch
+    const loadedItems = chunkItemsRef.current.get(chunkIndex)
+    if (loadedItems && loadedItems.every(hasInlineDetails)) {
+      const shard = inlineShard(loadedItems)
+      detailShardsRef.current.set(chunkIndex, shard)
+      const resolved = Promise.resolve(shard)
+      loadingDetailsRef.current.set(chunkIndex, resolved)
+      return resolved
+    }
+
+    const promise = fetch(`${DATA_PATH}/projects_2026_details_${chunkIndex}.json`)
+      .then(response => {
+        if (!response.ok) throw new Error(`HTTP ${response.status}`)
+        return response.json() as Promise<ProjectDetailShard>
+      })
+      .then(shard => {
+        detailShardsRef.current.set(chunkIndex, shard)
+        const items = (chunkItemsRef.current.get(chunkIndex) ?? []) as ProjectListItem[]
+        setProjects(prev => prev.map(p =>
+          p.chunk === chunkIndex && items[p.row!] ? withDetails(p, items[p.row!], shard) : p
+        ))
+        return shard
+      })
+      .catch(err => {
+        console.error(`Error loading details of chunk ${chunkIndex}:`, err)
+        loadingDetailsRef.current.delete(chunkIndex)
+        return null
+      })
+    loadingDetailsRef.current.set(chunkIndex, promise)
+    return promise
+  }
+
+  const fetchSearchFile = <T,>(path: string): Promise<T | null> =>
+    fetch(`${DATA_PATH}/${path}`)
+      .then(response => {
+        if (!response.ok) throw new Error(`HTTP ${response.status}`)
+        return response.json() as Promise<T>
+      })
+      .catch(err => {
+        console.error(`Error loading search index ${path}:`, err)
+        return null
+      })
+
+  // Chunks holding the index matches of a query; null when the index cannot answer it
+  const searchChunks = async (query: string): Promise<number[] | null> => {
+    if (!searchManifestRef.current) {
+      searchManifestRef.current = fetchSearchFile<SearchManifest>(SEARCH_MANIFEST)
+    }
+    const manifest = await searchManifestRef.current
+    if (!manifest) {
+      searchManifestRef.current = null
+      return null
+    }
+    const paths = shardPathsForQuery(manifest, query)
+    if (!paths) return null
+
+    const loaded = await Promise.all(paths.map(path => {
+      if (!searchShardsRef.current.has(path)) {
+        searchShardsRef.current.set(path, fetchSearchFile<SearchShard>(path))
+      }
+      return searchShardsRef.current.get(path)!
+    }))
+    const shards = new Map<string, SearchShard>()
+    for (const [i, shard] of loaded.entries()) {
+      if (!shard) {
+        // Retried on the next search
+        searchShardsRef.current.delete(paths[i])
+        return null
+      }
+      shards.set(paths[i], shard)
+    }
+    const ids = candidateIds(manifest, query, shards)
+    return ids && chunksForIds(manifest, ids)
+  }
+
+  const loadDetailsOf = (shown: Project[]) => {
+    const chunks = new Set(shown.map(p => p.chunk).filter((c): c is number => c !== undefined))
+    return Promise.all([...chunks].map(loadDetails))
+  }
+
+  const openProject = (project: Project) => {
+    setSelectedProject(project)
+    if (project.chunk !== undefined) loadDetails(project.chunk)
+  }
+
   // Load all remaining chunks in parallel
   const loadAllChunks = async () => {
     if (!metadata) return
@@ -148,7 +328,10 @@ export function ProjectBrowser() {
       filtered = filtered.filter(p =>
         p.ac_short.toLowerCase().includes(query) ||
         p.ac_long.toLowerCase().includes(query) ||
-        p.municipality.toLowerCase().includes(query)
+        p.municipality.toLowerCase().includes(query) ||
+        p.categories.some(cat =>
+          `${cat} ${metadata?.categories[cat]?.label ?? cat}`.toLowerCase().includes(query)
+        )
       )
     }
 
@@ -169,7 +352,7 @@ export function ProjectBrowser() {
     })
 
     return sorted
-  }, [projects, filters, sortOption])
+  }, [projects, filters, sortOption, metadata])
 
   const totalFilteredAmount = useMemo(() => {
     return filteredAndSortedProjects.reduce((sum, p) => sum + p.total_amount, 0)
@@ -180,6 +363,30 @@ export function ProjectBrowser() {
     (filters.categories && filters.categories.length > 0) ||
     filters.searchQuery
 
+  // Searching also matches descriptions, so it needs the details of every loaded chunk
+  useEffect(() => {
+    if (filters.searchQuery) loadedChunks.forEach(chunk => loadDetails(chunk))
+  }, [filters.searchQuery, loadedChunks])
+
+  // Load the chunks holding index matches of the search, instead of every chunk
+  useEffect(() => {
+    const query = filters.searchQuery
+    if (!query || !metadata || loadedChunks.size >= metadata.chunks) return
+    let cancelled = false
+    searchChunks(query).then(chunks => {
+      if (cancelled || !chunks) return
+      chunks.filter(chunk => !chunkItemsRef.current.has(chunk)).forEach(chunk => loadChunk(chunk))
+    })
+    return () => {
+      cancelled = true
+    }
+  }, [filters.searchQuery, metadata])
+
+  // The selected project, with its texts once its detail shard is loaded
+  const selectedWithDetails = selectedProject
+    ? projects.find(p => p.chunk === selectedProject.chunk && p.row === selectedProject.row) ?? selectedProject
+    : null
+
   const getEmbedCode = (): string => {
     const baseUrl = typeof window !== "undefined"
       ? window.location.origin + getBasePath()
@@ -239,7 +446,11 @@ export function ProjectBrowser() {
     }
   }
 
-  const handleExportCSV = () => {
+  const handleExportCSV = async () => {
+    await loadDetailsOf(filteredAndSortedProjects)
+    const acLong = (p: Project) =>
+      (p.chunk !== undefined ? detailShardsRef.current.get(p.chunk)?.ac_long[p.row!] : undefined) ?? p.ac_long
+
     const headers = [
       "Gemeente",
       "NIS Code",
@@ -269,7 +480,7 @@ export function ProjectBrowser() {
       p.yearly_amounts["2029"].toFixed(2),
       p.yearly_amounts["2030"].toFixed(2),
       p.yearly_amounts["2031"].toFixed(2),
-      `"${p.ac_long.replace(/"/g, '""')}"`
+      `"${acLong(p).replace(/"/g, '""')}"`
     ])
 
     const csv = [
@@ -430,17 +641,18 @@ export function ProjectBrowser() {
           {/* Project List */}
           <ProjectList
             projects={filteredAndSortedProjects}
-            onProjectClick={setSelectedProject}
+            onProjectClick={openProject}
+            onDisplayedProjectsChange={loadDetailsOf}
             loading={loading}
           />
         </>
       )}
 
       {/* Detail Modal */}
-      {selectedProject && (
+      {selectedWithDetails && (
         <ProjectDetailModal
-          project={selectedProject}
-          isOpen={!!selectedProject}
+          project={selectedWithDetails}
+          isOpen={!!selectedWithDetails}
           onClose={() => setSelectedProject(null)}
           metadata={metadata}
         />
@@ -1,6 +1,6 @@
 "use client"
 
-import { useState } from "react"
+import { useEffect, useMemo, useState } from "react"
 import { Project } from "@/types/project-types"
 import { ProjectCard } from "./ProjectCard"
 import { Button } from "@/components/ui/button"
@@ -8,15 +8,22 @@ import { Button } from "@/components/ui/button"
 interface ProjectListProps {
   projects: Project[]
   onProjectClick: (project: Project) => void
+  // Called with the projects on screen, e.g. to load their descriptions
+  onDisplayedProjectsChange?: (projects: Project[]) => void
   loading?: boolean
 }
 
 const ITEMS_PER_PAGE = 50
 
-export function ProjectList({ projects, onProjectClick, loading }: ProjectListProps) {
+export function ProjectList({ projects, onProjectClick, onDisplayedProjectsChange, loading }: ProjectListProps) {
   const [displayCount, setDisplayCount] = useState(ITEMS_PER_PAGE)
 
-  const displayedProjects = projects.slice(0, displayCount)
+  const displayedProjects = useMemo(() => projects.slice(0, displayCount), [projects, displayCount])
+
+  useEffect(() => {
+    onDisplayedProjectsChange?.(displayedProjects)
+  }, [displayedProjects])
+
   const hasMore = displayCount < projects.length
 
   const handleLoadMore = () => {
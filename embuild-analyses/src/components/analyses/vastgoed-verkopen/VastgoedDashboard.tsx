@@ -17,6 +17,7 @@ import {
 import { Popover, PopoverContent, PopoverTrigger } from "@/components/ui/popover"
 import { cn } from "@/lib/utils"
 import { getBasePath } from "@/lib/path-utils"
+import { indexedKeys, seriesPath, type ChunkManifest } from "@/lib/chunk-index"
 import { GeoProvider } from "../shared/GeoContext"
 import { FilterableChart } from "../shared/FilterableChart"
 import { FilterableTable } from "../shared/FilterableTable"
@@ -118,6 +119,7 @@ function useVastgoedData() {
   const [quarterlyData, setQuarterlyData] = React.useState<QuarterlyRow[] | null>(null)
   const [municipalitiesData, setMunicipalitiesData] = React.useState<any[] | null>(null)
   const [lookupsData, setLookupsData] = React.useState<any | null>(null)
+  const [manifest, setManifest] = React.useState<ChunkManifest | null>(null)
   const [loading, setLoading] = React.useState(true)
   const [error, setError] = React.useState<string | null>(null)
 
@@ -148,23 +150,25 @@ function useVastgoedData() {
         }
 
         // Load metadata first to know how many chunks
-        const metadata = await fetchWithTimeout(`${basePath}/data/vastgoed-verkopen/metadata.json`)
+        const metadata: ChunkManifest = await fetchWithTimeout(`${basePath}/data/vastgoed-verkopen/metadata.json`)
 
-        console.log(`Loading vastgoed data: ${metadata.quarterly_chunks} quarterly chunks`)
+        // With per-entity series files, quarterly data is loaded per selection (useQuarterlySeries)
+        const chunkCount = metadata.series && metadata.index ? 0 : metadata.quarterly_chunks
+        console.log(`Loading vastgoed data: ${chunkCount} quarterly chunks`)
 
         // Load all data in parallel
         const [yearly, municipalities, lookups, ...quarterlyChunks] = await Promise.all([
           fetchWithTimeout(`${basePath}/data/vastgoed-verkopen/yearly.json`),
           fetchWithTimeout(`${basePath}/data/vastgoed-verkopen/municipalities.json`),
           fetchWithTimeout(`${basePath}/data/vastgoed-verkopen/lookups.json`),
-          ...Array.from({ length: metadata.quarterly_chunks }, (_, i) =>
+          ...Array.from({ length: chunkCount }, (_, i) =>
             fetchWithTimeout(`${basePath}/data/vastgoed-verkopen/quarterly_chunk_${i}.json`)
           )
         ])
 
         // Merge quarterly chunks
         const quarterly = quarterlyChunks.flat()
-        console.log(`Loaded ${quarterly.length} quarterly records from ${metadata.quarterly_chunks} chunks`)
+        console.log(`Loaded ${quarterly.length} quarterly records from ${chunkCount} chunks`)
 
         // Only update state if component is still mounted
         if (isMounted) {
@@ -172,6 +176,7 @@ function useVastgoedData() {
           setQuarterlyData(quarterly)
           setMunicipalitiesData(municipalities)
           setLookupsData(lookups)
+          setManifest(metadata)
           setLoading(false)
         }
       } catch (err) {
@@ -192,7 +197,44 @@ function useVastgoedData() {
     }
   }, [])
 
-  return { yearlyData, quarterlyData, municipalitiesData, lookupsData, loading, error }
+  return { yearlyData, quarterlyData, municipalitiesData, lookupsData, manifest, loading, error }
+}
+
+// Quarterly records of the selected geo from its series file (null when there are no series files)
+function useQuarterlySeries(
+  manifest: ChunkManifest | null,
+  level: "belgium" | "region" | "province" | "municipality",
+  nis: string | null
+): QuarterlyRow[] | null {
+  const [rows, setRows] = React.useState<QuarterlyRow[] | null>(null)
+
+  React.useEffect(() => {
+    if (!manifest?.series || !manifest.index) return
+
+    const keys = filterQuarterlyByGeo(indexedKeys(manifest), level, nis)
+    const series = keys.length === 1 ? seriesPath(manifest, keys[0].nis) : null
+    if (!series) {
+      setRows([])
+      return
+    }
+
+    const abortController = new AbortController()
+    fetch(`${getBasePath()}/data/vastgoed-verkopen/${series}`, { signal: abortController.signal })
+      .then((r) => {
+        if (!r.ok) throw new Error(`Failed to load ${series}: ${r.status}`)
+        return r.json()
+      })
+      .then((data: QuarterlyRow[]) => setRows(data))
+      .catch((err) => {
+        if (err instanceof Error && err.name === "AbortError") return
+        console.error("Error loading vastgoed series:", err)
+        setRows([])
+      })
+
+    return () => abortController.abort()
+  }, [manifest, level, nis])
+
+  return rows
 }
 
 function usePropertyTypeOptions(lookupsData: any): PropertyType[] {
@@ -418,7 +460,7 @@ function filterQuarterlyByType(rows: QuarterlyRow[], type: string): QuarterlyRow
   return rows.filter((r) => r.type === type)
 }
 
-function filterQuarterlyByGeo(rows: QuarterlyRow[], level: "belgium" | "region" | "province" | "municipality", nis: string | null): QuarterlyRow[] {
+function filterQuarterlyByGeo<T extends { lvl: number; nis: string }>(rows: T[], level: "belgium" | "region" | "province" | "municipality", nis: string | null): T[] {
   if (level === "belgium") {
     return rows.filter((r) => r.lvl === 1)
   }
@@ -842,9 +884,10 @@ function QuarterlyMetricSection({
 
 // Main Dashboard Component
 function InnerDashboard() {
-  const { yearlyData, quarterlyData, municipalitiesData, lookupsData, loading, error } = useVastgoedData()
+  const { yearlyData, quarterlyData, municipalitiesData, lookupsData, manifest, loading, error } = useVastgoedData()
   const [geoLevel, setGeoLevel] = React.useState<"belgium" | "region" | "province" | "municipality">("belgium")
   const [selectedNis, setSelectedNis] = React.useState<string | null>(null)
+  const seriesRows = useQuarterlySeries(manifest, geoLevel, selectedNis)
   const [selectedType, setSelectedType] = React.useState<string>("alle_huizen")
   const [mounted, setMounted] = React.useState(false)
 
@@ -887,7 +930,7 @@ function InnerDashboard() {
   }
 
   const yearlyRows = yearlyData
-  const quarterlyRows = quarterlyData
+  const quarterlyRows = seriesRows ?? quarterlyData
 
   // Filter data
   const filteredYearly = React.useMemo(() => {
@@ -4,6 +4,7 @@ import { useMemo, useState, useEffect } from "react"
 import { FilterableChart } from "../shared/FilterableChart"
 import { FilterableTable } from "../shared/FilterableTable"
 import { getBasePath } from "@/lib/path-utils"
+import { chunksForKeys, indexedKeys, seriesPath, type ChunkManifest } from "@/lib/chunk-index"
 
 import yearlyRaw from "../../../../analyses/vastgoed-verkopen/results/yearly.json"
 
@@ -71,7 +72,7 @@ function filterYearlyByGeo(rows: YearlyRow[], geo: string | null | undefined): Y
   return rows.filter((r) => r.lvl === 1)
 }
 
-function filterQuarterlyByGeo(rows: QuarterlyRow[], geo: string | null | undefined): QuarterlyRow[] {
+function filterQuarterlyByGeo<T extends { lvl: number; nis: string }>(rows: T[], geo: string | null | undefined): T[] {
   const { level, code } = inferGeoLevelAndCode(geo)
   if (level === "belgium") return rows.filter((r) => r.lvl === 1)
   if (level === "region" && code) {
@@ -146,19 +147,30 @@ export function VastgoedVerkopenEmbed({
       setLoading(true)
       try {
         const basePath = getBasePath()
-        const metadata = await fetch(`${basePath}/data/vastgoed-verkopen/metadata.json`, {
+        const metadata: ChunkManifest = await fetch(`${basePath}/data/vastgoed-verkopen/metadata.json`, {
           signal: abortController.signal,
         }).then((r) => r.json())
 
-        const chunks = await Promise.all(
-          Array.from({ length: metadata.quarterly_chunks }, (_, i) =>
-            fetch(`${basePath}/data/vastgoed-verkopen/quarterly_chunk_${i}.json`, {
-              signal: abortController.signal,
-            }).then((r) => r.json())
+        const keys = filterQuarterlyByGeo(indexedKeys(metadata), geo)
+        const series = keys.length === 1 ? seriesPath(metadata, keys[0].nis) : null
+
+        let quarterly: QuarterlyRow[]
+        if (series) {
+          // One small file with every quarter of the selected geo
+          quarterly = await fetch(`${basePath}/data/vastgoed-verkopen/${series}`, {
+            signal: abortController.signal,
+          }).then((r) => r.json())
+        } else {
+          // Chunks are partitioned per geographic entity: only load the ones holding the selected geo
+          const chunks = await Promise.all(
+            chunksForKeys(metadata, keys).map((i) =>
+              fetch(`${basePath}/data/vastgoed-verkopen/quarterly_chunk_${i}.json`, {
+                signal: abortController.signal,
+              }).then((r) => r.json())
+            )
           )
-        )
-
-        const quarterly = chunks.flat()
+          quarterly = chunks.flat()
+        }
         if (isMounted) {
           setQuarterlyRows(quarterly)
           setLoading(false)
@@ -177,7 +189,7 @@ export function VastgoedVerkopenEmbed({
       isMounted = false
       abortController.abort()
     }
-  }, [needsQuarterly])
+  }, [needsQuarterly, geo])
 
   // Filter by geo + property type
   const filteredYearly = useMemo(() => {
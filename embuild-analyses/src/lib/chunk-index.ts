@@ -0,0 +1,66 @@
+/**
+ * Key index for partitioned data chunks
+ *
+ * Written by scripts/chunk-vastgoed-data.py. Records are partitioned per
+ * geographic entity; `index` maps each NIS code to
+ * [lvl, chunk, offset, length, records]. The entity's records are the bytes
+ * offset..offset+length of `quarterly_chunk_<chunk>.json`: a comma-separated
+ * list of JSON objects (without the array brackets).
+ *
+ * When the pipeline also wrote per-entity series files, `series` holds their
+ * path pattern (e.g. "series/{nis}.json"): one small file with all records of
+ * one NIS code.
+ */
+
+export type ChunkIndexEntry = [lvl: number, chunk: number, offset: number, length: number, records: number]
+
+export interface ChunkManifest {
+  quarterly_chunks: number
+  index?: Record<string, ChunkIndexEntry>
+  series?: string
+}
+
+export interface ChunkKey {
+  nis: string
+  lvl: number
+}
+
+/**
+ * Keys listed in the manifest index (empty when the manifest has no index)
+ */
+export function indexedKeys(manifest: ChunkManifest): ChunkKey[] {
+  return Object.entries(manifest.index ?? {}).map(([nis, entry]) => ({ nis, lvl: entry[0] }))
+}
+
+/**
+ * Chunk numbers holding the given keys, in ascending order.
+ * Falls back to every chunk when the manifest has no index.
+ */
+export function chunksForKeys(manifest: ChunkManifest, keys: ChunkKey[]): number[] {
+  if (!manifest.index) {
+    return Array.from({ length: manifest.quarterly_chunks }, (_, i) => i)
+  }
+  const chunks = new Set<number>()
+  for (const key of keys) {
+    const entry = manifest.index[key.nis]
+    if (entry) chunks.add(entry[1])
+  }
+  return Array.from(chunks).sort((a, b) => a - b)
+}
+
+/**
+ * Parse the records of one index entry from a byte range of its chunk
+ * (e.g. fetched with a `Range: bytes=offset-(offset+length-1)` header)
+ */
+export function parseIndexedRange<T>(text: string): T[] {
+  return JSON.parse(`[${text}]`) as T[]
+}
+
+/**
+ * Path of the series file holding all records of one NIS code,
+ * or null when the manifest lists no series files
+ */
+export function seriesPath(manifest: ChunkManifest, nis: string): string | null {
+  if (!manifest.series || !manifest.index?.[nis]) return null
+  return manifest.series.replace("{nis}", encodeURIComponent(nis))
+}
@@ -0,0 +1,73 @@
+/**
+ * Decoder for dictionary-encoded columnar JSON results
+ *
+ * Written by shared-data/json_columnar.py. A payload stores one array per
+ * column; columns listed in `dictionaries` hold integer codes into that
+ * column's dictionary (-1 = null), all other columns hold their values as-is.
+ */
+
+export type ColumnarValue = string | number | null
+
+export interface ColumnarPayload {
+  format: "columnar"
+  version: 1
+  length: number
+  columns: Record<string, ColumnarValue[]>
+  dictionaries: Record<string, string[]>
+}
+
+/**
+ * Check whether a JSON value is a columnar payload (as opposed to a record array)
+ */
+export function isColumnarPayload(value: unknown): value is ColumnarPayload {
+  return (
+    typeof value === "object" &&
+    value !== null &&
+    !Array.isArray(value) &&
+    (value as { format?: unknown }).format === "columnar"
+  )
+}
+
+/**
+ * Decode a single column to its values (dictionary codes resolved)
+ */
+export function decodeColumn(payload: ColumnarPayload, key: string): ColumnarValue[] {
+  const values = payload.columns[key]
+  if (!values) {
+    throw new Error(`Unknown column: ${key}`)
+  }
+  const labels = payload.dictionaries[key]
+  if (!labels) {
+    return values
+  }
+  return values.map((code) => (code === null || (code as number) < 0 ? null : labels[code as number]))
+}
+
+/**
+ * Decode a columnar payload into an array of records
+ */
+export function decodeColumnar<T = Record<string, ColumnarValue>>(payload: ColumnarPayload): T[] {
+  if (payload.format !== "columnar" || payload.version !== 1) {
+    throw new Error(`Unsupported payload: ${payload.format} v${payload.version}`)
+  }
+
+  const keys = Object.keys(payload.columns)
+  const columns = keys.map((key) => decodeColumn(payload, key))
+  const rows: T[] = new Array(payload.length)
+
+  for (let i = 0; i < payload.length; i++) {
+    const row: Record<string, ColumnarValue> = {}
+    for (let k = 0; k < keys.length; k++) {
+      row[keys[k]] = columns[k][i]
+    }
+    rows[i] = row as T
+  }
+  return rows
+}
+
+/**
+ * Accept either a record array or a columnar payload and return records
+ */
+export function toRecords<T = Record<string, ColumnarValue>>(data: T[] | ColumnarPayload): T[] {
+  return isColumnarPayload(data) ? decodeColumnar<T>(data) : data
+}
@@ -0,0 +1,78 @@
+/**
+ * Typed-array views on the vastgoed-verkopen quarterly cube
+ *
+ * Written by analyses/vastgoed-verkopen/src/quarterly_cube.py. The header
+ * (`quarterly_cube.json`) describes a dense (entity, type, quarter) cube whose
+ * arrays lie back to back in `quarterly_cube.bin` as little-endian Int32
+ * (counts, -1 = no record) and Float32 (prices, NaN = no value). The arrays
+ * are used as views on the fetched ArrayBuffer, without a parse step.
+ */
+
+export type CubeDtype = "int32" | "float32"
+
+export interface CubeArrayEntry {
+  name: string
+  dtype: CubeDtype
+  offset: number
+  missing: number | null
+}
+
+export interface CubeHeader {
+  version: 1
+  byte_order: "little"
+  file: string
+  bytes: number
+  dims: ["entity", "type", "quarter"]
+  shape: [entities: number, types: number, quarters: number]
+  entities: { lvl: number[]; nis: string[]; name: (string | null)[] }
+  types: string[]
+  quarters: [year: number, quarter: number][]
+  arrays: CubeArrayEntry[]
+}
+
+export type CubeArrays = Record<string, Int32Array | Float32Array>
+
+/**
+ * Views on every array of the cube in `buffer` (the contents of `header.file`)
+ */
+export function cubeArrays(header: CubeHeader, buffer: ArrayBuffer): CubeArrays {
+  if (header.version !== 1) {
+    throw new Error(`Unsupported cube version: ${header.version}`)
+  }
+  if (buffer.byteLength !== header.bytes) {
+    throw new Error(`Cube has ${buffer.byteLength} bytes, header expects ${header.bytes}`)
+  }
+  // Typed arrays use the platform byte order, which is little-endian on all supported browsers
+  const size = header.shape[0] * header.shape[1] * header.shape[2]
+  const arrays: CubeArrays = {}
+  for (const entry of header.arrays) {
+    arrays[entry.name] =
+      entry.dtype === "int32" ? new Int32Array(buffer, entry.offset, size) : new Float32Array(buffer, entry.offset, size)
+  }
+  return arrays
+}
+
+/**
+ * Flat index of the first quarter of (entity, type); the following
+ * `header.shape[2]` values are the entity's quarters in order
+ */
+export function cubeOffset(header: CubeHeader, entity: number, type: number): number {
+  return (entity * header.shape[1] + type) * header.shape[2]
+}
+
+/**
+ * Fetch a cube header and its binary file
+ */
+export async function fetchCube(
+  headerUrl: string,
+  init?: RequestInit
+): Promise<{ header: CubeHeader; arrays: CubeArrays }> {
+  const headerResponse = await fetch(headerUrl, init)
+  if (!headerResponse.ok) throw new Error(`Failed to load ${headerUrl}: ${headerResponse.status}`)
+  const header = (await headerResponse.json()) as CubeHeader
+
+  const binUrl = new URL(header.file, new URL(headerUrl, window.location.href)).toString()
+  const binResponse = await fetch(binUrl, init)
+  if (!binResponse.ok) throw new Error(`Failed to load ${binUrl}: ${binResponse.status}`)
+  return { header, arrays: cubeArrays(header, await binResponse.arrayBuffer()) }
+}
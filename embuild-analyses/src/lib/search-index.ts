@@ -0,0 +1,105 @@
+/**
+ * Trigram search index of the bouwprojecten list chunks
+ *
+ * Written by analyses/bouwprojecten-gemeenten/src/search_index.py next to the
+ * chunks: `search/manifest.json` and one `search/trigrams_<key>.json` shard per
+ * shard key, mapping each trigram to the delta-encoded sorted ids of the
+ * projects holding it. Project `id` is row `id % chunk_size` of chunk
+ * `id / chunk_size`.
+ *
+ * The index matches ac_short, municipality and categories. Its candidates may
+ * hold the trigrams apart, so the caller still filters the rows of their chunks.
+ */
+
+export interface SearchManifest {
+  ngram: number
+  chunk_size: number
+  chunk_file: string
+  total_projects: number
+  shard_file: string
+  shards: string[]
+}
+
+/** trigram -> delta-encoded project ids */
+export type SearchShard = Record<string, number[]>
+
+export const SEARCH_DIR = "search"
+export const SEARCH_MANIFEST = `${SEARCH_DIR}/manifest.json`
+
+const KEY_CHARS = /[a-z0-9]/
+
+/**
+ * Distinct n-grams of a (lowercased) query
+ */
+export function queryNgrams(needle: string, n: number): string[] {
+  const grams = new Set<string>()
+  for (let i = 0; i + n <= needle.length; i++) grams.add(needle.slice(i, i + n))
+  return Array.from(grams).sort()
+}
+
+/**
+ * Shard of an n-gram: its first two characters, with characters outside [a-z0-9] as "_"
+ */
+export function shardKey(gram: string): string {
+  return Array.from(gram.slice(0, 2)).map(c => (KEY_CHARS.test(c) ? c : "_")).join("")
+}
+
+/**
+ * Paths (relative to the data dir) of the shards a query needs, or null when
+ * the query is shorter than the n-grams. Keys missing from the manifest mean
+ * nothing matches; they are left out.
+ */
+export function shardPathsForQuery(manifest: SearchManifest, query: string): string[] | null {
+  const needle = query.toLowerCase()
+  if (needle.length < manifest.ngram) return null
+  const available = new Set(manifest.shards)
+  const keys = new Set(queryNgrams(needle, manifest.ngram).map(shardKey).filter(key => available.has(key)))
+  return Array.from(keys).map(key => `${SEARCH_DIR}/${manifest.shard_file.replace("{key}", key)}`)
+}
+
+export function decodeIds(deltas: number[]): number[] {
+  const ids: number[] = []
+  let total = 0
+  for (const delta of deltas) {
+    total += delta
+    ids.push(total)
+  }
+  return ids
+}
+
+/**
+ * Sorted ids of the projects holding every n-gram of the query, or null when
+ * the query is too short for the index
+ *
+ * @param shards Loaded shards by path, as returned by shardPathsForQuery
+ */
+export function candidateIds(
+  manifest: SearchManifest,
+  query: string,
+  shards: Map<string, SearchShard>
+): number[] | null {
+  const needle = query.toLowerCase()
+  if (needle.length < manifest.ngram) return null
+
+  let candidates: number[] | null = null
+  for (const gram of queryNgrams(needle, manifest.ngram)) {
+    const shard = shards.get(`${SEARCH_DIR}/${manifest.shard_file.replace("{key}", shardKey(gram))}`)
+    const ids = decodeIds(shard?.[gram] ?? [])
+    if (candidates === null) {
+      candidates = ids
+    } else {
+      const keep = new Set(ids)
+      candidates = candidates.filter(id => keep.has(id))
+    }
+    if (candidates.length === 0) return []
+  }
+  return candidates ?? []
+}
+
+/**
+ * Chunk numbers holding the given project ids, in ascending order
+ */
+export function chunksForIds(manifest: SearchManifest, ids: number[]): number[] {
+  const chunks = new Set(ids.map(id => Math.floor(id / manifest.chunk_size)))
+  return Array.from(chunks).sort((a, b) => a - b)
+}
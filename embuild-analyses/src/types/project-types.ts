@@ -33,6 +33,50 @@ export interface Project {
     "2031": number
   }
   categories: string[]
+  // Position in projects_2026_chunk_<chunk>.json, set by the project browser
+  chunk?: number
+  row?: number
+}
+
+/**
+ * Project as listed in projects_2026_chunk_<n>.json. The long texts are in
+ * the chunk's detail shard; `bd` and `ap` index its context tables.
+ */
+export interface ProjectListItem {
+  municipality: string
+  nis_code: string
+  ac_code: string
+  ac_short: string
+  total_amount: number
+  amount_per_capita: number
+  yearly_amounts: Project["yearly_amounts"]
+  yearly_per_capita?: Project["yearly_per_capita"]
+  categories: string[]
+  bd: number
+  ap: number
+}
+
+/**
+ * Row of a chunk written before the detail shards: the texts are inline and
+ * there are no `bd`/`ap` positions.
+ */
+export type LegacyProjectListItem = Omit<ProjectListItem, "bd" | "ap"> &
+  Pick<Project, "bd_code" | "bd_short" | "bd_long" | "ap_code" | "ap_short" | "ap_long" | "ac_long">
+
+export type ProjectChunkItem = ProjectListItem | LegacyProjectListItem
+
+/** [code, short, long] */
+export type ProjectContextEntry = [string, string, string]
+
+/**
+ * Detail shard projects_2026_details_<n>.json: `ac_long` is aligned with the
+ * rows of chunk n, `bd`/`ap` hold each distinct beleidsdoelstelling and
+ * actieplan of the chunk once.
+ */
+export interface ProjectDetailShard {
+  ac_long: string[]
+  bd: ProjectContextEntry[]
+  ap: ProjectContextEntry[]
 }
 
 export interface CategoryMetadata {
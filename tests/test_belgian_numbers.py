@@ -0,0 +1,58 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SHARED_DATA_DIR = Path(__file__).resolve().parents[1] / "embuild-analyses/shared-data"
+sys.path.insert(0, str(SHARED_DATA_DIR))
+
+from belgian_numbers import parse_belgian_numbers
+
+ENERGIEKAART_SCRIPT = Path(__file__).resolve().parents[1] / "embuild-analyses/analyses/energiekaart-premies/src/process-data.py"
+
+
+def test_parses_thousands_and_decimal_comma():
+    column = pd.Series(["1.234.567,89", "12", " 7,5 ", "-1.000", "0,00"], index=[3, 1, 4, 1, 5])
+
+    parsed = parse_belgian_numbers(column)
+
+    assert parsed.dtype == np.float64
+    assert parsed.index.equals(column.index)
+    assert parsed.tolist() == [1234567.89, 12.0, 7.5, -1000.0, 0.0]
+
+
+def test_missing_and_invalid_values_are_nan():
+    parsed = parse_belgian_numbers(pd.Series(["", None, "n.v.t.", "1,2,3", "5"]))
+
+    assert parsed.isna().tolist() == [True, True, True, True, False]
+
+
+def test_currency_symbol_is_dropped():
+    parsed = parse_belgian_numbers(pd.Series(["€ 5.886.708", "€ 0", "€ 1,5"]), currency="€")
+
+    assert parsed.tolist() == [5886708.0, 0.0, 1.5]
+
+
+def test_numbers_are_kept_as_they_are():
+    assert parse_belgian_numbers(pd.Series([1.234, 12])).tolist() == [1.234, 12.0]
+    # Only the strings of a mixed column are Belgian text
+    mixed = pd.Series([1.234, "1.234", None, 3], dtype=object)
+    assert parse_belgian_numbers(mixed).tolist()[:2] == [1.234, 1234.0]
+    assert np.isnan(parse_belgian_numbers(mixed)[2])
+
+
+def test_energiekaart_reads_thousands_as_text(tmp_path):
+    # Only single-dot values: a plain read_csv would see floats (1.234)
+    path = tmp_path / "aantal.csv"
+    path.write_text("Maatregel,Submaatregel ,Jaar, Aantal\nDak,Dak,2008,19.523\nDak,Vloer,2009,1.234\nDak,Muur,2009,\n", encoding="utf-8")
+    spec = importlib.util.spec_from_file_location("energiekaart_process_data", ENERGIEKAART_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    df = module.read_matrix_csv(path)
+
+    assert list(df.columns) == ["Maatregel", "Submaatregel", "Jaar", "Aantal"]
+    assert df["Jaar"].tolist() == [2008, 2009, 2009]
+    assert module.parse_number(df["Aantal"]).tolist() == [19523.0, 1234.0, 0.0]
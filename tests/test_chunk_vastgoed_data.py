@@ -0,0 +1,92 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parents[1] / "embuild-analyses/scripts/chunk-vastgoed-data.py"
+
+
+def load_chunker(tmp_path):
+    spec = importlib.util.spec_from_file_location("chunk_vastgoed_data", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.RESULTS_DIR = tmp_path / "results"
+    module.PUBLIC_DATA_DIR = tmp_path / "public"
+    module.RESULTS_DIR.mkdir()
+    return module
+
+
+def make_records():
+    geos = [(1, "1000"), (2, "2000"), (3, "10000")] + [(5, str(11000 + i)) for i in range(40)]
+    return [
+        {"lvl": lvl, "nis": nis, "y": y, "q": q, "type": t, "n": y + q, "p50": 1.5}
+        for y in (2023, 2024)
+        for q in (1, 2, 3, 4)
+        for t in ("huizen", "appartementen")
+        for lvl, nis in geos
+    ]
+
+
+@pytest.mark.parametrize("grouped", [True, False])
+def test_index_points_at_each_entity(tmp_path, grouped):
+    chunker = load_chunker(tmp_path)
+    chunker.TARGET_CHUNK_SIZE_MB = 0.005
+    chunker.READ_BLOCK_SIZE = 97  # records straddle block boundaries
+    records = make_records()
+    if grouped:
+        records.sort(key=lambda r: (r["lvl"], r["nis"]))
+    (chunker.RESULTS_DIR / "quarterly.json").write_text(json.dumps(records, indent=1))
+    # Left over from an earlier run with more chunks
+    stale = chunker.PUBLIC_DATA_DIR / "quarterly_chunk_99.json"
+    stale.parent.mkdir()
+    stale.write_text("[]")
+
+    chunker.chunk_quarterly_data()
+    metadata = json.loads((chunker.PUBLIC_DATA_DIR / "metadata.json").read_text())
+
+    assert metadata["quarterly_chunks"] > 1
+    assert metadata["total_records"] == len(records)
+    assert len(metadata["index"]) == 43
+
+    chunks = [
+        (chunker.PUBLIC_DATA_DIR / f"quarterly_chunk_{i}.json").read_bytes()
+        for i in range(metadata["quarterly_chunks"])
+    ]
+    assert sorted(json.dumps(r, sort_keys=True) for c in chunks for r in json.loads(c)) == sorted(
+        json.dumps(r, sort_keys=True) for r in records
+    )
+    for nis, (lvl, chunk, offset, length, count) in metadata["index"].items():
+        subset = json.loads(b"[" + chunks[chunk][offset:offset + length] + b"]")
+        assert len(subset) == count == 16
+        assert {(r["lvl"], r["nis"]) for r in subset} == {(lvl, nis)}
+    # Belgium, region and province share the first chunk
+    assert {metadata["index"][nis][1] for nis in ("1000", "2000", "10000")} == {0}
+    assert not stale.exists()
+
+
+def test_series_files_are_copied_and_advertised(tmp_path):
+    chunker = load_chunker(tmp_path)
+    (chunker.RESULTS_DIR / "quarterly.json").write_text(json.dumps(make_records()))
+    series = chunker.RESULTS_DIR / "series"
+    series.mkdir()
+    (series / "manifest.json").write_text('{"file_pattern":"{nis}.json","index":{}}')
+    (series / "11000.json").write_text("[]")
+
+    chunker.chunk_quarterly_data()
+    chunker.copy_other_files()
+
+    metadata = json.loads((chunker.PUBLIC_DATA_DIR / "metadata.json").read_text())
+    assert metadata["series"] == "series/{nis}.json"
+    assert (chunker.PUBLIC_DATA_DIR / "series" / "11000.json").read_text() == "[]"
+
+
+def test_other_files_are_copied_unchanged(tmp_path):
+    chunker = load_chunker(tmp_path)
+    chunker.PUBLIC_DATA_DIR.mkdir()
+    text = '{"regions":[{"code":"2000","name":"Vlaams Gewest"}],"x":1.50}'
+    (chunker.RESULTS_DIR / "lookups.json").write_text(text, encoding="utf-8")
+
+    chunker.copy_other_files()
+
+    assert (chunker.PUBLIC_DATA_DIR / "lookups.json").read_text(encoding="utf-8") == text
@@ -0,0 +1,94 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "embuild-analyses/analyses/faillissementen/src"
+sys.path.insert(0, str(SRC_DIR))
+
+from derived_metrics import derived_metrics, lagged_delta, trailing_sum
+
+
+def make_monthly(keys, n_series, seed):
+    """Monthly rows 2019-01 .. 2021-06 with random gaps (months without records)."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(n_series):
+        for y in (2019, 2020, 2021):
+            for m in range(1, 13 if y < 2021 else 7):
+                if rng.random() < 0.2:
+                    continue
+                row = {"y": y, "m": m, "n": int(rng.integers(1, 50)), "w": int(rng.integers(0, 300))}
+                row.update({key: f"{key}{i}" if key == "p" else "CF"[i % 2] for key in keys})
+                rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def reference(frame, keys):
+    """Per-series pandas rolling/shift over a complete month range."""
+    months = pd.period_range("2019-01", "2021-06", freq="M")
+    out = []
+    groups = frame.groupby(keys) if keys else [((), frame)]
+    for key, group in groups:
+        series = group.set_index(pd.PeriodIndex.from_fields(year=group["y"], month=group["m"], freq="M"))
+        series = series[["n", "w"]].reindex(months, fill_value=0).astype(float)
+        ref = pd.DataFrame({"y": months.year, "m": months.month})
+        for measure in ["n", "w"]:
+            rolled = series[measure].rolling(12).sum()
+            ref[measure] = series[measure].to_numpy()
+            ref[f"{measure}12"] = rolled.to_numpy()
+            ref[f"d{measure}"] = (series[measure] - series[measure].shift(12)).to_numpy()
+            ref[f"d{measure}12"] = (rolled - rolled.shift(12)).to_numpy()
+        for k, value in zip(keys, key if isinstance(key, tuple) else (key,)):
+            ref[k] = value
+        out.append(ref)
+    return pd.concat(out, ignore_index=True)
+
+
+def test_window_kernels():
+    values = np.arange(1, 16, dtype=float).reshape(1, -1)
+
+    rolled = trailing_sum(values, 3)
+    assert np.isnan(rolled[0, :2]).all()
+    assert rolled[0, 2:].tolist() == [6, 9, 12, 15, 18, 21, 24, 27, 30, 33, 36, 39, 42]
+
+    delta = lagged_delta(values, 12)
+    assert np.isnan(delta[0, :12]).all()
+    assert delta[0, 12:].tolist() == [12, 12, 12]
+
+
+def test_matches_pandas_rolling_reference():
+    totals = make_monthly([], 1, seed=1)
+    by_sector = make_monthly(["s"], 2, seed=2)
+    provinces = make_monthly(["p"], 3, seed=3)
+    province_sector = make_monthly(["p"], 3, seed=4).assign(s="F")
+
+    derived = derived_metrics(totals, by_sector, provinces, province_sector)
+
+    checks = [
+        (derived["s"].isna() & derived["p"].isna(), totals, []),
+        (derived["s"].notna() & derived["p"].isna(), by_sector, ["s"]),
+        (derived["s"].isna() & derived["p"].notna(), provinces, ["p"]),
+        (derived["s"].notna() & derived["p"].notna(), province_sector, ["s", "p"]),
+    ]
+    columns = ["n", "n12", "dn", "dn12", "w", "w12", "dw", "dw12"]
+    for mask, source, keys in checks:
+        got = derived[mask].sort_values([*keys, "y", "m"]).reset_index(drop=True)
+        expected = reference(source, keys).sort_values([*keys, "y", "m"]).reset_index(drop=True)
+        assert len(got) == 30 * (source.groupby(keys).ngroups if keys else 1)
+        pd.testing.assert_frame_equal(got[columns], expected[columns], check_dtype=False)
+
+
+def test_sector_shares():
+    totals = make_monthly([], 1, seed=1)
+    by_sector = make_monthly(["s"], 2, seed=2)
+    provinces = make_monthly(["p"], 1, seed=3)
+    derived = derived_metrics(totals, by_sector, provinces, provinces.iloc[:0].assign(s="F"))
+
+    belgium = derived[derived["s"].isna() & derived["p"].isna()].set_index(["y", "m"])
+    sector = derived[derived["s"] == "C"].set_index(["y", "m"])
+    expected = (sector["n"] / belgium["n"]).where(belgium["n"] > 0).round(4)
+    pd.testing.assert_series_equal(sector["sh"], expected, check_names=False)
+    assert sector["sh12"].iloc[:11].isna().all()
+    assert derived.loc[derived["s"].isna(), "sh"].isna().all()
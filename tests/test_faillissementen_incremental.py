@@ -0,0 +1,87 @@
+import importlib
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "embuild-analyses/analyses/faillissementen/src"
+sys.path.insert(0, str(SRC_DIR))
+
+import incremental as inc
+from test_faillissementen_grouping_sets import make_raw
+
+
+@pytest.fixture
+def pf(monkeypatch, tmp_path):
+    module = importlib.import_module("process_faillissementen")
+    monkeypatch.setattr(module, "STATE_DIR", tmp_path / "state")
+    return module
+
+
+def run(pf, monkeypatch, raw, results_dir, incremental):
+    results_dir.mkdir(parents=True, exist_ok=True)
+    monkeypatch.setattr(pf, "RESULTS_DIR", results_dir)
+    pf.process_data(raw.rename(columns={"sector": "TX_NACE_REV2_SECTION"}), incremental=incremental)
+    return {name: (results_dir / name).read_bytes() for name in [*pf.OUTPUTS, pf.DERIVED_FILE]}
+
+
+def test_incremental_run_matches_full_rebuild(pf, monkeypatch, tmp_path):
+    raw = make_raw(n=3000, seed=2)
+    latest = (raw["CD_YEAR"] == 2024) & (raw["CD_MONTH"] >= 11)
+    run(pf, monkeypatch, raw[~latest], tmp_path / "inc", incremental=True)
+
+    # New months are appended, an old month is revised and rows are reordered
+    release = raw.copy()
+    revised = (release["CD_YEAR"] == 2019) & (release["CD_MONTH"] == 3)
+    release.loc[revised, "MS_COUNTOF_WORKERS"] += 1
+    release = release.sample(frac=1, random_state=0)
+
+    patched = run(pf, monkeypatch, release, tmp_path / "inc", incremental=True)
+    rebuilt = run(pf, monkeypatch, release, tmp_path / "full", incremental=False)
+    assert patched == rebuilt
+
+    state = json.loads((tmp_path / "state" / "state.json").read_text())
+    assert state["version"] == inc.STATE_VERSION
+
+
+def test_first_months_of_a_new_year_are_incremental(pf, monkeypatch, tmp_path, capsys):
+    raw = make_raw(n=3000, seed=4)
+    new_year = raw["CD_YEAR"] == 2024
+    run(pf, monkeypatch, raw[~new_year], tmp_path / "inc", incremental=True)
+    assert not (tmp_path / "state" / "cube" / "2024.parquet").exists()
+    capsys.readouterr()
+
+    # The January release adds the first months of a year without a cube file
+    release = raw[~new_year | (raw["CD_MONTH"] <= 2)]
+    patched = run(pf, monkeypatch, release, tmp_path / "inc", incremental=True)
+    assert "Incremental run: 2 changed month(s) in years [2024]" in capsys.readouterr().out
+    rebuilt = run(pf, monkeypatch, release, tmp_path / "full", incremental=False)
+    assert patched == rebuilt
+    assert (tmp_path / "state" / "cube" / "2024.parquet").exists()
+
+
+def test_missing_cube_file_of_a_stored_year_rebuilds(pf, monkeypatch, tmp_path, capsys):
+    raw = make_raw(n=2000, seed=5)
+    run(pf, monkeypatch, raw[raw["CD_MONTH"] <= 6], tmp_path / "inc", incremental=True)
+    (tmp_path / "state" / "cube" / "2020.parquet").unlink()
+    capsys.readouterr()
+
+    patched = run(pf, monkeypatch, raw, tmp_path / "inc", incremental=True)
+    assert "No usable incremental state" in capsys.readouterr().out
+    assert patched == run(pf, monkeypatch, raw, tmp_path / "full", incremental=False)
+
+
+def test_changed_partitions_ignores_row_order():
+    raw = make_raw(seed=3)
+    before = inc.partition_fingerprints(raw)
+    shuffled = inc.partition_fingerprints(raw.sample(frac=1, random_state=1))
+    assert inc.changed_partitions(before, shuffled).empty
+
+    moved = raw.copy()
+    row = moved.index[(moved["CD_YEAR"] == 2020) & (moved["CD_MONTH"] == 5)][0]
+    moved.loc[row, "MS_COUNTOF_WORKERS"] += 1
+    changed = inc.changed_partitions(before, inc.partition_fingerprints(moved))
+    assert changed[["y", "m"]].astype(int).values.tolist() == [[2020, 5]]
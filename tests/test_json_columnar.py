@@ -0,0 +1,50 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+SHARED_DATA_DIR = Path(__file__).resolve().parents[1] / "embuild-analyses/shared-data"
+sys.path.insert(0, str(SHARED_DATA_DIR))
+
+from json_columnar import decode_columnar, encode_columnar, write_json_columnar
+from json_records import dumps_json_records, record_columns
+
+
+def make_frame(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.normal(0, 100, n).round(2)
+    values[rng.random(n) < 0.1] = np.nan
+    return pd.DataFrame({
+        "y": rng.integers(2010, 2025, n),
+        "p": rng.choice(np.array(["10000", "20001", "21000", None], dtype=object), n),
+        "d": rng.choice(np.array(["Minder dan 1 jaar", "20 jaar of meer", "Liège"], dtype=object), n),
+        "v": values,
+    })
+
+
+def test_decodes_to_the_record_format():
+    df = make_frame()
+    columns = record_columns(df)
+    payload = encode_columnar(df, columns)
+    assert decode_columnar(payload) == json.loads(dumps_json_records(df, columns))
+    assert payload["length"] == len(df)
+    assert set(payload["dictionaries"]) == {"p", "d"}
+
+
+def test_renamed_keys_and_missing_codes(tmp_path):
+    df = pd.DataFrame({"jaar": [2020.0, 2021.0], "code": ["a", None]})
+    path = tmp_path / "out.json"
+    written = write_json_columnar(df, path, {"jaar": ("y", "int"), "code": ("c", "str")})
+    payload = json.loads(path.read_text(encoding="utf-8"))
+
+    assert written == path.stat().st_size
+    assert payload["columns"] == {"y": [2020, 2021], "c": [0, -1]}
+    assert decode_columnar(payload) == [{"y": 2020, "c": "a"}, {"y": 2021, "c": None}]
+
+
+def test_rejects_unknown_version():
+    with pytest.raises(ValueError):
+        decode_columnar({"format": "columnar", "version": 2, "length": 0, "columns": {}})
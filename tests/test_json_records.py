@@ -0,0 +1,75 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+SHARED_DATA_DIR = Path(__file__).resolve().parents[1] / "embuild-analyses/shared-data"
+sys.path.insert(0, str(SHARED_DATA_DIR))
+
+from json_records import dumps_json_records, encode_column, record_columns, write_json_records
+
+
+def clean_for_json(records):
+    """Reference: the per-analysis helper the writer replaces."""
+    cleaned = []
+    for r in records:
+        clean_r = {}
+        for k, v in r.items():
+            if pd.isna(v):
+                clean_r[k] = None
+            elif isinstance(v, (int, float)) and not isinstance(v, bool):
+                clean_r[k] = int(v) if float(v).is_integer() else float(v)
+            else:
+                clean_r[k] = v
+        cleaned.append(clean_r)
+    return cleaned
+
+
+def make_frame(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    floats = rng.normal(0, 1e4, n)
+    floats[rng.random(n) < 0.1] = np.nan
+    floats[:4] = [0.1, 1e-7, 3.0, 123456789.125]
+    return pd.DataFrame({
+        "y": rng.integers(2000, 2030, n),
+        "n": pd.array(rng.integers(0, 100, n), dtype="Int64"),
+        "v": floats,
+        "name": rng.choice(np.array(["Antwerpen", "Liège", 'quote "x"', "tab\tline\n", None], dtype=object), n),
+    })
+
+
+def test_matches_clean_for_json_output():
+    df = make_frame()
+    df.loc[3, "n"] = pd.NA
+    expected = json.dumps(clean_for_json(df.to_dict(orient="records")), ensure_ascii=False, separators=(",", ":"))
+    assert dumps_json_records(df, record_columns(df)) == expected
+
+
+def test_column_kinds_and_renaming():
+    df = pd.DataFrame({"jaar": [2020.0, 2021.9, np.nan], "m2": [1.0, 2.5, np.inf], "code": [1, 2, 3]})
+    columns = {"jaar": ("y", "int"), "m2": ("a", "float"), "code": ("c", "str")}
+    assert json.loads(dumps_json_records(df, columns)) == [
+        {"y": 2020, "a": 1.0, "c": "1"},
+        {"y": 2021, "a": 2.5, "c": "2"},
+        {"y": None, "a": None, "c": "3"},
+    ]
+    assert encode_column(df["m2"], "float")[0] == "1.0"
+
+
+def test_write_batches_and_byte_count(tmp_path):
+    df = make_frame(n=257, seed=1)
+    path = tmp_path / "out.json"
+    written = write_json_records(df, path, record_columns(df), batch_size=50)
+    assert written == path.stat().st_size
+    assert path.read_text(encoding="utf-8") == dumps_json_records(df, record_columns(df))
+    assert json.loads(path.read_text(encoding="utf-8"))[-1]["y"] == int(df["y"].iloc[-1])
+
+
+def test_empty_frame_and_unknown_kind(tmp_path):
+    df = pd.DataFrame({"a": pd.Series([], dtype="int64")})
+    assert write_json_records(df, tmp_path / "empty.json", {"a": ("a", "int")}) == 2
+    with pytest.raises(ValueError):
+        encode_column(df["a"], "bool")
@@ -0,0 +1,61 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+SHARED_DATA_DIR = Path(__file__).resolve().parents[1] / "embuild-analyses/shared-data"
+sys.path.insert(0, str(SHARED_DATA_DIR))
+
+from nis_hierarchy import (
+    ARRONDISSEMENT,
+    MUNICIPALITY,
+    PROVINCE,
+    REGION,
+    load_hierarchy,
+    nis_names,
+    normalize_nis_codes,
+    resolve_nis,
+)
+
+CODES = pd.Series(["11002", "21004", "57081", "23000", "10000", "2000", "23106", "01000", "x", None], index=range(10, 20))
+
+
+def test_resolve_each_level():
+    expected = {
+        REGION: ["2000", "4000", "3000", "2000", "2000", "2000", "2000", None, None, None],
+        PROVINCE: ["10000", "21000", "50000", "20001", "10000", None, "20001", None, None, None],
+        ARRONDISSEMENT: ["11000", "21000", "57000", "23000", None, None, "23000", None, None, None],
+        MUNICIPALITY: ["11002", "21004", "57081", None, None, None, "23106", None, None, None],
+    }
+    for level, codes in expected.items():
+        resolved = resolve_nis(CODES, level)
+        assert resolved.index.equals(CODES.index)
+        assert [None if pd.isna(v) else v for v in resolved] == codes
+
+
+def test_every_municipality_resolves_to_a_known_province():
+    hierarchy = load_hierarchy()
+    municipalities = pd.Series(hierarchy.index[hierarchy["level"] == MUNICIPALITY].astype(str))
+    provinces = resolve_nis(municipalities, PROVINCE)
+    assert provinces.notna().all()
+    assert set(provinces) <= set(nis_names(PROVINCE)) | {"21000"}
+
+
+def test_latest_record_wins():
+    assert nis_names(ARRONDISSEMENT)["57000"] == "Arrondissement Doornik-Moeskroen"
+    assert nis_names(MUNICIPALITY)["52048"] == "Montigny-le-Tilleul"
+
+
+def test_numeric_input():
+    assert resolve_nis(pd.Series([11002, 44021.0]), PROVINCE).tolist() == ["10000", "40000"]
+
+
+def test_normalize():
+    assert normalize_nis_codes(pd.Series([" 01000 ", "", None, "11002"])).tolist() == ["01000", None, None, "11002"]
+    assert normalize_nis_codes(pd.Series([11002.0, None, 2000])).tolist() == ["11002", None, "2000"]
+
+
+def test_unknown_level():
+    with pytest.raises(ValueError):
+        resolve_nis(CODES, 5)
@@ -0,0 +1,102 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+SHARED_DATA_DIR = Path(__file__).resolve().parents[1] / "embuild-analyses/shared-data"
+sys.path.insert(0, str(SHARED_DATA_DIR))
+
+import parquet_cache as pc
+
+requires_pyarrow = pytest.mark.skipif(not pc.HAS_PYARROW, reason="pyarrow not installed")
+
+
+def make_parser(calls):
+    def parse():
+        calls.append(1)
+        return pd.DataFrame({"code": ["01000", None, "11002"], "n": [1.5, None, 3.0]})
+    return parse
+
+
+@requires_pyarrow
+def test_identical_archive_is_parsed_once(tmp_path):
+    calls = []
+    archive = tmp_path / "data.zip"
+    archive.write_bytes(b"archive v1")
+
+    first = pc.load_or_parse(archive, make_parser(calls), tmp_path / "cache", "data")
+    second = pc.load_or_parse(archive.read_bytes(), make_parser(calls), tmp_path / "cache", "data")
+
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+    assert pc.cache_path(tmp_path / "cache", "data", pc.sha256_of(archive)).exists()
+
+
+@requires_pyarrow
+def test_changed_archive_replaces_cache_entry(tmp_path):
+    calls = []
+    cache_dir = tmp_path / "cache"
+    pc.load_or_parse(b"archive v1", make_parser(calls), cache_dir, "data")
+    pc.load_or_parse(b"archive v2", make_parser(calls), cache_dir, "data")
+
+    assert len(calls) == 2
+    assert [p.name for p in cache_dir.glob("data-*.parquet")] == [f"data-v1-{pc.sha256_of(b'archive v2')}.parquet"]
+
+
+@requires_pyarrow
+def test_parser_version_bump_parses_again(tmp_path):
+    calls = []
+    cache_dir = tmp_path / "cache"
+    pc.load_or_parse(b"archive", make_parser(calls), cache_dir, "data")
+    pc.load_or_parse(b"archive", make_parser(calls), cache_dir, "data", version=2)
+    pc.load_or_parse(b"archive", make_parser(calls), cache_dir, "data", version=2)
+
+    assert len(calls) == 2
+    assert [p.name for p in cache_dir.glob("data-*.parquet")] == [f"data-v2-{pc.sha256_of(b'archive')}.parquet"]
+
+
+@requires_pyarrow
+def test_cache_can_be_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv(pc.CACHE_ENV_VAR, "0")
+    calls = []
+    pc.load_or_parse(b"archive", make_parser(calls), tmp_path / "cache", "data")
+    pc.load_or_parse(b"archive", make_parser(calls), tmp_path / "cache", "data")
+
+    assert len(calls) == 2
+    assert not (tmp_path / "cache").exists()
+
+
+def test_json_artifact_is_built_once_per_archive(tmp_path):
+    calls = []
+    archive = tmp_path / "data.zip"
+    cache_dir = tmp_path / "cache"
+
+    def build():
+        calls.append(1)
+        return {"regions": [{"code": "02000", "name": "Vlaams Gewest"}]}
+
+    archive.write_bytes(b"archive v1")
+    first = pc.load_or_build_json(archive, build, cache_dir, "data-lookups")
+    second = pc.load_or_build_json(archive, build, cache_dir, "data-lookups")
+    assert len(calls) == 1
+    assert first == second == build()
+
+    archive.write_bytes(b"archive v2, changed")
+    pc.load_or_build_json(archive, build, cache_dir, "data-lookups")
+    assert len(calls) == 3
+    assert [p.name for p in cache_dir.glob("data-lookups-*.json")] == [f"data-lookups-v1-{pc.sha256_of(archive)}.json"]
+
+
+def test_json_artifact_builder_version_bump_builds_again(tmp_path):
+    calls = []
+    cache_dir = tmp_path / "cache"
+
+    def build():
+        calls.append(1)
+        return [len(calls)]
+
+    assert pc.load_or_build_json(b"archive", build, cache_dir, "data-lookups") == [1]
+    assert pc.load_or_build_json(b"archive", build, cache_dir, "data-lookups", version=2) == [2]
+    assert pc.load_or_build_json(b"archive", build, cache_dir, "data-lookups", version=2) == [2]
+    assert [p.name for p in cache_dir.glob("data-lookups-*.json")] == [f"data-lookups-v2-{pc.sha256_of(b'archive')}.json"]
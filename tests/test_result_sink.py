@@ -0,0 +1,59 @@
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+SHARED_DATA_DIR = Path(__file__).resolve().parents[1] / "embuild-analyses/shared-data"
+sys.path.insert(0, str(SHARED_DATA_DIR))
+
+import result_sink
+from result_sink import CSV, JSON, write_results
+
+
+def make_frames():
+    totals = pd.DataFrame({"nis": ["11002", "44021"], "n": [3, None], "p": [1.5, 2.0]})
+    detail = pd.DataFrame({"nis": ["11002"], "size": ["1 persoon"]})
+    return totals, detail
+
+
+def test_fans_out_to_every_format(tmp_path, monkeypatch):
+    monkeypatch.delenv(result_sink.PARQUET_ENV_VAR, raising=False)
+    totals, detail = make_frames()
+
+    written = write_results({"totals": (totals, (JSON, CSV)), "detail": (detail, (JSON,))}, tmp_path, workers=2)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["detail.json", "totals.csv", "totals.json"]
+    assert written == {p: p.stat().st_size for p in tmp_path.iterdir()}
+    assert json.loads((tmp_path / "totals.json").read_text()) == [
+        {"nis": "11002", "n": 3, "p": 1.5},
+        {"nis": "44021", "n": None, "p": 2},
+    ]
+    assert (tmp_path / "totals.csv").read_text() == totals.to_csv(index=False)
+
+
+def test_parquet_copy_from_environment(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setenv(result_sink.PARQUET_ENV_VAR, "1")
+    totals, _ = make_frames()
+
+    write_results({"totals": (totals, (CSV,))}, tmp_path)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["totals.csv", "totals.parquet"]
+    pd.testing.assert_frame_equal(pd.read_parquet(tmp_path / "totals.parquet"), totals)
+
+
+def test_rejects_unknown_format(tmp_path):
+    totals, _ = make_frames()
+    with pytest.raises(ValueError):
+        write_results({"totals": (totals, (JSON, "xlsx"))}, tmp_path)
+
+
+def test_writer_errors_are_raised(tmp_path):
+    totals, _ = make_frames()
+    (tmp_path / "totals.csv").mkdir()
+    with pytest.raises(IsADirectoryError):
+        write_results({"totals": (totals, (JSON, CSV))}, tmp_path)
+    # The other writers still ran
+    assert (tmp_path / "totals.json").is_file()
@@ -0,0 +1,83 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+SHARED_DATA_DIR = Path(__file__).resolve().parents[1] / "embuild-analyses/shared-data"
+sys.path.insert(0, str(SHARED_DATA_DIR))
+
+from statbel_schema import (
+    CATEGORY,
+    INT,
+    NACE_SECTIONS,
+    ORDINAL,
+    PROVINCE_CODES,
+    apply_schema,
+    decode_categories,
+    to_category,
+)
+
+DURATIONS = ("Minder dan 1 jaar", "Van 1 jaar tot minder dan 2 jaar", "20 jaar of meer")
+
+
+def make_raw(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    provinces = rng.choice(np.array([10000.0, 21000.0, 99999.0, np.nan]), n)
+    return pd.DataFrame({
+        "sector": rng.choice(np.array(["F", "C", "?", None], dtype=object), n),
+        "province": provinces,
+        "duration": rng.choice(np.array([*DURATIONS, "Onbekend", None], dtype=object), n),
+        "n": rng.integers(0, 10, n),
+    })
+
+
+def test_vocabularies():
+    assert NACE_SECTIONS[:6] == ("A", "B", "C", "D", "E", "F")
+    assert "21000" in PROVINCE_CODES and len(PROVINCE_CODES) == 11
+
+
+def test_category_keeps_values_and_string_order():
+    raw = make_raw()
+    cat = to_category(raw["sector"], NACE_SECTIONS)
+
+    assert list(cat.cat.categories) == sorted({*NACE_SECTIONS, "?"})
+    assert decode_categories(cat.to_frame())["sector"].fillna("-").tolist() == raw["sector"].fillna("-").tolist()
+    # Sorting the categorical gives the same order as sorting the strings
+    assert cat.sort_values(kind="stable").index.tolist() == raw["sector"].sort_values(kind="stable").index.tolist()
+
+
+def test_ordinal_appends_unknown_values():
+    cat = to_category(make_raw()["duration"], DURATIONS, ordered=True)
+
+    assert cat.cat.ordered
+    assert list(cat.cat.categories) == [*DURATIONS, "Onbekend"]
+    assert cat.isna().sum() > 0
+
+
+def test_apply_schema_groups_like_strings():
+    raw = make_raw()
+    schema = {
+        "sector": (CATEGORY, NACE_SECTIONS),
+        "province": (INT, ()),
+        "duration": (ORDINAL, DURATIONS),
+        "missing": (CATEGORY, ()),
+    }
+    typed = apply_schema(raw, schema)
+
+    assert str(typed["province"].dtype) == "Int32"
+    assert isinstance(typed["sector"].dtype, pd.CategoricalDtype)
+    assert "missing" not in typed.columns
+    assert not isinstance(raw["sector"].dtype, pd.CategoricalDtype)  # input left untouched
+
+    expected = raw.groupby(["sector", "province"], dropna=False)["n"].sum().reset_index()
+    grouped = typed.groupby(["sector", "province"], dropna=False, observed=True)["n"].sum().reset_index()
+    grouped = decode_categories(grouped)
+    assert grouped["sector"].fillna("-").tolist() == expected["sector"].fillna("-").tolist()
+    assert grouped["n"].tolist() == expected["n"].tolist()
+
+
+def test_unknown_kind():
+    with pytest.raises(ValueError):
+        apply_schema(make_raw(), {"sector": ("text", ())})
@@ -0,0 +1,61 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+SHARED_DATA_DIR = Path(__file__).resolve().parents[1] / "embuild-analyses/shared-data"
+sys.path.insert(0, str(SHARED_DATA_DIR))
+
+from txt_stream import FLOAT, INT, STR, read_txt
+
+COLUMNS = {"CD_YEAR": INT, "CD_REFNIS_NL": STR, "CD_PERIOD": STR, "MS_P_50": FLOAT, "LVL": INT}
+FILTERS = {"CD_PERIOD": {"Y", "Q1"}, "LVL": {1, 5}}
+
+
+def write_txt(path, n=500):
+    rows = ["CD_YEAR|CD_REFNIS_NL|CD_PERIOD|CD_EXTRA|MS_P_50|LVL"]
+    for i in range(n):
+        name = "Liège" if i % 7 == 0 else ("" if i % 11 == 0 else f"Gemeente {i}")
+        period = ["Y", "Q1", "Q2", "S1"][i % 4]
+        price = "" if i % 5 == 0 else str(100000 + i * 250)
+        rows.append(f"{2010 + i % 13}|{name}|{period}|x|{price}|{[1, 4, 5][i % 3]}")
+    path.write_text("\n".join(rows) + "\n", encoding="latin-1")
+    return path
+
+
+def expected(path):
+    df = pd.read_csv(path, sep="|", encoding="latin-1", dtype=str)
+    df = df[df["CD_PERIOD"].isin(FILTERS["CD_PERIOD"]) & df["LVL"].isin(["1", "5"])]
+    return pd.DataFrame({
+        "CD_YEAR": df["CD_YEAR"].astype("Int64"),
+        "CD_REFNIS_NL": df["CD_REFNIS_NL"],
+        "CD_PERIOD": df["CD_PERIOD"],
+        "MS_P_50": df["MS_P_50"].astype(float),
+        "LVL": df["LVL"].astype("Int64"),
+    }).reset_index(drop=True)
+
+
+def test_pandas_engine_filters_and_types(tmp_path):
+    path = write_txt(tmp_path / "in.txt")
+    df = read_txt(path, COLUMNS, FILTERS, engine="pandas", chunksize=37)
+    pd.testing.assert_frame_equal(df, expected(path))
+    assert "Liège" in set(df["CD_REFNIS_NL"].dropna())
+
+
+def test_pyarrow_engine_matches_pandas(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = write_txt(tmp_path / "in.txt")
+    df = read_txt(path, COLUMNS, FILTERS, engine="pyarrow", block_size=1 << 10)
+    pd.testing.assert_frame_equal(df, read_txt(path, COLUMNS, FILTERS, engine="pandas"))
+
+
+def test_no_rows_kept(tmp_path):
+    path = write_txt(tmp_path / "in.txt", n=20)
+    df = read_txt(path, COLUMNS, {"CD_PERIOD": {"Q4"}}, engine="pandas")
+    assert df.empty and list(df.columns) == list(COLUMNS)
+
+
+def test_filter_columns_must_be_read(tmp_path):
+    with pytest.raises(KeyError):
+        read_txt(tmp_path / "in.txt", {"CD_YEAR": INT}, {"CD_PERIOD": {"Y"}})
@@ -0,0 +1,96 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1] / "embuild-analyses"
+sys.path.insert(0, str(ROOT / "shared-data"))
+sys.path.insert(0, str(ROOT / "analyses/vastgoed-verkopen/src"))
+
+from percentile_rollup import group_percentiles, rollup_cube, rollup_percentiles
+from quarterly_cube import MISSING_COUNT, read_quarterly_cube, write_quarterly_cube
+
+
+def mixture_quantiles(counts, knots):
+    """Reference: invert the weighted mixture of member CDFs on a fine grid."""
+    xs = np.linspace(0, 2e6, 2_000_001)
+    cdf = np.zeros_like(xs)
+    for w, (p25, p50, p75) in zip(counts, knots):
+        points = [max(2 * p25 - p50, 0), p25, p50, p75, 2 * p75 - p50]
+        cdf += w / np.sum(counts) * np.interp(xs, points, [0, 0.25, 0.5, 0.75, 1])
+    return [xs[np.searchsorted(cdf, q)] for q in (0.25, 0.5, 0.75)]
+
+
+def test_matches_weighted_mixture():
+    rng = np.random.default_rng(7)
+    counts = rng.integers(1, 300, 9).astype(float)
+    p50 = rng.uniform(150_000, 500_000, 9)
+    knots = np.column_stack([p50 * rng.uniform(0.6, 0.95, 9), p50, p50 * rng.uniform(1.05, 1.6, 9)])
+    groups = np.array([0, 0, 0, 0, 2, 2, 2, 2, 2])
+
+    result = rollup_percentiles(counts, knots, groups, 3)
+
+    np.testing.assert_allclose(result[0], mixture_quantiles(counts[:4], knots[:4]), atol=2)
+    np.testing.assert_allclose(result[2], mixture_quantiles(counts[4:], knots[4:]), atol=2)
+    assert np.isnan(result[1]).all()
+
+
+def test_member_knots_are_kept():
+    knots = [[100_000, 200_000, 300_000], [100_000, 200_000, 300_000], [150_000, 180_000, 260_000]]
+    result = rollup_percentiles([5, 7, 40], knots, [0, 0, 1], 2)
+    np.testing.assert_allclose(result, [knots[0], knots[2]])
+
+
+def test_point_masses():
+    # Members with coinciding knots put a point mass on that price
+    result = rollup_percentiles([5, 5], [[200_000, 200_000, 300_000], [100_000, 200_000, 200_000]], [0, 0], 1)
+    np.testing.assert_allclose(result, [[200_000, 200_000, 200_000]])
+
+
+def test_incomplete_members_fall_back_to_weighted_mean():
+    knots = [[100.0, 200.0, np.nan], [300.0, 400.0, np.nan], [np.nan, 250.0, 350.0]]
+    result = rollup_percentiles([1, 3, np.nan], knots, [0, 0, 1], 2)
+    np.testing.assert_allclose(result, [[250, 350, np.nan], [np.nan, 250, 350]])
+
+
+def test_group_percentiles_follow_groupby_order():
+    frame = pd.DataFrame({
+        "nis": ["b", "a", "b", "a"],
+        "n": [10, 4, 10, np.nan],
+        "p25": [1.0, 5.0, 3.0, 7.0],
+        "p50": [2.0, 6.0, 4.0, 8.0],
+        "p75": [3.0, 7.0, 5.0, 9.0],
+    })
+    grouped = frame.groupby("nis")
+    result = group_percentiles(grouped, "n", ["p25", "p50", "p75"])
+
+    # "a": only one member has transactions; "b": two equal-weight members
+    np.testing.assert_allclose(result[0], [5, 6, 7])
+    np.testing.assert_allclose(result[1], rollup_percentiles([1, 1], frame[["p25", "p50", "p75"]].iloc[[0, 2]], [0, 0], 1)[0])
+    assert list(grouped.agg({"n": "sum"}).index) == ["a", "b"]
+
+
+def test_rollup_cube(tmp_path):
+    rows = []
+    for nis, n, p50 in [("11001", 10, 200_000.0), ("11002", 30, 300_000.0), ("12002", 5, 250_000.0)]:
+        for q in (1, 2):
+            rows.append({"y": 2024, "q": q, "lvl": 5, "nis": nis, "type": "appartementen",
+                         "n": n, "p50": p50, "p25": p50 - 50_000, "p75": p50 + 50_000, "name": nis})
+    rows = rows[:-1]  # 12002 has no record in Q2
+    write_quarterly_cube(pd.DataFrame(rows), tmp_path)
+    header, arrays = read_quarterly_cube(tmp_path / "quarterly_cube.json")
+
+    groups = {"11000": ["11001", "11002"], "12000": ["12002"]}
+    rolled, out = rollup_cube(header, arrays, groups, level=4, names={"11000": "Arr. Antwerpen"})
+
+    assert rolled["shape"] == [2, 1, 2]
+    assert rolled["entities"] == {"lvl": [4, 4], "nis": ["11000", "12000"], "name": ["Arr. Antwerpen", None]}
+    assert out["n"][:, 0].tolist() == [[40, 40], [5, MISSING_COUNT]]
+    expected = np.round(rollup_percentiles([10, 30], [[150_000, 200_000, 250_000], [250_000, 300_000, 350_000]], [0, 0], 1)[0])
+    np.testing.assert_array_equal([out[f][0, 0, 0] for f in ("p25", "p50", "p75")], expected)
+    assert out["p50"][1, 0, 0] == 250_000 and np.isnan(out["p50"][1, 0, 1])
+
+    with pytest.raises(KeyError):
+        rollup_cube(header, arrays, {"x": ["99999"]}, level=4)
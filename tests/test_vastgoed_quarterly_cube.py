@@ -0,0 +1,89 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1] / "embuild-analyses"
+sys.path.insert(0, str(ROOT / "shared-data"))
+sys.path.insert(0, str(ROOT / "analyses/vastgoed-verkopen/src"))
+
+from quarterly_cube import (
+    MISSING_COUNT,
+    RECORD_COLUMNS,
+    cube_records,
+    cube_to_frame,
+    read_quarterly_cube,
+    write_quarterly_cube,
+)
+
+KEY = ["lvl", "nis", "type", "y", "q"]
+
+
+def make_frame():
+    rows = []
+    for lvl, nis, name in [(5, "11002", "Antwerpen"), (1, "01000", "België")]:
+        for y, q in [(2023, 3), (2023, 4), (2024, 2)]:  # 2024 Q1 is missing
+            for type_ in ("appartementen", "huizen_23"):
+                rows.append({
+                    "y": y, "q": q, "lvl": lvl, "nis": nis, "type": type_, "n": y - 2000 + q,
+                    "p50": 250000.0, "p25": np.nan if q == 4 else 180000.0, "p75": 320000.0, "name": name,
+                })
+    frame = pd.DataFrame(rows)
+    frame["type"] = pd.Categorical(frame["type"], categories=["huizen_23", "alle_huizen", "appartementen"])
+    return frame
+
+
+def test_round_trip(tmp_path):
+    frame = make_frame()
+    header = write_quarterly_cube(frame, tmp_path)
+    read_header, arrays = read_quarterly_cube(tmp_path / "quarterly_cube.json")
+
+    assert read_header == header
+    assert header["shape"] == [2, 3, 4]
+    assert header["entities"]["nis"] == ["01000", "11002"]
+    assert header["types"] == ["huizen_23", "alle_huizen", "appartementen"]
+    assert header["quarters"] == [[2023, 3], [2023, 4], [2024, 1], [2024, 2]]
+    assert (tmp_path / "quarterly_cube.bin").stat().st_size == 4 * 2 * 3 * 4 * 4
+
+    # Belgium, appartementen, 2024 Q2
+    assert arrays["n"][0, 2, 3] == 26
+    assert arrays["n"][0, 2, 2] == MISSING_COUNT
+    assert arrays["n"][0, 1].tolist() == [MISSING_COUNT] * 4
+    assert np.isnan(arrays["p25"][0, 2, 1])
+
+    expected = frame.astype({"type": str}).sort_values(KEY).reset_index(drop=True)[RECORD_COLUMNS]
+    actual = cube_to_frame(header, arrays).sort_values(KEY).reset_index(drop=True)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_rejects_prices_beyond_float32(tmp_path):
+    frame = make_frame()
+    frame.loc[0, "p75"] = 2.0 ** 24 + 1
+    with pytest.raises(ValueError):
+        write_quarterly_cube(frame, tmp_path)
+
+
+def test_rejects_duplicate_cells(tmp_path):
+    frame = make_frame()
+    with pytest.raises(RuntimeError):
+        write_quarterly_cube(pd.concat([frame, frame.iloc[:1]]), tmp_path)
+
+
+def test_unmapped_type(tmp_path):
+    # A source type missing from PROPERTY_TYPES ("Villa's") maps to NaN
+    frame = make_frame()
+    unmapped = frame.iloc[:2].copy()
+    unmapped["type"] = pd.Categorical([np.nan, np.nan], categories=frame["type"].cat.categories)
+    frame = pd.concat([frame, unmapped], ignore_index=True)
+
+    with pytest.raises(ValueError, match="without a type"):
+        write_quarterly_cube(frame, tmp_path)
+
+    records = cube_records(frame)
+    assert len(records) == len(frame) - 2
+    header = write_quarterly_cube(records, tmp_path)
+    read_header, arrays = read_quarterly_cube(tmp_path / "quarterly_cube.json")
+    assert (arrays["n"] != MISSING_COUNT).sum() == len(records)
+    assert header["types"] == ["huizen_23", "alle_huizen", "appartementen"]
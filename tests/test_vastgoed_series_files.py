@@ -0,0 +1,46 @@
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1] / "embuild-analyses"
+sys.path.insert(0, str(ROOT / "shared-data"))
+sys.path.insert(0, str(ROOT / "analyses/vastgoed-verkopen/src"))
+
+from json_records import record_columns
+from series_files import MANIFEST_FILE, write_series_files
+
+
+def make_frame():
+    geos = [(5, "11002", "Antwerpen"), (1, "01000", "België"), (3, "10000", "Antwerpen"), (5, "44021", "Gent")]
+    return pd.DataFrame([
+        {"y": y, "q": q, "lvl": lvl, "nis": nis, "type": "appartementen", "n": y - 2000 + q, "p50": 250000.0, "name": name}
+        for y in (2023, 2024)
+        for q in (1, 2, 3, 4)
+        for lvl, nis, name in geos
+    ])
+
+
+def test_one_file_per_entity(tmp_path):
+    frame = make_frame()
+    (tmp_path / "99999.json").write_text("[]")  # entity from an earlier run
+
+    manifest = write_series_files(frame, record_columns(frame), tmp_path, workers=3)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["01000.json", "10000.json", "11002.json", "44021.json", MANIFEST_FILE]
+    assert json.loads((tmp_path / MANIFEST_FILE).read_text()) == manifest
+    assert manifest["records"] == len(frame)
+    for nis, (lvl, records, size) in manifest["index"].items():
+        path = tmp_path / manifest["file_pattern"].format(nis=nis)
+        expected = frame[frame["nis"] == nis].to_dict(orient="records")
+        assert json.loads(path.read_text(encoding="utf-8")) == expected
+        assert (lvl, records, size) == (expected[0]["lvl"], 8, path.stat().st_size)
+
+
+def test_code_at_two_levels(tmp_path):
+    frame = make_frame()
+    frame.loc[frame["nis"] == "10000", "nis"] = "11002"
+    with pytest.raises(RuntimeError):
+        write_series_files(frame, record_columns(frame), tmp_path)
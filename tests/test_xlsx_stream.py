@@ -0,0 +1,49 @@
+import sys
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("openpyxl")
+
+SHARED_DATA_DIR = Path(__file__).resolve().parents[1] / "embuild-analyses/shared-data"
+sys.path.insert(0, str(SHARED_DATA_DIR))
+
+from xlsx_stream import iter_xlsx_batches, read_xlsx
+
+
+@pytest.fixture
+def archive(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 250
+    df = pd.DataFrame({
+        "CD_YEAR": rng.integers(2010, 2025, n),
+        "TX_LABEL": rng.choice(np.array(["Minder dan 1 jaar", "Liège", None], dtype=object), n),
+        "CD_PROV_REFNIS": rng.choice([10000, 20001, np.nan], n),
+        "MS_COUNT": rng.integers(0, 10, n),
+    })
+    # The first batch has no provinces at all, so it types that column as object
+    df.loc[:99, "CD_PROV_REFNIS"] = np.nan
+    xlsx = tmp_path / "data.xlsx"
+    df.to_excel(xlsx, index=False)
+    path = tmp_path / "data.zip"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.write(xlsx, "TF_DATA.xlsx")
+    return path, xlsx
+
+
+def test_matches_read_excel(archive):
+    path, xlsx = archive
+    pd.testing.assert_frame_equal(read_xlsx(path, batch_size=100), pd.read_excel(xlsx))
+
+
+def test_batches_and_column_selection(archive):
+    path, xlsx = archive
+    batches = list(iter_xlsx_batches(path, columns=["MS_COUNT", "CD_YEAR"], batch_size=100))
+    assert [len(b) for b in batches] == [100, 100, 50]
+    assert list(batches[0].columns) == ["MS_COUNT", "CD_YEAR"]
+
+    with pytest.raises(KeyError):
+        next(iter_xlsx_batches(path, columns=["MISSING"]))